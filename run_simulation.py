@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+District-level ABM launcher
+Runs the vectorized Python port of CEI-Simulation/models/district-level-abm.gaml
+for every district and writes the yearly logs for the DCI/PUC scripts
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+
+from abm import Checkpoint, DistrictLevelABM, available_provinces
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the district-level maternal & child health ABM (2019-2030).")
+    parser.add_argument('--data-path', default='data', help="Directory containing demographics/")
+    parser.add_argument('--output-path', default='CEI-Simulation/data', help="Directory for the simulation logs")
+    parser.add_argument('--log-format', choices=['arrow', 'parquet'], default='arrow',
+                        help="Columnar log format (default: arrow)")
+    parser.add_argument('--csv', action='store_true',
+                        help="Also export GAMA-style district_simulation_*.csv logs")
+    parser.add_argument('--province', action='append', dest='provinces', help="Province to simulate (repeatable, default: all)")
+    parser.add_argument('--all-provinces', action='store_true',
+                        help="Simulate every province with a demographics file under --data-path")
+    parser.add_argument('--district', action='append', dest='districts', help="Only simulate these districts (repeatable)")
+    parser.add_argument('--sampling-rate', type=float, default=10.0, help="Population sampling %% (default: 10)")
+    parser.add_argument('--full-population', action='store_true',
+                        help="Simulate 100%% of the population with compact agent storage")
+    parser.add_argument('--compact', action='store_true', help="Use compact agent storage at any sampling rate")
+    parser.add_argument('--seed', type=int, default=None, help="Root random seed")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes, one district per task (0 = all cores)")
+    parser.add_argument('--cohort', action='store_true',
+                        help="Simulate counts per state instead of individual agents (size-independent cost)")
+    parser.add_argument('--trait-bins', type=int, default=3,
+                        help="Bins per literacy/poverty/distance trait in the cohort model (default: 3)")
+    parser.add_argument('--scheduler', choices=['weekly', 'event'], default='weekly',
+                        help="Step every agent weekly (GAMA schedule) or only process scheduled events")
+    parser.add_argument('--monitor', type=int, default=0, metavar='WEEKS',
+                        help="Record population snapshots every WEEKS weeks (4 = GAML monthly report)")
+    parser.add_argument('--save-checkpoint', metavar='PATH',
+                        help="Run up to --checkpoint-year, save every district's state to PATH and stop")
+    parser.add_argument('--checkpoint-year', type=int, default=2024,
+                        help="Year at whose start the checkpoint is taken (default: 2024)")
+    parser.add_argument('--resume', metavar='PATH', help="Continue from a checkpoint instead of starting in 2019")
+    parser.add_argument('--fork', type=int, default=None,
+                        help="With --resume, continue on fresh random streams for this fork number")
+    parser.add_argument('--app', action='store_true', help="Enable mobile app intervention")
+    parser.add_argument('--sms', action='store_true', help="Enable SMS outreach intervention")
+    parser.add_argument('--chw', action='store_true', help="Enable CHW visits intervention")
+    parser.add_argument('--incentives', action='store_true', help="Enable incentives intervention")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=== DISTRICT-LEVEL HEALTH ABM (2019-2030) ===")
+    start = time.perf_counter()
+
+    sampling_rate = 100.0 if args.full_population else args.sampling_rate
+
+    model = DistrictLevelABM(
+        data_path=args.data_path,
+        output_path=args.output_path,
+        provinces=available_provinces(args.data_path) if args.all_provinces else args.provinces,
+        districts=args.districts,
+        seed=args.seed,
+        workers=args.workers,
+        log_format=args.log_format,
+        export_csv=args.csv,
+        sampling_rate=sampling_rate,
+        compact_storage=args.compact or args.full_population,
+        monitor_interval=args.monitor,
+        scheduler=args.scheduler,
+        population_model='cohort' if args.cohort else 'agents',
+        trait_bins=args.trait_bins,
+        app_intervention=args.app,
+        sms_intervention=args.sms,
+        chw_intervention=args.chw,
+        incentives=args.incentives
+    )
+    # Requested provinces and districts are checked before anything runs
+    try:
+        if args.resume:
+            checkpoint = Checkpoint.load(args.resume)
+            model.check_districts(entry[0] for entry in checkpoint.districts)
+        else:
+            model.setup()
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    if args.save_checkpoint:
+        model.warm_start(args.checkpoint_year).save(args.save_checkpoint)
+        print(f"Checkpoint completed in {time.perf_counter() - start:.1f}s")
+        return
+
+    if args.resume:
+        model.run_from(checkpoint, fork=args.fork)
+    else:
+        model.run()
+    model.save_results()
+    model.print_memory_report()
+
+    if sampling_rate != 10.0:
+        print(f"Note: score these logs with --sampling-rate {sampling_rate:g} so populations are rescaled correctly")
+
+    print(f"Simulation completed in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
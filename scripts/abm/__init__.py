@@ -0,0 +1,31 @@
+"""
+Python engine for the district-level maternal & child health ABM.
+
+A vectorized port of CEI-Simulation/models/district-level-abm.gaml that
+writes typed columnar logs (or the same `district_simulation_*.csv` logs)
+consumed by the DCI/PUC scripts.
+"""
+
+from .agents import AgentTable, MaternalAgents, ChildAgents
+from .cache import cached_frame, read_csv_cached
+from .data import (available_provinces, load_district_demographics, read_district_demographics, get_real_literacy_rate,
+                   get_real_poverty_rate)
+from .engine import ABMParameters, DistrictSimulation, DistrictLevelABM, district_seed_sequence, simulate_district
+from .events import EventDrivenDistrictSimulation
+from .cohort import CohortDistrictSimulation
+from .checkpoint import Checkpoint
+from .places import PROVINCE_NAMES, PlaceIndex, place_key, place_keys, province_name, province_names
+from .output import (LOG_COLUMNS, LOG_SCHEMA, ColumnarLogWriter, log_file_name, write_simulation_log,
+                     write_simulation_table, find_simulation_table, read_simulation_table)
+
+__all__ = [
+    'AgentTable', 'MaternalAgents', 'ChildAgents',
+    'cached_frame', 'read_csv_cached',
+    'available_provinces', 'load_district_demographics', 'read_district_demographics', 'get_real_literacy_rate',
+    'get_real_poverty_rate',
+    'ABMParameters', 'DistrictSimulation', 'DistrictLevelABM', 'district_seed_sequence', 'simulate_district',
+    'EventDrivenDistrictSimulation', 'CohortDistrictSimulation', 'Checkpoint',
+    'PROVINCE_NAMES', 'PlaceIndex', 'place_key', 'place_keys', 'province_name', 'province_names',
+    'LOG_COLUMNS', 'LOG_SCHEMA', 'ColumnarLogWriter', 'log_file_name', 'write_simulation_log',
+    'write_simulation_table', 'find_simulation_table', 'read_simulation_table'
+]
@@ -0,0 +1,194 @@
+"""
+Struct-of-arrays agent storage for the Python district-level ABM.
+
+Each species from district-level-abm.gaml is a table with one NumPy column
+per attribute, so behaviours run as whole-array operations instead of
+stepping agent objects one at a time.
+
+Tables come in two layouts. The standard layout uses plain int32/float64
+columns. The compact layout, used for full-population runs, keeps each agent
+in a few bytes: small integer types for ages and counts, float16 for the
+0-1 socioeconomic levels and one bit per boolean flag in a shared `flags`
+byte.
+"""
+
+import numpy as np
+
+
+class AgentTable:
+    """
+    A growable set of equal-length NumPy columns, one row per agent.
+
+    Columns are views of the first len(table) rows of buffers with spare
+    rows at the end, so the weekly newborns are written in place and the
+    buffers are only copied when the spare rows run out.
+    """
+
+    schema = {}
+    compact_schema = {}
+    flag_bits = {}  # Boolean attributes packed into `flags` in the compact layout
+    defaults = {}
+    growth = 0.125  # Spare rows reserved when the buffers grow, as a fraction of the rows
+
+    def __init__(self, compact=False):
+        self.compact = compact
+        schema = self.compact_schema if compact else self.schema
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in schema.items()}
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns):
+        self.buffers = dict(columns)
+        self._columns = dict(columns)
+
+    def __len__(self):
+        return len(next(iter(self._columns.values())))
+
+    def __getitem__(self, name):
+        if self.compact and name in self.flag_bits:
+            return (self._columns['flags'] >> self.flag_bits[name]) & 1 == 1
+        return self._columns[name]
+
+    def take(self, name, rows):
+        """Values of one attribute at `rows`, decoding packed flags of those rows only."""
+        if self.compact and name in self.flag_bits:
+            return (self._columns['flags'][rows] >> self.flag_bits[name]) & 1 == 1
+        return self._columns[name][rows]
+
+    def __setitem__(self, name, values):
+        if self.compact and name in self.flag_bits:
+            bit = np.uint8(1 << self.flag_bits[name])
+            flags = self._columns['flags']
+            flags[...] = np.where(values, flags | bit, flags & ~bit)
+        else:
+            self._columns[name][...] = values
+
+    @property
+    def nbytes(self):
+        """Memory held by the agent columns, spare rows included."""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def resize(self, length):
+        """Point the columns at the first `length` rows of the buffers."""
+        self._columns = {name: buffer[:length] for name, buffer in self.buffers.items()}
+
+    def append(self, count, **values):
+        """Add `count` agents; attributes not given take their default value."""
+        if count <= 0:
+            return
+
+        if self.compact:
+            flags = np.zeros(count, dtype=np.uint8)
+            for name, bit in self.flag_bits.items():
+                if name in values:
+                    flags |= np.asarray(values.pop(name), dtype=np.uint8) << bit
+            values['flags'] = flags
+
+        start = len(self)
+        end = start + count
+        if end > len(self.buffers['id']):
+            capacity = end + int(self.growth * end)
+            for name, column in self._columns.items():
+                self.buffers[name] = np.empty(capacity, dtype=column.dtype)
+                self.buffers[name][:start] = column
+
+        for name, buffer in self.buffers.items():
+            buffer[start:end] = values[name] if name in values else self.defaults.get(name, 0)
+        self.resize(end)
+
+    def keep(self, mask):
+        """Drop every agent whose entry in `mask` is False."""
+        kept = int(np.count_nonzero(mask))
+        for name, column in self._columns.items():
+            self.buffers[name][:kept] = column[mask]
+        self.resize(kept)
+
+
+class MaternalAgents(AgentTable):
+    """Women 15-49 (MaternalAgent species)."""
+
+    schema = {
+        'id': np.int64,
+        'age': np.int32,
+        'is_kinh': np.bool_,
+        'literacy_level': np.float64,
+        'poverty_level': np.float64,
+        'mobile_access': np.bool_,
+        'distance_to_facility': np.float64,
+        'care_seeking_threshold': np.float64,
+        'is_pregnant': np.bool_,
+        'weeks_pregnant': np.int32,
+        'anc_visits': np.int32,
+        'weeks_since_last_birth': np.int32,
+        'app_engagement': np.float64,
+        'received_sms': np.bool_,
+        'chw_contacted': np.bool_
+    }
+    compact_schema = {
+        'id': np.int32,
+        'age': np.int8,
+        'flags': np.uint8,
+        'literacy_level': np.float16,
+        'poverty_level': np.float16,
+        'distance_to_facility': np.float16,
+        'care_seeking_threshold': np.float16,
+        'is_pregnant': np.bool_,
+        'weeks_pregnant': np.uint8,
+        'anc_visits': np.uint8,
+        'weeks_since_last_birth': np.int16,
+        'app_engagement': np.float16
+    }
+    flag_bits = {
+        'is_kinh': 0,
+        'mobile_access': 1,
+        'received_sms': 2,
+        'chw_contacted': 3
+    }
+    defaults = {
+        'weeks_since_last_birth': -60
+    }
+
+
+class ChildAgents(AgentTable):
+    """Children under 5 and youth 5-15 (ChildAgent species).
+
+    The mother's literacy, poverty and app engagement never change after she
+    is created, so they are copied onto the child at birth; `mother_id` is
+    kept to check whether she is still in the model. `id` is a stable handle
+    for the event scheduler, since rows shift as agents leave.
+    """
+
+    schema = {
+        'id': np.int64,
+        'age_months': np.int32,
+        'is_female': np.bool_,
+        'mother_id': np.int64,
+        'mother_literacy': np.float64,
+        'mother_poverty': np.float64,
+        'mother_app_engagement': np.float64,
+        'immunizations_received': np.int32,
+        'last_immunization_week': np.int32,
+        'care_seeking_delays': np.int32
+    }
+    compact_schema = {
+        'id': np.int32,
+        'age_months': np.uint8,
+        'flags': np.uint8,
+        'mother_id': np.int32,
+        'mother_literacy': np.float16,
+        'mother_poverty': np.float16,
+        'mother_app_engagement': np.float16,
+        'immunizations_received': np.uint8,
+        'last_immunization_week': np.int16,
+        'care_seeking_delays': np.uint16
+    }
+    flag_bits = {
+        'is_female': 0
+    }
+    defaults = {
+        'mother_id': -1,
+        'last_immunization_week': -1
+    }
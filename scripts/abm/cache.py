@@ -0,0 +1,77 @@
+"""
+Persistent cache of preprocessed input frames.
+
+Cleaned, typed and aggregated inputs (e.g. commune demographics summed per
+district) are written as uncompressed Feather files to a `.cache`
+directory next to their sources, named after the frame and the content
+hash of the source files. Later runs memory-map them instead of parsing
+and aggregating the CSVs again. Editing a source changes its hash, so a
+stale entry is never read; it is removed when the new entry is written.
+"""
+
+import hashlib
+import os
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pathlib import Path
+
+CACHE_DIR_NAME = '.cache'
+
+# Bump when the preprocessing behind any cached frame changes
+CACHE_VERSION = 1
+
+
+def file_content_hash(paths):
+    """Short SHA-256 of the bytes of `paths`, to key cached results on input content."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cached_frame(name, sources, build, cache_dir=None):
+    """
+    DataFrame returned by `build()` from the files `sources`, cached on disk.
+
+    The entry lives in `cache_dir` (default: `.cache` next to the first
+    source) as `<name>-v<CACHE_VERSION>-<hash>.feather`. If the cache
+    cannot be written the frame is still returned.
+    """
+    sources = [Path(source) for source in sources]
+    cache_dir = Path(cache_dir) if cache_dir else sources[0].parent / CACHE_DIR_NAME
+    path = cache_dir / f"{name}-v{CACHE_VERSION}-{file_content_hash(sources)}.feather"
+
+    if path.exists():
+        try:
+            return feather.read_table(path, memory_map=True).to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            pass  # Truncated or corrupt entry, rebuilt below
+
+    df = build()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name unique to this writer, so readers never
+        # see a partial file and concurrent writers never share one
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=f".{path.stem}-", suffix='.tmp')
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        for stale in cache_dir.glob(f"{name}-v*.feather"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Warning: could not cache {name} in {cache_dir}: {e}")
+    return df
+
+
+def read_csv_cached(path, cache_dir=None):
+    """pd.read_csv(path), cached as a typed columnar file."""
+    path = Path(path)
+    return cached_frame(path.stem, [path], lambda: pd.read_csv(path), cache_dir)
@@ -0,0 +1,131 @@
+"""
+Year-boundary checkpoints of the district-level ABM.
+
+2019-2023 are anchored to government data and identical for every
+intervention scenario, so a run can stop at the start of a year, save the
+state of every district (agent arrays or cohort tensors, calendar, counters,
+log rows and random stream) and later resume or fork any number of
+scenarios from it.
+
+A checkpoint is a single compressed .npz file: one array per district state
+array, named `<district index>/<name>`, plus a JSON `meta` entry with the
+parameters, seed and the scalar state of every district. No pickles are
+involved, so files load on any machine.
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+
+from .engine import ABMParameters, district_seed_sequence, simulation_class
+
+CHECKPOINT_FORMAT = 1
+
+# Parameters that shape the saved state and cannot change on resume
+STATE_PARAMETERS = ['sampling_rate', 'compact_storage', 'scheduler', 'population_model', 'trait_bins', 'start_year']
+
+
+def to_json(value):
+    """JSON fallback for NumPy scalars and arrays in the saved state."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot store {type(value).__name__} in a checkpoint")
+
+
+class Checkpoint:
+    """Saved state of every district at the start of `year`."""
+
+    def __init__(self, year, seed, params, districts):
+        self.year = year
+        self.seed = seed
+        self.params = params
+        # (district, province, time_series, state, arrays) per district
+        self.districts = districts
+
+    def check_compatible(self, params):
+        """Raise if `params` would need a different state layout than the saved one."""
+        for name in STATE_PARAMETERS:
+            if getattr(params, name) != getattr(self.params, name):
+                raise ValueError(f"Checkpoint was saved with {name}={getattr(self.params, name)!r}, "
+                                 f"cannot resume with {name}={getattr(params, name)!r}")
+        if params.end_year < self.year:
+            raise ValueError(f"Checkpoint is at {self.year}, after end_year {params.end_year}")
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            'format': CHECKPOINT_FORMAT,
+            'year': self.year,
+            'seed': self.seed,
+            'params': vars(self.params),
+            'districts': []
+        }
+        payload = {}
+        for i, (district, province, time_series, state, arrays) in enumerate(self.districts):
+            meta['districts'].append({
+                'district': district,
+                'province': province,
+                'time_series': time_series,
+                'state': state
+            })
+            payload.update({f'{i}/{name}': array for name, array in arrays.items()})
+
+        payload['meta'] = np.frombuffer(json.dumps(meta, default=to_json).encode('utf-8'), dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **payload)
+        print(f"Saved checkpoint of {len(self.districts)} districts at {self.year} to {path} "
+              f"({path.stat().st_size / 1024 ** 2:.1f} MB)")
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            if meta['format'] != CHECKPOINT_FORMAT:
+                raise ValueError(f"Unsupported checkpoint format {meta['format']} in {path}")
+
+            arrays = [{} for _ in meta['districts']]
+            for key in data.files:
+                if key != 'meta':
+                    index, name = key.split('/', 1)
+                    arrays[int(index)][name] = data[key]
+
+        districts = []
+        for entry, district_arrays in zip(meta['districts'], arrays):
+            time_series = {int(year): values for year, values in entry['time_series'].items()}
+            districts.append((entry['district'], entry['province'], time_series, entry['state'], district_arrays))
+
+        print(f"Loaded checkpoint of {len(districts)} districts at {meta['year']} from {path}")
+        return cls(meta['year'], meta['seed'], ABMParameters(**meta['params']), districts)
+
+
+def warm_start_district(district_name, province_name, time_series, params, seed, year):
+    """Initialize one district, run it up to the start of `year` and return (state, arrays)."""
+    rng = np.random.default_rng(district_seed_sequence(seed, province_name, district_name))
+    simulation = simulation_class(params)(district_name, province_name, time_series, params, rng)
+    simulation.initialize_agents()
+    simulation.run(until_year=year)
+    return simulation.checkpoint_state()
+
+
+def resume_district(district_name, province_name, time_series, params, checkpoint_params, state, arrays,
+                    fork_seed=None):
+    """
+    Restore one district from a checkpoint and run it to the end year.
+
+    Returns the same (log rows, memory summary, monitor rows) as
+    simulate_district.
+    """
+    simulation = simulation_class(checkpoint_params)(district_name, province_name, time_series,
+                                                     checkpoint_params, np.random.default_rng())
+    simulation.restore_state(state, arrays)
+    if fork_seed is not None:
+        simulation.rng = np.random.default_rng(district_seed_sequence(fork_seed, province_name, district_name))
+    if vars(params) != vars(checkpoint_params):
+        simulation.update_parameters(params)
+
+    log_rows = simulation.run()
+    return log_rows, simulation.memory_summary(), simulation.monitor_rows
@@ -0,0 +1,402 @@
+"""
+Aggregated cohort engine for the district-level ABM.
+
+Instead of one row per person, each district keeps counts of people per
+state and advances them with binomial and multinomial draws, using the same
+transition rules and probabilities as the agent engine (anc_probability,
+skilled_birth_probability, immunization_probability and the care-seeking
+threshold). Memory and runtime depend on the number of states, not on the
+population, so every province can be simulated at 100% sampling.
+
+Women are grouped into strata of identical traits: literacy, poverty and
+distance each cut into `trait_bins` equal-probability bins of the uniform
+spread the agent engine draws from, times Kinh / non-Kinh. Women who join
+later (girls turning 15) get strata from the rates of their year. Per
+stratum the engine keeps
+
+- women by age (15-49), and
+- women by reproductive state: eligible to conceive, weeks since the last
+  birth (0-52), or weeks pregnant (1-40) x ANC visits (0-4).
+
+No GAML transition depends on age except leaving at 50, so the two are
+independent within a stratum; the women leaving at each birthday are taken
+from the states by a multivariate hypergeometric draw.
+
+Children under 5 are counted by immunization class (their weekly chance of
+being taken for a dose, set by the mother's traits; class 0 has no living
+mother) x age in months x doses received x dose slot. Slots 0-7 hold
+children dosed in a week w with w mod 8 = slot, who become due again when
+that slot comes round; slot 8 holds children who are due. Youth 5-15 are counted by age in months and sex. Children do
+not keep a link to their mother: when women leave at 50, each child under 5
+loses their mother with the share of women who left.
+"""
+
+import copy
+import math
+import numpy as np
+
+from .engine import (DistrictSimulation, ANC_TARGET, IMMUNIZATIONS_TARGET, anc_probability,
+                     immunization_probability, skilled_birth_probability)
+
+MATERNAL_AGES = np.arange(15, 50)
+PREGNANCY_WEEKS = 40
+POSTPARTUM_WEEKS = 53  # weeks since the last birth 0-52; eligible again from week 53
+U5_MONTHS = 60
+YOUTH_MONTHS = 120     # 60-179 months
+DOSE_INTERVAL_WEEKS = 8
+DUE = DOSE_INTERVAL_WEEKS  # dose slot of children 8+ weeks past their last dose
+
+
+def clipped_normal_distribution(mean, sd, low, high):
+    """Distribution over low..high of int(clip(normal(mean, sd), low, high)), as the agent engine draws ages."""
+    cuts = np.arange(low + 1, high + 1)
+    cdf = np.array([0.5 * (1 + math.erf((cut - mean) / (sd * math.sqrt(2)))) for cut in cuts])
+    return np.diff(np.concatenate([[0.0], cdf, [1.0]]))
+
+
+def bin_offsets(half_width, bins):
+    """Midpoints of `bins` equal-probability bins of uniform(-half_width, half_width)."""
+    return half_width * ((2 * np.arange(bins) + 1) / bins - 1)
+
+
+class CohortDistrictSimulation(DistrictSimulation):
+    """One district as count tensors rather than agent tables."""
+
+    def __init__(self, district_name, province_name, time_series, params, rng):
+        super().__init__(district_name, province_name, time_series, params, rng)
+
+        # Maternal strata, one entry per distinct trait combination
+        self.strata = {}
+        self.literacy = np.zeros(0)
+        self.poverty = np.zeros(0)
+        self.distance = np.zeros(0)
+        self.is_kinh = np.zeros(0, dtype=bool)
+        self.threshold = np.zeros(0)
+        self.child_class = np.zeros(0, dtype=np.int64)
+
+        self.ages = np.zeros((0, len(MATERNAL_AGES)), dtype=np.int64)
+        self.women = np.zeros((0, 1 + POSTPARTUM_WEEKS + (PREGNANCY_WEEKS + 1) * (ANC_TARGET + 1)), dtype=np.int64)
+
+        # Immunization classes; class 0 is children without a living mother
+        self.child_classes = {0.0: 0}
+        self.immunization_probs = np.zeros(1)
+        self.under_5 = np.zeros((1, U5_MONTHS, IMMUNIZATIONS_TARGET + 1, DOSE_INTERVAL_WEEKS + 1), dtype=np.int64)
+        self.youth = np.zeros((YOUTH_MONTHS, 2), dtype=np.int64)  # boys, girls
+
+        self._newborns = np.zeros(0, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # State views
+    # ------------------------------------------------------------------
+
+    @property
+    def eligible(self):
+        """Women who can conceive (not pregnant, more than 52 weeks since the last birth)."""
+        return self.women[:, 0]
+
+    @property
+    def postpartum(self):
+        """Women by weeks since their last birth (0-52)."""
+        return self.women[:, 1:1 + POSTPARTUM_WEEKS]
+
+    @property
+    def pregnant(self):
+        """Pregnant women by weeks pregnant (index 1-40) and ANC visits (0-4)."""
+        return self.women[:, 1 + POSTPARTUM_WEEKS:].reshape(-1, PREGNANCY_WEEKS + 1, ANC_TARGET + 1)
+
+    def refresh_population(self):
+        self.population = {
+            'maternal': int(self.ages.sum()),
+            'pregnant': int(self.pregnant.sum()),
+            'children_u5': int(self.under_5.sum()),
+            'youth_5_15': int(self.youth.sum())
+        }
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    cohort_arrays = ['literacy', 'poverty', 'distance', 'is_kinh', 'threshold', 'child_class',
+                     'ages', 'women', 'immunization_probs', 'under_5', 'youth']
+
+    def checkpoint_state(self):
+        state = {name: getattr(self, name) for name in self.checkpoint_attributes}
+        state['rng'] = self.rng.bit_generator.state
+        return state, {name: getattr(self, name) for name in self.cohort_arrays}
+
+    def restore_state(self, state, arrays):
+        for name in self.checkpoint_attributes:
+            setattr(self, name, copy.deepcopy(state[name]))
+        self.rng.bit_generator.state = state['rng']
+        for name in self.cohort_arrays:
+            setattr(self, name, arrays[name].copy())
+
+        # Lookup keys are the rounded trait values and class probabilities
+        keys = zip(np.round(self.literacy, 6), np.round(self.poverty, 6), np.round(self.distance, 6), self.is_kinh)
+        self.strata = {key: i for i, key in enumerate(keys)}
+        self.child_classes = {}
+        for child_class, prob in enumerate(self.immunization_probs):
+            self.child_classes.setdefault(prob, child_class)
+
+    def update_parameters(self, params):
+        """Switch parameters, recomputing the immunization chance of every child class."""
+        super().update_parameters(params)
+        probs = self.immunization_probs.copy()
+        for child_class in range(1, len(probs)):
+            stratum = np.flatnonzero(self.child_class == child_class)[0]
+            probs[child_class] = immunization_probability(self.literacy[stratum], self.poverty[stratum], 0.0, params)
+        self.immunization_probs = np.round(probs, 6)
+
+        self.child_classes = {}
+        for child_class, prob in enumerate(self.immunization_probs):
+            self.child_classes.setdefault(prob, child_class)
+
+    # ------------------------------------------------------------------
+    # Initialization
+    # ------------------------------------------------------------------
+
+    def initialize_agents(self):
+        """Create the initial cohorts from the district's baseline data."""
+        rng = self.rng
+
+        # Women 15-49
+        target_maternal = int(self.women_15_49 * self.params.maternal_sampling_rate)
+        self.add_women(target_maternal, clipped_normal_distribution(27.0, 6.0, 15, 49), 5.0)
+
+        # Children under 5, each with a random mother in the district
+        target_children_u5 = int(self.children_under_5 * self.params.child_sampling_rate)
+        class_births = np.bincount(self.child_class, weights=self.ages.sum(axis=1),
+                                   minlength=len(self.immunization_probs))
+        if class_births.sum() == 0:
+            class_births[0] = 1
+        age_probs = clipped_normal_distribution(30.0, 18.0, 0, 59)
+        counts = rng.multinomial(target_children_u5, np.outer(class_births / class_births.sum(), age_probs).ravel())
+        counts = counts.reshape(len(class_births), U5_MONTHS)
+        doses = np.minimum(IMMUNIZATIONS_TARGET, np.arange(U5_MONTHS) // 6)
+        self.under_5[:, np.arange(U5_MONTHS), doses, self.dose_slot(-1)] = counts
+
+        # Youth 5-15
+        target_youth_5_15 = int(self.total_population * 0.06 * self.params.child_sampling_rate)
+        youth = rng.multinomial(target_youth_5_15, np.full(YOUTH_MONTHS, 1 / YOUTH_MONTHS))
+        girls = rng.binomial(youth, 0.5)
+        self.youth[:, 0] = youth - girls
+        self.youth[:, 1] = girls
+
+        self.track_memory()
+        print(f"{self.district_name} ({self.province_name}): {target_maternal} maternal, "
+              f"{target_children_u5} children U5, {target_youth_5_15} youth 5-15 "
+              f"({len(self.strata)} strata)")
+
+    def add_women(self, count, age_probs, distance_spread):
+        """Add `count` women with ages drawn from `age_probs`, spread over trait strata."""
+        if count == 0:
+            return
+        rng = self.rng
+        bins = self.params.trait_bins
+
+        literacy = np.clip(self.literacy_rate + bin_offsets(0.15, bins), 0.1, 0.95)
+        poverty = np.clip(self.poverty_rate + bin_offsets(0.1, bins), 0.0, 1.0)
+        distance = self.distance_to_hospital + bin_offsets(distance_spread, bins)
+        kinh_share = self.kinh_share
+
+        lit, pov, dist, kinh = (grid.ravel() for grid in np.meshgrid(literacy, poverty, distance, [True, False],
+                                                                         indexing='ij'))
+        probs = np.where(kinh, kinh_share, 1 - kinh_share) / bins ** 3
+        counts = rng.multinomial(count, probs)
+
+        strata = self.find_strata(lit, pov, dist, kinh)
+        ages = rng.multinomial(counts, age_probs)
+        np.add.at(self.ages, strata, ages)
+
+        # Some women start already pregnant (MaternalAgent init)
+        pregnant = rng.binomial(counts, self.params.base_pregnancy_rate / 4)
+        np.add.at(self.women[:, 0], strata, counts - pregnant)
+        np.add.at(self.pregnant[:, 1, 0], strata, pregnant)
+        self.counters['pregnancies'] += int(pregnant.sum())
+
+    def find_strata(self, literacy, poverty, distance, is_kinh):
+        """Index of the stratum for each trait combination, adding strata that are new."""
+        indices = np.empty(len(literacy), dtype=np.int64)
+        new = []
+        for i, key in enumerate(zip(np.round(literacy, 6), np.round(poverty, 6), np.round(distance, 6), is_kinh)):
+            if key not in self.strata:
+                self.strata[key] = len(self.strata)
+                new.append(i)
+            indices[i] = self.strata[key]
+
+        if new:
+            new = np.array(new)
+            self.literacy = np.concatenate([self.literacy, literacy[new]])
+            self.poverty = np.concatenate([self.poverty, poverty[new]])
+            self.distance = np.concatenate([self.distance, distance[new]])
+            self.is_kinh = np.concatenate([self.is_kinh, is_kinh[new]])
+            self.threshold = self.calculate_care_seeking_threshold(self.literacy, self.poverty,
+                                                                   self.distance, self.is_kinh)
+            self.child_class = np.concatenate([self.child_class, self.find_child_classes(literacy[new], poverty[new])])
+            self.ages = np.concatenate([self.ages, np.zeros((len(new), self.ages.shape[1]), dtype=np.int64)])
+            self.women = np.concatenate([self.women, np.zeros((len(new), self.women.shape[1]), dtype=np.int64)])
+        return indices
+
+    def find_child_classes(self, literacy, poverty):
+        """Immunization class of children born to women with these traits."""
+        probs = immunization_probability(literacy, poverty, 0.0, self.params)
+        classes = []
+        for prob in np.round(probs, 6):
+            if prob not in self.child_classes:
+                self.child_classes[prob] = len(self.child_classes)
+                self.immunization_probs = np.append(self.immunization_probs, prob)
+                self.under_5 = np.concatenate([self.under_5, np.zeros((1,) + self.under_5.shape[1:], dtype=np.int64)])
+            classes.append(self.child_classes[prob])
+        return np.array(classes, dtype=np.int64)
+
+    def track_memory(self):
+        self.refresh_population()
+        population = self.population
+        agents = population['maternal'] + population['children_u5'] + population['youth_5_15']
+        self.peak_agents = max(self.peak_agents, agents)
+        state_bytes = self.ages.nbytes + self.women.nbytes + self.under_5.nbytes + self.youth.nbytes
+        self.peak_agent_bytes = max(self.peak_agent_bytes, state_bytes)
+
+    # ------------------------------------------------------------------
+    # Global schedule
+    # ------------------------------------------------------------------
+
+    def weekly_step(self):
+        """Advance one week with the GAML order: calendar, maternal, then child cohorts."""
+        if not self.advance_calendar():
+            return
+
+        self.pregnancy_progression()
+        self.maternal_age_progression()
+        self.reproductive_behavior()
+
+        self.child_age_progression()
+        self.seek_immunization()
+        self.add_newborns()
+
+    def log_yearly_data(self):
+        self.refresh_population()
+        super().log_yearly_data()
+
+    def monitor(self):
+        self.refresh_population()
+        super().monitor()
+
+    # ------------------------------------------------------------------
+    # Maternal cohorts
+    # ------------------------------------------------------------------
+
+    def pregnancy_progression(self):
+        rng = self.rng
+        postpartum = self.postpartum
+        pregnant = self.pregnant
+
+        # A week passes since the last birth; after 52 weeks women can conceive again
+        self.eligible[:] += postpartum[:, -1]
+        postpartum[:, 1:] = postpartum[:, :-1].copy()
+        postpartum[:, 0] = 0
+
+        # A week of pregnancy passes
+        pregnant[:, 2:] = pregnant[:, 1:-1].copy()
+        pregnant[:, 1] = 0
+
+        # ANC opportunity every 4 weeks for women below the target
+        strata, weeks, visits = np.nonzero(pregnant[:, 4::4, :ANC_TARGET])
+        weeks = 4 * (weeks + 1)
+        willing = anc_probability(weeks, self.literacy[strata], self.poverty[strata], 0.0, False, False, self.params)
+        able = 1.0 - self.threshold[strata]
+        attending = rng.binomial(pregnant[strata, weeks, visits], willing * able)
+        pregnant[strata, weeks, visits] -= attending
+        pregnant[strata, weeks, visits + 1] += attending
+        self.counters['anc_visits'] += int(attending.sum())
+
+        # Births at week 40
+        births = pregnant[:, PREGNANCY_WEEKS].sum(axis=1)
+        strata, visits = np.nonzero(pregnant[:, PREGNANCY_WEEKS])
+        skilled_prob = skilled_birth_probability(visits, self.literacy[strata], self.poverty[strata],
+                                                 self.distance[strata])
+        self.counters['skilled_births'] += int(rng.binomial(pregnant[strata, PREGNANCY_WEEKS, visits], skilled_prob).sum())
+        self.counters['births'] += int(births.sum())
+        pregnant[:, PREGNANCY_WEEKS] = 0
+        postpartum[:, 0] += births
+        self._newborns = births
+
+    def maternal_age_progression(self):
+        if self.current_week % 52 != 0:
+            return
+
+        total = self.ages.sum()
+        leaving = self.ages[:, -1].copy()
+        self.ages[:, 1:] = self.ages[:, :-1].copy()
+        self.ages[:, 0] = 0
+        if leaving.sum() == 0:
+            return
+
+        # Women turning 50 leave, whatever their reproductive state
+        for stratum in np.flatnonzero(leaving):
+            self.women[stratum] -= self.rng.multivariate_hypergeometric(self.women[stratum], leaving[stratum])
+
+        # Their children under 5 lose their mother
+        motherless = self.rng.binomial(self.under_5[1:], leaving.sum() / total)
+        self.under_5[1:] -= motherless
+        self.under_5[0] += motherless.sum(axis=0)
+
+    def reproductive_behavior(self):
+        conceiving = self.rng.binomial(self.eligible, self.params.base_pregnancy_rate)
+        self.eligible[:] -= conceiving
+        self.pregnant[:, 1, 0] += conceiving
+        self.counters['pregnancies'] += int(conceiving.sum())
+
+    # ------------------------------------------------------------------
+    # Child cohorts
+    # ------------------------------------------------------------------
+
+    def child_age_progression(self):
+        if self.current_week % 4 != 0:
+            return
+
+        # Youth turning 15 leave: girls become women, boys exit the model
+        leaving_girls = int(self.youth[-1, 1])
+        turning_5 = int(self.under_5[:, -1].sum())
+        self.youth[1:] = self.youth[:-1].copy()
+        girls = self.rng.binomial(turning_5, 0.5)
+        self.youth[0] = [turning_5 - girls, girls]
+
+        self.under_5[:, 1:] = self.under_5[:, :-1].copy()
+        self.under_5[:, 0] = 0
+
+        age_15 = np.zeros(len(MATERNAL_AGES))
+        age_15[0] = 1.0
+        self.add_women(leaving_girls, age_15, 2.0)
+
+    def seek_immunization(self):
+        u5 = self.under_5
+
+        # Children dosed 8 weeks ago become due again
+        slot = self.current_week % DOSE_INTERVAL_WEEKS
+        u5[..., DUE] += u5[..., slot]
+        u5[..., slot] = 0
+
+        # Children behind schedule and due may get the next dose
+        expected = np.minimum(IMMUNIZATIONS_TARGET, np.arange(U5_MONTHS) // 6)
+        behind = np.arange(IMMUNIZATIONS_TARGET + 1)[None, :] < expected[:, None]
+        classes, months, doses = np.nonzero(u5[..., DUE] * behind)
+        waiting = u5[classes, months, doses, DUE]
+        immunized = self.rng.binomial(waiting, self.immunization_probs[classes])
+        u5[classes, months, doses, DUE] -= immunized
+        u5[classes, months, doses + 1, slot] += immunized
+        self.counters['immunizations'] += int(immunized.sum())
+
+    def dose_slot(self, last_dose_week):
+        """Dose slot of children created now whose last dose was in `last_dose_week`."""
+        if self.current_week - last_dose_week >= DOSE_INTERVAL_WEEKS - 1:
+            return DUE
+        return last_dose_week % DOSE_INTERVAL_WEEKS
+
+    def add_newborns(self):
+        if self._newborns.sum():
+            # Strata added since the births (girls turning 15) have no newborns
+            mothers_class = self.child_class[:len(self._newborns)]
+            births = np.bincount(mothers_class, weights=self._newborns, minlength=len(self.immunization_probs))
+            self.under_5[:, 0, 0, self.dose_slot(-1)] += births.astype(np.int64)
+        self._newborns = np.zeros(0, dtype=np.int64)
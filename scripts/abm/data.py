@@ -0,0 +1,115 @@
+"""
+Input data for the Python district-level ABM.
+
+Mirrors `initialize_real_vietnamese_data` and `load_district_demographics`
+from CEI-Simulation/models/district-level-abm.gaml.
+"""
+
+import pandas as pd
+from pathlib import Path
+
+from .cache import cached_frame
+
+# Commune counts summed per district and year
+DEMOGRAPHIC_COUNTS = ['total_population', 'women_15_49', 'children_under_5']
+
+# REAL LITERACY RATES from Vietnamese General Statistics Office (GSO), 2025+ projected
+PROVINCIAL_LITERACY_RATES = {
+    'Thai Nguyen': {
+        2019: 98.20, 2020: 97.99, 2021: 98.32, 2022: 98.27,
+        2023: 98.75, 2024: 98.75, 2025: 98.80, 2026: 98.85,
+        2027: 98.90, 2028: 98.95, 2029: 99.00, 2030: 99.00
+    },
+    'Dien Bien': {
+        2019: 73.10, 2020: 75.58, 2021: 74.92, 2022: 77.63,
+        2023: 78.78, 2024: 78.78, 2025: 80.00, 2026: 81.50,
+        2027: 83.00, 2028: 84.50, 2029: 86.00, 2030: 87.50
+    }
+}
+
+# REAL POVERTY RATES from Vietnamese government statistics, 2025+ projected
+PROVINCIAL_POVERTY_RATES = {
+    'Thai Nguyen': {
+        2019: 6.72, 2020: 5.64, 2021: 4.78, 2022: 4.35,
+        2023: 3.02, 2024: 3.02, 2025: 2.50, 2026: 2.00,
+        2027: 1.50, 2028: 1.20, 2029: 1.00, 2030: 0.80
+    },
+    'Dien Bien': {
+        2019: 33.05, 2020: 29.93, 2021: 26.76, 2022: 18.70,
+        2023: 26.57, 2024: 26.57, 2025: 24.00, 2026: 21.50,
+        2027: 19.00, 2028: 16.50, 2029: 14.00, 2030: 12.00
+    }
+}
+
+DEFAULT_PROVINCES = ['Dien Bien', 'Thai Nguyen']
+
+
+def get_real_literacy_rate(province, year):
+    """Return the government literacy rate (0-1) for a province and year."""
+    rate = PROVINCIAL_LITERACY_RATES.get(province, {}).get(year)
+    return rate / 100.0 if rate is not None else 0.75  # Default fallback
+
+
+def get_real_poverty_rate(province, year):
+    """Return the government poverty rate (0-1) for a province and year."""
+    rate = PROVINCIAL_POVERTY_RATES.get(province, {}).get(year)
+    return rate / 100.0 if rate is not None else 0.30  # Default fallback
+
+
+def available_provinces(data_path='data'):
+    """Provinces that have a demographics_<province>.csv file, e.g. for national runs."""
+    files = sorted((Path(data_path) / 'demographics').glob('demographics_*.csv'))
+    return [f.stem[len('demographics_'):].replace('_', ' ').title() for f in files]
+
+
+def demographics_file(data_path, province):
+    """Path of a province's commune demographics CSV."""
+    return Path(data_path) / 'demographics' / f'demographics_{province.lower().replace(" ", "_")}.csv'
+
+
+def read_district_demographics(data_path, province):
+    """
+    Commune demographics of a province summed per district and year, or
+    None if the province has no demographics file.
+
+    The aggregated frame (district, year, total_population, women_15_49,
+    children_under_5) is cached by content hash, see cache.py.
+    """
+    province_file = demographics_file(data_path, province)
+    if not province_file.exists():
+        return None
+
+    def aggregate():
+        df = pd.read_csv(province_file)
+        return df.groupby(['district', 'year'], as_index=False)[DEMOGRAPHIC_COUNTS].sum()
+
+    return cached_frame(f"districts_{province_file.stem}", [province_file], aggregate)
+
+
+def load_district_demographics(data_path='data', provinces=None):
+    """
+    Aggregate commune demographics to district level for each province.
+
+    Returns {(province, district): {year: {'total_population', 'women_15_49',
+    'children_under_5'}}}, the same time series the GAML model keeps in
+    `district_time_series`.
+    """
+    provinces = provinces or DEFAULT_PROVINCES
+    district_time_series = {}
+
+    for province in provinces:
+        aggregated = read_district_demographics(data_path, province)
+        if aggregated is None:
+            print(f"Warning: {demographics_file(data_path, province)} not found")
+            continue
+
+        for row in aggregated.itertuples(index=False):
+            district_time_series.setdefault((province, row.district), {})[int(row.year)] = {
+                'total_population': int(row.total_population),
+                'women_15_49': int(row.women_15_49),
+                'children_under_5': int(row.children_under_5)
+            }
+
+        print(f"Processed {aggregated['district'].nunique()} districts from {province}")
+
+    return district_time_series
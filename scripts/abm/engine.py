@@ -0,0 +1,857 @@
+"""
+Vectorized Python engine for CEI-Simulation/models/district-level-abm.gaml.
+
+Each district owns struct-of-arrays agent tables (see agents.py) and steps
+all of its agents per week with NumPy operations. Transition rules and
+probabilities are the ones in the GAML species; a district simulation only
+depends on its own data and random stream.
+"""
+
+import copy
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .agents import MaternalAgents, ChildAgents
+from .data import DEFAULT_PROVINCES, get_real_literacy_rate, get_real_poverty_rate, load_district_demographics
+from .output import write_simulation_log, write_simulation_table
+
+ANC_TARGET = 4
+IMMUNIZATIONS_TARGET = 8
+SCHEDULERS = ('weekly', 'event')
+POPULATION_MODELS = ('agents', 'cohort')
+
+
+class ABMParameters:
+    """Global parameters of the GAML model (user parameters and calibrated constants)."""
+
+    def __init__(self, sampling_rate=10.0, app_intervention=False, sms_intervention=False,
+                 chw_intervention=False, incentives=False, anc_app_boost=0.2, anc_sms_boost=0.15,
+                 anc_chw_boost=0.25, anc_incentive_boost=0.3, immunization_app_boost=0.15,
+                 immunization_incentive_boost=0.25, base_pregnancy_rate=0.0015,
+                 mobile_penetration=0.65, start_year=2019, end_year=2030, log_start_year=2024,
+                 compact_storage=False, monitor_interval=0, scheduler='weekly',
+                 population_model='agents', trait_bins=3):
+        # Population sampling rate in percent (user_sampling_rate)
+        self.sampling_rate = sampling_rate
+
+        # Few-bytes-per-agent column layout (see agents.py), for full-population runs
+        self.compact_storage = compact_storage
+
+        # Intervention flags
+        self.app_intervention = app_intervention
+        self.sms_intervention = sms_intervention
+        self.chw_intervention = chw_intervention
+        self.incentives = incentives
+
+        # Probability boosts of each intervention in seek_anc_care and receive_care
+        self.anc_app_boost = anc_app_boost
+        self.anc_sms_boost = anc_sms_boost
+        self.anc_chw_boost = anc_chw_boost
+        self.anc_incentive_boost = anc_incentive_boost
+        self.immunization_app_boost = immunization_app_boost
+        self.immunization_incentive_boost = immunization_incentive_boost
+
+        # Behavioral parameters (calibrated for Vietnamese context)
+        self.base_pregnancy_rate = base_pregnancy_rate
+        self.mobile_penetration = mobile_penetration
+
+        # Simulated period and logging window
+        self.start_year = start_year
+        self.end_year = end_year
+        self.log_start_year = log_start_year
+
+        # Weeks between monitoring snapshots (4 = the GAML monthly report, 0 = off)
+        self.monitor_interval = monitor_interval
+
+        # 'weekly' steps every agent every week like GAMA; 'event' only touches
+        # agents with a scheduled event (see events.py)
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {SCHEDULERS}")
+        self.scheduler = scheduler
+
+        # 'agents' keeps one row per person; 'cohort' keeps counts per state
+        # (see cohort.py), with literacy, poverty and distance cut into
+        # `trait_bins` equal-probability bins
+        if population_model not in POPULATION_MODELS:
+            raise ValueError(f"Unknown population model '{population_model}', expected one of {POPULATION_MODELS}")
+        self.population_model = population_model
+        self.trait_bins = trait_bins
+
+    @property
+    def maternal_sampling_rate(self):
+        return self.sampling_rate / 100.0
+
+    @property
+    def child_sampling_rate(self):
+        return self.sampling_rate / 100.0
+
+
+def district_seed_sequence(seed, province, district):
+    """Random stream for one district, keyed by name so it never depends on run order."""
+    key = zlib.crc32(f"{province}/{district}".encode('utf-8'))
+    return np.random.SeedSequence(seed, spawn_key=(key,))
+
+
+def table_rows(table_ids, ids):
+    """Row of each id in a table's ascending `id` column, -1 when absent."""
+    # Search with the column's own type: a mismatch would cast the whole column on every lookup
+    ids = np.asarray(ids).astype(table_ids.dtype, copy=False)
+    rows = np.searchsorted(table_ids, ids)
+    rows = np.minimum(rows, max(len(table_ids) - 1, 0))
+    found = (ids >= 0) & (len(table_ids) > 0)
+    if len(table_ids):
+        found &= table_ids[rows] == ids
+    return np.where(found, rows, -1)
+
+
+def anc_probability(weeks_pregnant, literacy, poverty, app_engagement, received_sms, chw_contacted, params):
+    """Chance that a pregnant woman is willing to attend ANC this week (seek_anc_care)."""
+    base_prob = np.minimum(0.8, 0.1 + 0.02 * weeks_pregnant)
+    literacy_boost = 0.3 * literacy
+
+    intervention_boost = np.zeros(np.shape(literacy))
+    if params.app_intervention:
+        intervention_boost += np.where(app_engagement > 0.5, params.anc_app_boost, 0.0)
+    if params.sms_intervention:
+        intervention_boost += np.where(received_sms, params.anc_sms_boost, 0.0)
+    if params.chw_intervention:
+        intervention_boost += np.where(chw_contacted, params.anc_chw_boost, 0.0)
+    if params.incentives:
+        intervention_boost += np.where(poverty > 0.6, params.anc_incentive_boost, 0.0)
+
+    return np.minimum(0.95, base_prob + literacy_boost + intervention_boost)
+
+
+def skilled_birth_probability(anc_visits, literacy, poverty, distance):
+    """Chance that a birth is attended by a skilled provider (give_birth)."""
+    base_prob = 0.4 + 0.1 * anc_visits
+    literacy_boost = 0.2 * literacy
+    poverty_penalty = -0.15 * poverty
+    distance_penalty = -0.05 * np.minimum(distance / 5, 0.4)
+    return np.clip(base_prob + literacy_boost + poverty_penalty + distance_penalty, 0.1, 0.95)
+
+
+def immunization_probability(mother_literacy, mother_poverty, mother_app_engagement, params):
+    """Weekly chance that a child with a living mother is taken for immunization (receive_care)."""
+    base_prob = 0.3
+    literacy_boost = 0.2 * mother_literacy
+    poverty_penalty = -0.1 * mother_poverty
+
+    intervention_boost = np.zeros(np.shape(mother_literacy))
+    if params.app_intervention:
+        intervention_boost += np.where(mother_app_engagement > 0.4, params.immunization_app_boost, 0.0)
+    if params.incentives:
+        intervention_boost += np.where(mother_poverty > 0.5, params.immunization_incentive_boost, 0.0)
+
+    return np.clip(base_prob + literacy_boost + poverty_penalty + intervention_boost, 0.05, 0.9)
+
+
+def reset_peak_rss():
+    """Restart this process's peak RSS from its current RSS (Linux only); False where unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process since the last reset in MB, None where unsupported."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class DistrictSimulation:
+    """One District agent together with its maternal and child agents."""
+
+    def __init__(self, district_name, province_name, time_series, params, rng):
+        self.district_name = district_name
+        self.province_name = province_name
+        self.time_series = time_series
+        self.params = params
+        self.rng = rng
+
+        # Time
+        self.current_week = 0
+        self.current_year = params.start_year
+        self.logging_active = False
+        self.finished = False
+
+        # District demographics start from the first simulated year
+        baseline = time_series[params.start_year]
+        self.total_population = baseline['total_population']
+        self.women_15_49 = baseline['women_15_49']
+        self.children_under_5 = baseline['children_under_5']
+        self.poverty_rate = get_real_poverty_rate(province_name, params.start_year)
+        self.literacy_rate = get_real_literacy_rate(province_name, params.start_year)
+        self.distance_to_hospital = rng.uniform(5.0, 30.0)  # 5-30km to hospital
+
+        self.maternal = MaternalAgents(compact=params.compact_storage)
+        self.children = ChildAgents(compact=params.compact_storage)
+        self._next_maternal_id = 0
+        self._next_child_id = 0
+        self._maternal_alive = np.zeros(0, dtype=bool)  # Indexed by maternal id
+        self._newborns = []
+
+        # Health outcome counters, accumulated over the current year
+        self.counters = dict.fromkeys(['pregnancies', 'anc_visits', 'births', 'skilled_births', 'immunizations'], 0)
+
+        # Live agent counts, adjusted on every birth, death, transition and
+        # age-out so logging and monitoring never scan the agent tables
+        self.population = dict.fromkeys(['maternal', 'pregnant', 'children_u5', 'youth_5_15'], 0)
+
+        self.log_rows = []
+        self.monitor_rows = []
+
+        # Memory use
+        self.peak_agents = 0
+        self.peak_agent_bytes = 0
+        self.peak_rss_mb = None
+
+        # Districts share worker processes, so the process peak restarts with each one
+        self.rss_reset = reset_peak_rss()
+
+    # ------------------------------------------------------------------
+    # Initialization
+    # ------------------------------------------------------------------
+
+    def initialize_agents(self):
+        """Create maternal and child agents from the district's baseline data."""
+        rng = self.rng
+
+        # Create maternal agents (women 15-49)
+        target_maternal = int(self.women_15_49 * self.params.maternal_sampling_rate)
+        ages = np.clip(rng.normal(27.0, 6.0, target_maternal), 15, 49).astype(np.int32)
+        self.create_maternal_agents(ages, self.distance_to_hospital + rng.uniform(-5.0, 5.0, target_maternal))
+        maternal_ids = self.maternal['id'].copy()
+
+        # Create child agents (under 5)
+        target_children_u5 = int(self.children_under_5 * self.params.child_sampling_rate)
+        child_ages = np.clip(rng.normal(30.0, 18.0, target_children_u5), 0, 59).astype(np.int32)
+        self.create_child_agents(child_ages, self.sample_mothers(maternal_ids, target_children_u5))
+
+        # Create youth agents (5-15 years)
+        target_youth_5_15 = int(self.total_population * 0.06 * self.params.child_sampling_rate)
+        youth_ages = rng.integers(60, 180, target_youth_5_15).astype(np.int32)
+        self.create_child_agents(youth_ages, self.sample_mothers(maternal_ids, target_youth_5_15))
+
+        self.track_memory()
+        print(f"{self.district_name} ({self.province_name}): {target_maternal} maternal, "
+              f"{target_children_u5} children U5, {target_youth_5_15} youth 5-15")
+
+    def memory_summary(self):
+        return {
+            'District': self.district_name,
+            'Province': self.province_name,
+            'Peak_Agents': self.peak_agents,
+            'Agent_Storage_MB': self.peak_agent_bytes / 1024 ** 2,
+            'Peak_RSS_MB': self.peak_rss_mb
+        }
+
+    def track_memory(self):
+        """Update the high-water marks of agent count and agent storage."""
+        self.peak_agents = max(self.peak_agents, len(self.maternal) + len(self.children))
+        self.peak_agent_bytes = max(self.peak_agent_bytes, self.maternal.nbytes + self.children.nbytes)
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    checkpoint_attributes = [
+        'current_week', 'current_year', 'logging_active', 'finished',
+        'total_population', 'women_15_49', 'children_under_5', 'poverty_rate', 'literacy_rate',
+        'distance_to_hospital', '_next_maternal_id', '_next_child_id', 'counters', 'population',
+        'log_rows', 'monitor_rows', 'peak_agents', 'peak_agent_bytes'
+    ]
+
+    def update_parameters(self, params):
+        """Switch to new parameters mid-run, e.g. for a scenario forked from a checkpoint."""
+        self.params = params
+
+    def checkpoint_state(self):
+        """Full simulation state as (JSON-able values, named arrays), taken between weekly steps."""
+        state = {name: getattr(self, name) for name in self.checkpoint_attributes}
+        state['rng'] = self.rng.bit_generator.state
+        arrays = {'maternal_alive': self._maternal_alive}
+        arrays.update({f'maternal.{name}': column for name, column in self.maternal.columns.items()})
+        arrays.update({f'children.{name}': column for name, column in self.children.columns.items()})
+        return state, arrays
+
+    def restore_state(self, state, arrays):
+        """Load a state written by `checkpoint_state`; arrays are copied so one state can seed many forks."""
+        for name in self.checkpoint_attributes:
+            setattr(self, name, copy.deepcopy(state[name]))
+        self.rng.bit_generator.state = state['rng']
+        self._maternal_alive = arrays['maternal_alive'].copy()
+        for table, prefix in ((self.maternal, 'maternal.'), (self.children, 'children.')):
+            table.columns = {name: arrays[prefix + name].copy() for name in table.columns}
+
+    def sample_mothers(self, maternal_ids, count):
+        """Pick a random mother in the district for each child (nil if there is none)."""
+        if len(maternal_ids) == 0:
+            return np.full(count, -1, dtype=np.int64)
+        return maternal_ids[self.rng.integers(0, len(maternal_ids), count)]
+
+    @property
+    def kinh_share(self):
+        """Share of Kinh women in the province's ethnic mix."""
+        return 0.8 if self.province_name == 'Thai Nguyen' else 0.3
+
+    def sample_ethnicity(self, count):
+        """Return True for Kinh agents, using the province's ethnic mix."""
+        return self.rng.random(count) < self.kinh_share
+
+    def sample_literacy(self, count):
+        return np.clip(self.literacy_rate + self.rng.uniform(-0.15, 0.15, count), 0.1, 0.95)
+
+    def sample_poverty(self, count):
+        return np.clip(self.poverty_rate + self.rng.uniform(-0.1, 0.1, count), 0.0, 1.0)
+
+    def create_maternal_agents(self, ages, distances):
+        """Create maternal agents and run their `init` block."""
+        count = len(ages)
+        if count == 0:
+            return
+
+        ids = np.arange(self._next_maternal_id, self._next_maternal_id + count)
+        self._next_maternal_id += count
+        self.population['maternal'] += count
+        self._maternal_alive = np.concatenate([self._maternal_alive, np.ones(count, dtype=bool)])
+
+        is_kinh = self.sample_ethnicity(count)
+        literacy = self.sample_literacy(count)
+        poverty = self.sample_poverty(count)
+        first = len(self.maternal)
+        self.maternal.append(
+            count,
+            id=ids,
+            age=ages,
+            is_kinh=is_kinh,
+            literacy_level=literacy,
+            poverty_level=poverty,
+            mobile_access=self.rng.random(count) < self.params.mobile_penetration,
+            distance_to_facility=distances,
+            care_seeking_threshold=self.calculate_care_seeking_threshold(literacy, poverty, distances, is_kinh)
+        )
+
+        # Some agents start the simulation already pregnant
+        starts_pregnant = self.rng.random(count) < self.params.base_pregnancy_rate / 4
+        self.become_pregnant(first + np.flatnonzero(starts_pregnant))
+
+    def create_child_agents(self, ages, mother_ids, immunizations=None):
+        """Create child agents, copying the traits of their mothers used for care seeking."""
+        count = len(ages)
+        if count == 0:
+            return
+
+        rows = self.maternal_rows(mother_ids)
+        has_mother = rows >= 0
+        if has_mother.any():
+            literacy = np.where(has_mother, self.maternal['literacy_level'][rows], 0.0)
+            poverty = np.where(has_mother, self.maternal['poverty_level'][rows], 0.0)
+            app_engagement = np.where(has_mother, self.maternal['app_engagement'][rows], 0.0)
+        else:
+            literacy = poverty = app_engagement = 0.0
+
+        if immunizations is None:
+            immunizations = np.minimum(IMMUNIZATIONS_TARGET, ages // 6)
+
+        under_5 = int(np.count_nonzero(ages < 60))
+        self.population['children_u5'] += under_5
+        self.population['youth_5_15'] += count - under_5
+
+        ids = np.arange(self._next_child_id, self._next_child_id + count)
+        self._next_child_id += count
+
+        self.children.append(
+            count,
+            id=ids,
+            age_months=ages,
+            is_female=self.rng.random(count) < 0.5,
+            mother_id=mother_ids,
+            mother_literacy=literacy,
+            mother_poverty=poverty,
+            mother_app_engagement=app_engagement,
+            immunizations_received=immunizations
+        )
+
+    def maternal_rows(self, ids):
+        """Row of each maternal id in the current table, -1 when absent."""
+        return table_rows(self.maternal['id'], ids)
+
+    def child_rows(self, ids):
+        """Row of each child id in the current table, -1 when absent."""
+        return table_rows(self.children['id'], ids)
+
+    @staticmethod
+    def calculate_care_seeking_threshold(literacy, poverty, distance, is_kinh):
+        base_threshold = 0.5
+        literacy_factor = -0.2 * literacy
+        poverty_factor = 0.15 * poverty
+        distance_factor = 0.1 * np.minimum(distance / 10, 0.3)
+        ethnicity_factor = np.where(is_kinh, 0.0, 0.1)
+        return np.clip(base_threshold + literacy_factor + poverty_factor + distance_factor + ethnicity_factor, 0.1, 0.9)
+
+    # ------------------------------------------------------------------
+    # Global schedule
+    # ------------------------------------------------------------------
+
+    def run(self, until_year=None):
+        """Step weekly until the end year has been logged, or up to the last week before `until_year`."""
+        stop_week = None
+        if until_year is not None:
+            if not self.params.start_year < until_year <= self.params.end_year:
+                raise ValueError(f"Cannot stop at {until_year}: outside {self.params.start_year + 1}-{self.params.end_year}")
+            stop_week = 52 * (until_year - self.params.start_year) - 1
+
+        while not self.finished and (stop_week is None or self.current_week < stop_week):
+            self.weekly_step()
+        self.peak_rss_mb = peak_rss_mb() if self.rss_reset else None
+        return self.log_rows
+
+    def advance_calendar(self):
+        """Move to the next week, handling the year boundary; False once the run is over."""
+        self.current_week += 1
+
+        if self.current_week % 52 == 0:
+            self.current_year += 1
+            self.logging_active = self.params.log_start_year <= self.current_year <= self.params.end_year
+
+            if self.current_year > self.params.end_year:
+                self.finished = True
+                return False
+
+            self.update_demographics_to_real_data()
+            self.track_memory()
+
+            if self.logging_active:
+                self.log_yearly_data()
+            self.counters = dict.fromkeys(self.counters, 0)
+
+        if self.params.monitor_interval and self.current_week % self.params.monitor_interval == 0:
+            self.monitor()
+        return True
+
+    def weekly_step(self):
+        """Advance one week: calendar and logging first, then maternal and child agents."""
+        if not self.advance_calendar():
+            return
+
+        dead = np.zeros(len(self.maternal), dtype=bool)
+        self.pregnancy_progression(dead)
+        self.maternal_age_progression(dead)
+        self.reproductive_behavior(dead)
+        self.remove_maternal_agents(dead)
+
+        self.child_age_progression()
+        self.seek_immunization()
+        self.add_newborns()
+
+    def add_newborns(self):
+        """Create this week's newborns, after the child step as in GAMA."""
+        for mother_ids in self._newborns:
+            self.create_child_agents(np.zeros(len(mother_ids), dtype=np.int32), mother_ids)
+        self._newborns = []
+
+    def update_demographics_to_real_data(self):
+        """Re-anchor district demographics and rates to government data (2020-2024)."""
+        if 2020 <= self.current_year <= 2024:
+            real_data = self.time_series.get(self.current_year)
+            if real_data is not None:
+                self.total_population = real_data['total_population']
+                self.women_15_49 = real_data['women_15_49']
+                self.children_under_5 = real_data['children_under_5']
+                self.literacy_rate = get_real_literacy_rate(self.province_name, self.current_year)
+                self.poverty_rate = get_real_poverty_rate(self.province_name, self.current_year)
+
+    def log_yearly_data(self):
+        """Record this district's row for the year."""
+        self.log_rows.append({
+            'Year': self.current_year,
+            'District': self.district_name,
+            'Province': self.province_name,
+            'Maternal_Agents': self.population['maternal'],
+            'Children_U5': self.population['children_u5'],
+            'Youth_5_15': self.population['youth_5_15'],
+            'Total_Pregnancies': self.counters['pregnancies'],
+            'Total_Births': self.counters['births'],
+            'Skilled_Births': self.counters['skilled_births'],
+            'Total_Immunizations': self.counters['immunizations'],
+            'Literacy_Rate': self.literacy_rate * 100,
+            'Poverty_Rate': self.poverty_rate * 100,
+            # In-memory only: the written logs keep GAMA's LOG_COLUMNS
+            'ANC_Visits': self.counters['anc_visits']
+        })
+
+    def monitor(self):
+        """Record a snapshot like the GAML `monitor` reflex, from the live counters."""
+        births = self.counters['births']
+        self.monitor_rows.append({
+            'Week': self.current_week,
+            'Year': self.current_year,
+            'District': self.district_name,
+            'Province': self.province_name,
+            'Maternal_Agents': self.population['maternal'],
+            'Currently_Pregnant': self.population['pregnant'],
+            'Children_U5': self.population['children_u5'],
+            'Youth_5_15': self.population['youth_5_15'],
+            'Logging_Active': self.logging_active,
+            'Skilled_Birth_Rate': self.counters['skilled_births'] / births * 100 if births else None
+        })
+
+    # ------------------------------------------------------------------
+    # MaternalAgent behaviour
+    # ------------------------------------------------------------------
+
+    def become_pregnant(self, rows):
+        m = self.maternal
+        m['is_pregnant'][rows] = True
+        m['weeks_pregnant'][rows] = 1
+        m['anc_visits'][rows] = 0
+        self.counters['pregnancies'] += len(rows)
+        self.population['pregnant'] += len(rows)
+
+    def pregnancy_progression(self, dead):
+        m = self.maternal
+        pregnant = np.flatnonzero(m['is_pregnant'])
+        if len(pregnant) == 0:
+            return
+
+        m['weeks_pregnant'][pregnant] += 1
+        weeks = m['weeks_pregnant'][pregnant]
+
+        anc_due = pregnant[weeks % 4 == 0]
+        if len(anc_due):
+            visited = anc_due[self.seek_anc_care(anc_due)]
+            m['anc_visits'][visited] += 1
+            self.counters['anc_visits'] += len(visited)
+
+        delivering = pregnant[weeks >= 40]
+        if len(delivering):
+            self.give_birth(delivering, dead)
+
+    def seek_anc_care(self, rows):
+        """Return which of the given pregnant agents attend an ANC visit this week."""
+        m = self.maternal
+        below_target = m['anc_visits'][rows] < ANC_TARGET
+        final_prob = anc_probability(
+            m['weeks_pregnant'][rows], m['literacy_level'][rows], m['poverty_level'][rows],
+            m['app_engagement'][rows], m.take('received_sms', rows), m.take('chw_contacted', rows), self.params
+        )
+        willing = self.rng.random(len(rows)) < final_prob
+        able = self.rng.random(len(rows)) < 1.0 - m['care_seeking_threshold'][rows]
+        return below_target & willing & able
+
+    def give_birth(self, rows, dead=None):
+        """Deliver the given pregnant agents; mothers aged 50+ leave (marked in `dead` if given, and returned)."""
+        m = self.maternal
+        final_prob = skilled_birth_probability(
+            m['anc_visits'][rows], m['literacy_level'][rows], m['poverty_level'][rows], m['distance_to_facility'][rows]
+        )
+
+        skilled = self.rng.random(len(rows)) < final_prob
+        self.counters['skilled_births'] += int(np.count_nonzero(skilled))
+        self.counters['births'] += len(rows)
+        self.population['pregnant'] -= len(rows)
+
+        # New child agents join the model after this week's child step
+        self._newborns.append(m['id'][rows].copy())
+
+        # Transition back to maternal
+        m['is_pregnant'][rows] = False
+        m['weeks_pregnant'][rows] = 0
+        m['weeks_since_last_birth'][rows] = self.current_week
+        leaving = rows[m['age'][rows] >= 50]
+        if dead is not None:
+            dead[leaving] = True
+        return leaving
+
+    def maternal_age_progression(self, dead):
+        if self.current_week % 52 == 0:
+            m = self.maternal
+            m['age'] += 1
+            dead |= m['age'] > 49
+
+    def reproductive_behavior(self, dead):
+        m = self.maternal
+        eligible = np.flatnonzero(
+            ~dead & ~m['is_pregnant'] & (self.current_week - m['weeks_since_last_birth'] > 52)
+        )
+        conceiving = eligible[self.rng.random(len(eligible)) < self.params.base_pregnancy_rate]
+        self.become_pregnant(conceiving)
+
+    def remove_maternal_agents(self, dead):
+        if dead.any():
+            self.population['maternal'] -= int(np.count_nonzero(dead))
+            self.population['pregnant'] -= int(np.count_nonzero(dead & self.maternal['is_pregnant']))
+            self._maternal_alive[self.maternal['id'][dead]] = False
+            self.maternal.keep(~dead)
+
+    # ------------------------------------------------------------------
+    # ChildAgent behaviour
+    # ------------------------------------------------------------------
+
+    def child_age_progression(self):
+        if self.current_week % 4 != 0:
+            return
+
+        c = self.children
+        c['age_months'] += 1
+
+        turning_5 = int(np.count_nonzero(c['age_months'] == 60))
+        self.population['children_u5'] -= turning_5
+        self.population['youth_5_15'] += turning_5
+
+        # Youth turning 15 leave: girls become maternal agents, boys exit the model
+        leaving = c['age_months'] >= 180
+        if leaving.any():
+            self.population['youth_5_15'] -= int(np.count_nonzero(leaving))
+            new_women = int(np.count_nonzero(c.take('is_female', leaving)))
+            c.keep(~leaving)
+            self.create_maternal_agents(
+                np.full(new_women, 15, dtype=np.int32),
+                self.distance_to_hospital + self.rng.uniform(-2.0, 2.0, new_women)
+            )
+
+    def seek_immunization(self):
+        c = self.children
+        age_months = c['age_months']
+        expected = np.minimum(IMMUNIZATIONS_TARGET, age_months // 6)
+        seeking = np.flatnonzero(
+            (age_months < 60)
+            & (c['immunizations_received'] < expected)
+            & (self.current_week - c['last_immunization_week'] >= 8)
+        )
+        if len(seeking) == 0:
+            return
+
+        received = self.receive_care(seeking)
+        immunized = seeking[received]
+        c['immunizations_received'][immunized] += 1
+        c['last_immunization_week'][immunized] = self.current_week
+        c['care_seeking_delays'][seeking[~received]] += 1
+        self.counters['immunizations'] += len(immunized)
+
+    def receive_care(self, rows):
+        """Return which of the given children are taken for immunization by their mother."""
+        has_mother = self.has_living_mother(rows)
+        final_prob = self.immunization_probability(rows)
+        return has_mother & (self.rng.random(len(rows)) < final_prob)
+
+    def has_living_mother(self, rows):
+        mother_ids = self.children['mother_id'][rows]
+        has_mother = mother_ids >= 0
+        if has_mother.any():
+            has_mother &= self._maternal_alive[np.maximum(mother_ids, 0)]
+        return has_mother
+
+    def immunization_probability(self, rows):
+        """Weekly chance that a child with a living mother is taken for immunization."""
+        c = self.children
+        return immunization_probability(
+            c['mother_literacy'][rows], c['mother_poverty'][rows], c['mother_app_engagement'][rows], self.params
+        )
+
+
+def simulation_class(params):
+    """District simulation class for the configured population model and scheduler."""
+    if params.population_model == 'cohort':
+        from .cohort import CohortDistrictSimulation
+        return CohortDistrictSimulation
+    if params.scheduler == 'event':
+        from .events import EventDrivenDistrictSimulation
+        return EventDrivenDistrictSimulation
+    return DistrictSimulation
+
+
+def simulate_district(district_name, province_name, time_series, params, seed):
+    """
+    Initialize and run one district on its own random stream.
+
+    Module-level so worker processes can run it; returns the district's
+    yearly log rows, memory summary and monitoring rows.
+    """
+    rng = np.random.default_rng(district_seed_sequence(seed, province_name, district_name))
+    simulation = simulation_class(params)(district_name, province_name, time_series, params, rng)
+    simulation.initialize_agents()
+    log_rows = simulation.run()
+    return log_rows, simulation.memory_summary(), simulation.monitor_rows
+
+
+class DistrictLevelABM:
+    """Runs the district-level ABM for every district in the selected provinces.
+
+    Districts never interact, so they can be sharded over a process pool;
+    each has its own seeded stream, making results identical for any
+    number of workers.
+    """
+
+    def __init__(self, data_path='data', output_path='CEI-Simulation/data', provinces=None,
+                 districts=None, seed=None, workers=1, log_format='arrow', export_csv=False, **parameters):
+        self.data_path = Path(data_path)
+        self.output_path = Path(output_path)
+
+        # Columnar log format ('arrow' or 'parquet'), plus GAMA-style CSVs on request
+        self.log_format = log_format
+        self.export_csv = export_csv
+        self.provinces = provinces or DEFAULT_PROVINCES
+        self.districts = districts
+        self.workers = workers or os.cpu_count()
+        self.params = ABMParameters(**parameters)
+
+        # One root seed per run; each district derives its own stream from it
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+        self.district_time_series = {}
+        self.district_tasks = []
+        self.log_rows = []
+        self.memory_report = []
+        self.monitor_rows = []
+
+    def setup(self):
+        """Load demographics and select the districts to simulate."""
+        print("Loading district demographics...")
+        self.district_time_series = load_district_demographics(self.data_path, self.provinces)
+        loaded = {province for province, _ in self.district_time_series}
+        missing = [province for province in self.provinces if province not in loaded]
+        if missing:
+            raise ValueError(f"No district demographics for {', '.join(missing)} "
+                             f"in {self.data_path / 'demographics'}")
+        self.check_districts(district for _, district in self.district_time_series)
+
+        self.district_tasks = []
+        for (province, district), time_series in sorted(self.district_time_series.items()):
+            if self.districts and district not in self.districts:
+                continue
+            if self.params.start_year not in time_series:
+                print(f"Skipping {district} ({province}): no {self.params.start_year} baseline")
+                continue
+            self.district_tasks.append((district, province, time_series))
+        if not self.district_tasks:
+            raise ValueError(f"No district of {', '.join(self.provinces)} has a {self.params.start_year} baseline")
+
+        print(f"Prepared {len(self.district_tasks)} district simulations (seed {self.seed})")
+
+    def check_districts(self, known):
+        """Raise ValueError if a requested district is not among the `known` district names."""
+        known = set(known)
+        unknown = [district for district in self.districts or [] if district not in known]
+        if unknown:
+            raise ValueError(f"Unknown district(s) {', '.join(unknown)}; known districts: {', '.join(sorted(known))}")
+
+    def run(self):
+        """Simulate every district through the end year and merge the yearly rows."""
+        if not self.district_tasks:
+            self.setup()
+
+        results = self.map_districts(simulate_district, [(self.params, self.seed)] * len(self.district_tasks))
+        self.collect_results(results)
+        return self.log_rows
+
+    def warm_start(self, year):
+        """Run every district up to the start of `year` and return their state as a Checkpoint."""
+        from .checkpoint import Checkpoint, warm_start_district
+
+        if not self.district_tasks:
+            self.setup()
+
+        print(f"Warm-starting {len(self.district_tasks)} districts up to {year}...")
+        states = self.map_districts(warm_start_district, [(self.params, self.seed, year)] * len(self.district_tasks))
+        return Checkpoint(year, self.seed, self.params,
+                          [task + state for task, state in zip(self.district_tasks, states)])
+
+    def run_from(self, checkpoint, fork=None):
+        """
+        Continue the districts of a checkpoint to the end year under this model's parameters.
+
+        By default each district resumes its saved random stream, so a run with
+        unchanged parameters matches an uninterrupted one exactly. With `fork`
+        set, districts continue on fresh streams derived from (seed, fork),
+        making forks of one checkpoint independent replicates.
+        """
+        from .checkpoint import resume_district
+
+        checkpoint.check_compatible(self.params)
+        self.check_districts(entry[0] for entry in checkpoint.districts)
+        districts = [entry for entry in checkpoint.districts if not self.districts or entry[0] in self.districts]
+        self.district_tasks = [(district, province, time_series) for district, province, time_series, _, _ in districts]
+
+        fork_seed = None if fork is None else [self.seed, fork]
+        task_args = [(self.params, checkpoint.params, state, arrays, fork_seed) for _, _, _, state, arrays in districts]
+        self.collect_results(self.map_districts(resume_district, task_args))
+        return self.log_rows
+
+    def collect_results(self, results):
+        """Merge the per-district (log rows, memory summary, monitor rows) results."""
+        self.log_rows = [row for log_rows, _, _ in results for row in log_rows]
+        self.memory_report = [memory for _, memory, _ in results]
+        self.monitor_rows = [row for _, _, monitor_rows in results for row in monitor_rows]
+
+    def map_districts(self, function, task_args):
+        """
+        Call function(district, province, time_series, *args) for every district task.
+
+        Results come back in task order. With several workers, one district
+        runs per task on a process pool, largest districts first.
+        """
+        workers = min(self.workers, len(self.district_tasks))
+        if workers <= 1:
+            return [function(district, province, time_series, *args)
+                    for (district, province, time_series), args in zip(self.district_tasks, task_args)]
+
+        print(f"Running {len(self.district_tasks)} districts on {workers} worker processes...")
+
+        # Start the biggest districts first so the run ends close to the slowest one
+        order = sorted(range(len(self.district_tasks)),
+                       key=lambda i: -self.district_tasks[i][2][self.params.start_year]['total_population'])
+
+        results = [None] * len(self.district_tasks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for i in order:
+                district, province, time_series = self.district_tasks[i]
+                futures[executor.submit(function, district, province, time_series, *task_args[i])] = i
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
+    def print_memory_report(self):
+        """Show peak agent storage and process RSS for each district."""
+        print(f"\nMemory use ({'compact' if self.params.compact_storage else 'standard'} storage, "
+              f"{self.params.sampling_rate:g}% sampling):")
+        print(f"{'District':<25} {'Province':<14} {'Agents':>9} {'Storage MB':>11} {'Peak RSS MB':>12}")
+        for row in self.memory_report:
+            rss = f"{row['Peak_RSS_MB']:.1f}" if row['Peak_RSS_MB'] is not None else 'n/a'
+            print(f"{row['District']:<25} {row['Province']:<14} {row['Peak_Agents']:>9} "
+                  f"{row['Agent_Storage_MB']:>11.2f} {rss:>12}")
+        print("Peak RSS is the process high-water mark while the district ran, restarted for each district "
+              "(interpreter included; n/a off Linux, where it cannot be restarted).")
+
+    def save_results(self):
+        written = []
+        if self.export_csv:
+            written = write_simulation_log(self.log_rows, self.output_path)
+            print(f"Exported {len(written)} district CSV logs to {self.output_path}/")
+
+        # Written last: the scoring loaders read the columnar log unless CSVs are newer
+        table_path = write_simulation_table(self.log_rows, self.output_path, self.log_format)
+        print(f"Saved {len(self.log_rows)} yearly rows to {table_path}")
+        written.append(table_path)
+
+        if self.monitor_rows:
+            monitor_file = self.output_path / 'district_monitor_log.csv'
+            pd.DataFrame(self.monitor_rows).to_csv(monitor_file, index=False)
+            print(f"Saved monitoring snapshots to {monitor_file}")
+        return written
@@ -0,0 +1,84 @@
+"""
+Monte Carlo replicates of the district-level ABM.
+
+A replicate is a full run of every district under its own root seed.
+Replicates are produced in order (optionally on a process pool) so the
+caller can fold each one into running statistics and stop early; nothing
+is written to disk per replicate.
+"""
+
+import numpy as np
+
+from .engine import simulate_district
+from .pool import ordered_pool_map
+
+
+class RunningStats:
+    """Welford running mean and variance over arrays of a fixed shape."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if self.n == 0:
+            self.mean = np.zeros_like(values)
+            self.m2 = np.zeros_like(values)
+
+        self.n += 1
+        delta = values - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (values - self.mean)
+
+    @property
+    def variance(self):
+        if self.n < 2:
+            return np.zeros_like(self.mean)
+        return self.m2 / (self.n - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def ci_half_width(self, z=1.96):
+        """Half-width of the normal-approximation confidence interval of the mean."""
+        if self.n < 2:
+            return np.full_like(self.mean, np.inf)
+        return z * self.std / np.sqrt(self.n)
+
+
+def replicate_seed(root_seed, replicate):
+    """Root seed of one replicate; district streams are derived from it as usual."""
+    return [root_seed, replicate]
+
+
+def run_replicate(district_tasks, params, seed):
+    """Run every district of one replicate and return the merged yearly rows."""
+    rows = []
+    for district, province, time_series in district_tasks:
+        log_rows, _, _ = simulate_district(district, province, time_series, params, seed)
+        rows.extend(log_rows)
+    return rows
+
+
+def _run_replicate_task(context, seed):
+    district_tasks, params = context
+    return run_replicate(district_tasks, params, seed)
+
+
+def iter_replicates(district_tasks, params, root_seed, max_replicates, workers=1):
+    """
+    Yield (replicate, rows) for replicates 0..max_replicates-1 in order.
+
+    With several workers, up to two replicates per worker are in flight at
+    once. Closing the generator (e.g. breaking out of the loop after early
+    stopping) cancels replicates that have not started.
+    """
+    seeds = [replicate_seed(root_seed, replicate) for replicate in range(max_replicates)]
+    results = ordered_pool_map(_run_replicate_task, seeds, workers, context=(district_tasks, params))
+    try:
+        yield from enumerate(results)
+    finally:
+        results.close()
@@ -0,0 +1,258 @@
+"""
+Discrete-event scheduling mode for the district-level ABM.
+
+The weekly mode visits every agent every week, although most weeks nothing
+happens to most of them: a woman has a 0.15% chance to conceive, ANC visits
+only come up every 4 weeks of a pregnancy and a child is only due for a
+dose every few months. Here each of those is an event in a calendar of
+weekly buckets, so a week only touches the agents that have one:
+
+- conception: drawn as a geometric waiting time from the week a woman
+  becomes eligible (52 weeks after her last birth);
+- pregnancy: an ANC opportunity every 4 weeks after conception, with the
+  birth at week 40;
+- immunization: drawn as a geometric waiting time from the week the next
+  dose falls due (age reached and 8 weeks since the last dose).
+
+Per-agent weekly chances are constant between events, so the waiting times
+have the same distribution as the weekly coin flips and yearly aggregates
+match the weekly mode within sampling error (not draw for draw). Birthdays
+and the monthly child ageing stay calendar-wide array updates.
+"""
+
+import numpy as np
+
+from .engine import DistrictSimulation, IMMUNIZATIONS_TARGET
+
+
+class EventDrivenDistrictSimulation(DistrictSimulation):
+    """A district simulation driven by a calendar of weekly event buckets."""
+
+    def __init__(self, district_name, province_name, time_series, params, rng):
+        super().__init__(district_name, province_name, time_series, params, rng)
+
+        # week -> event -> [(ids, data)]; events past the last simulated week are dropped
+        self.calendar = {}
+        self.last_week = 52 * (params.end_year - params.start_year + 1) - 1
+
+    # ------------------------------------------------------------------
+    # Calendar
+    # ------------------------------------------------------------------
+
+    def schedule(self, week, event, ids, data=None):
+        if week <= self.last_week and len(ids):
+            self.calendar.setdefault(week, {}).setdefault(event, []).append((ids, data))
+
+    def pop_events(self, week):
+        """Remove this week's bucket, merged into one (ids, data) batch per event."""
+        events = {}
+        for event, batches in self.calendar.pop(week, {}).items():
+            ids = np.concatenate([ids for ids, _ in batches])
+            data = None if batches[0][1] is None else np.concatenate([data for _, data in batches])
+
+            # Ascending ids make the row lookups cache friendly
+            order = np.argsort(ids, kind='stable')
+            events[event] = ids[order], None if data is None else data[order]
+        return events
+
+    def schedule_many(self, weeks, event, ids, data=None):
+        """Schedule one event per id, grouping ids that fall in the same week."""
+        keep = weeks <= self.last_week
+        order = np.argsort(weeks[keep], kind='stable')
+        weeks, ids = weeks[keep][order], ids[keep][order]
+        if data is not None:
+            data = data[keep][order]
+
+        if len(weeks) == 0:
+            return
+
+        # One bucket entry per distinct week, the loop running over plain ints
+        starts = [0] + (np.flatnonzero(np.diff(weeks)) + 1).tolist()
+        ends = starts[1:] + [len(weeks)]
+        calendar = self.calendar
+        for week, start, end in zip(weeks[starts].tolist(), starts, ends):
+            batch = ids[start:end], data[start:end] if data is not None else None
+            calendar.setdefault(week, {}).setdefault(event, []).append(batch)
+
+    def schedule_conceptions(self, ids, first_week):
+        """Draw each woman's conception week from the week she becomes eligible."""
+        if len(ids) == 0:
+            return
+        waits = self.rng.geometric(self.params.base_pregnancy_rate, len(ids))
+        self.schedule_many(first_week + waits - 1, 'conception', ids)
+
+    def schedule_immunizations(self, rows):
+        """Draw the week each child receives the next dose, if it ever does."""
+        c = self.children
+        rows = rows[self.has_living_mother(rows) & (c['immunizations_received'][rows] < IMMUNIZATIONS_TARGET)]
+        if len(rows) == 0:
+            return
+
+        week = self.current_week
+        received = c['immunizations_received'][rows].astype(np.int64)
+        age = c['age_months'][rows].astype(np.int64)
+        last_dose = c['last_immunization_week'][rows].astype(np.int64)
+
+        # Children age a month every 4 weeks; the next dose is due at 6 months per dose
+        dose_month = 6 * (received + 1) - age + week // 4
+        due = np.maximum(np.maximum(week + 1, last_dose + 8), 4 * dose_month)
+        under_5 = age + due // 4 - week // 4 < 60
+        rows, due = rows[under_5], due[under_5]
+
+        waits = self.rng.geometric(self.immunization_probability(rows))
+        self.schedule_many(due + waits - 1, 'immunization', c['id'][rows], due)
+
+    def reschedule(self):
+        """Redraw pending conceptions and doses, e.g. after the parameters changed on a fork.
+
+        Waiting times are geometric, so redrawing them from the current week
+        leaves their distribution unchanged; pregnancies keep their calendar.
+        """
+        for events in self.calendar.values():
+            events.pop('conception', None)
+            events.pop('immunization', None)
+
+        m = self.maternal
+        waiting = ~m['is_pregnant']
+        first_week = np.maximum(self.current_week + 1, m['weeks_since_last_birth'][waiting].astype(np.int64) + 53)
+        ids = m['id'][waiting]
+        for week in np.unique(first_week):
+            self.schedule_conceptions(ids[first_week == week], week)
+        self.schedule_immunizations(np.arange(len(self.children)))
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    def update_parameters(self, params):
+        super().update_parameters(params)
+        self.last_week = 52 * (params.end_year - params.start_year + 1) - 1
+        self.reschedule()
+
+    def checkpoint_state(self):
+        state, arrays = super().checkpoint_state()
+        entries, ids, data = [], [], []
+        for week, events in sorted(self.calendar.items()):
+            for event, batches in events.items():
+                for batch_ids, batch_data in batches:
+                    entries.append([week, event, len(batch_ids), batch_data is not None])
+                    ids.append(batch_ids)
+                    if batch_data is not None:
+                        data.append(batch_data)
+        state['calendar'] = entries
+        arrays['calendar.ids'] = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64)
+        arrays['calendar.data'] = np.concatenate(data) if data else np.zeros(0, dtype=np.int64)
+        return state, arrays
+
+    def restore_state(self, state, arrays):
+        super().restore_state(state, arrays)
+        self.calendar = {}
+        ids, data = arrays['calendar.ids'], arrays['calendar.data']
+        id_start = data_start = 0
+        for week, event, count, has_data in state['calendar']:
+            batch_data = None
+            if has_data:
+                batch_data = data[data_start:data_start + count].copy()
+                data_start += count
+            self.schedule(week, event, ids[id_start:id_start + count].copy(), batch_data)
+            id_start += count
+
+    # ------------------------------------------------------------------
+    # Global schedule
+    # ------------------------------------------------------------------
+
+    def weekly_step(self):
+        """Advance one week, processing only the events due this week."""
+        if not self.advance_calendar():
+            return
+
+        events = self.pop_events(self.current_week)
+
+        # Women only leave on a birthday week or after a birth at 50+, so the
+        # whole-population death mask is only built in those weeks
+        leaving = self.pregnancy_event(*events['pregnancy']) if 'pregnancy' in events else np.zeros(0, dtype=np.int64)
+        if self.current_week % 52 == 0 or len(leaving):
+            dead = np.zeros(len(self.maternal), dtype=bool)
+            dead[leaving] = True
+            self.maternal_age_progression(dead)
+            self.remove_maternal_agents(dead)
+        if 'conception' in events:
+            self.conception_event(events['conception'][0])
+
+        self.child_age_progression()
+        if 'immunization' in events:
+            self.immunization_event(*events['immunization'])
+        self.add_newborns()
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def pregnancy_event(self, ids, conceived):
+        """ANC opportunity every 4 weeks of pregnancy, birth at week 40; returns the rows of mothers leaving."""
+        m = self.maternal
+        rows = self.maternal_rows(ids)
+        found = rows >= 0
+        rows, conceived = rows[found], conceived[found]
+        leaving = np.zeros(0, dtype=np.int64)
+        if len(rows) == 0:
+            return leaving
+
+        weeks = self.current_week - conceived + 1
+        m['weeks_pregnant'][rows] = weeks
+        visited = rows[self.seek_anc_care(rows)]
+        m['anc_visits'][visited] += 1
+        self.counters['anc_visits'] += len(visited)
+
+        delivering = weeks >= 40
+        if delivering.any():
+            leaving = self.give_birth(rows[delivering])
+        self.schedule(self.current_week + 4, 'pregnancy', m['id'][rows[~delivering]], conceived[~delivering])
+        return leaving
+
+    def conception_event(self, ids):
+        rows = self.maternal_rows(ids)
+        self.become_pregnant(rows[rows >= 0])
+
+    def immunization_event(self, ids, due):
+        c = self.children
+        rows = self.child_rows(ids)
+        found = rows >= 0
+        rows, due = rows[found], due[found]
+
+        # The dose is lost if the child turned 5 or the mother left while waiting
+        valid = (c['age_months'][rows] < 60) & self.has_living_mother(rows)
+        rows, due = rows[valid], due[valid]
+
+        c['immunizations_received'][rows] += 1
+        c['last_immunization_week'][rows] = self.current_week
+        c['care_seeking_delays'][rows] = c['care_seeking_delays'][rows] + (self.current_week - due)
+        self.counters['immunizations'] += len(rows)
+        self.schedule_immunizations(rows)
+
+    # ------------------------------------------------------------------
+    # Hooks that put new agents and state changes on the calendar
+    # ------------------------------------------------------------------
+
+    def create_maternal_agents(self, ages, distances):
+        first = len(self.maternal)
+        super().create_maternal_agents(ages, distances)
+        rows = np.arange(first, len(self.maternal))
+        rows = rows[~self.maternal['is_pregnant'][rows]]
+        self.schedule_conceptions(self.maternal['id'][rows], self.current_week + 1)
+
+    def create_child_agents(self, ages, mother_ids, immunizations=None):
+        first = len(self.children)
+        super().create_child_agents(ages, mother_ids, immunizations)
+        self.schedule_immunizations(np.arange(first, len(self.children)))
+
+    def become_pregnant(self, rows):
+        super().become_pregnant(rows)
+        self.schedule(self.current_week + 3, 'pregnancy', self.maternal['id'][rows],
+                      np.full(len(rows), self.current_week))
+
+    def give_birth(self, rows, dead=None):
+        leaving = super().give_birth(rows, dead)
+        survivors = rows[~np.isin(rows, leaving)]
+        self.schedule_conceptions(self.maternal['id'][survivors], self.current_week + 53)
+        return leaving
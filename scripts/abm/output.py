@@ -0,0 +1,301 @@
+"""
+Simulation log output.
+
+Runs are written as one typed columnar table (Arrow IPC or Parquet) with a
+fixed schema, read back memory-mapped without any parsing. The
+`district_simulation_*.csv` format written by the GAML model's
+`initialize_logging` / `log_yearly_data` remains available as an export.
+"""
+
+import csv
+import io
+import re
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pathlib import Path
+
+LOG_COLUMNS = [
+    'Year', 'District', 'Province', 'Maternal_Agents', 'Children_U5', 'Youth_5_15',
+    'Total_Pregnancies', 'Total_Births', 'Skilled_Births', 'Total_Immunizations',
+    'Literacy_Rate', 'Poverty_Rate'
+]
+
+LOG_SCHEMA = pa.schema(
+    [pa.field('Year', pa.int16())] +
+    [pa.field(name, pa.dictionary(pa.int32(), pa.string())) for name in ['District', 'Province']] +
+    [pa.field(name, pa.int32()) for name in LOG_COLUMNS[3:10]] +
+    [pa.field(name, pa.float32()) for name in LOG_COLUMNS[10:]]
+)
+
+# CSV logs are parsed straight into the columnar log types
+CSV_LOG_TYPES = {field.name: pa.string() if pa.types.is_dictionary(field.type) else field.type for field in LOG_SCHEMA}
+
+# Header lines of a GAMA log: the leading quoted row, and the header again
+# every time a run appends to an existing file
+CSV_HEADER_LINE = re.compile(rb'^"?Year"?,[^\n]*(?:\n|$)', re.MULTILINE)
+
+# Ensemble logs carry every replicate's rows in one file
+REPLICATE_LOG_SCHEMA = LOG_SCHEMA.insert(0, pa.field('Replicate', pa.int32()))
+
+# File extension of each columnar log format
+LOG_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+LOG_TABLE_NAME = 'district_simulation'
+
+
+def log_file_name(district, province):
+    """File name GAMA uses for one district's log."""
+    return f"district_simulation_{district.replace(' ', '_')}_{province.replace(' ', '_')}.csv"
+
+
+def log_table_path(output_path='CEI-Simulation/data', log_format='arrow'):
+    """Path of the columnar log of a run."""
+    return Path(output_path) / f"{LOG_TABLE_NAME}{LOG_FORMATS[log_format]}"
+
+
+def write_simulation_log(rows, output_path='CEI-Simulation/data'):
+    """
+    Write yearly log rows to one CSV per district.
+
+    Files keep GAMA's layout - a leading quoted row followed by the header -
+    so the existing `skiprows=1` loaders read them unchanged.
+    """
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    rows_by_district = {}
+    for row in rows:
+        rows_by_district.setdefault((row['District'], row['Province']), []).append(row)
+
+    written = []
+    for (district, province), district_rows in rows_by_district.items():
+        file_path = output_path / log_file_name(district, province)
+        with open(file_path, 'w', newline='') as f:
+            csv.writer(f, quoting=csv.QUOTE_ALL).writerow(LOG_COLUMNS)
+            writer = csv.DictWriter(f, fieldnames=LOG_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(district_rows)
+        written.append(file_path)
+
+    return written
+
+
+def index_simulation_logs(simulation_path, provinces):
+    """
+    Map each province to its `district_simulation_*.csv` logs from one
+    directory scan.
+
+    Log names end in `_<Province>.csv` (spaces as underscores); the
+    longest trailing run of words naming a known province wins, so district
+    names containing a province name (e.g. Thanh Pho Thai Nguyen) are not
+    mistaken for it. Logs of unknown provinces are ignored.
+    """
+    suffixes = {province.replace(' ', '_'): province for province in provinces}
+    max_words = max((suffix.count('_') + 1 for suffix in suffixes), default=0)
+    index = {province: [] for province in provinces}
+
+    for file_path in sorted(Path(simulation_path).glob('district_simulation_*.csv')):
+        words = file_path.stem[len('district_simulation_'):].split('_')
+        # At least one word is left for the district
+        for n in range(min(max_words, len(words) - 1), 0, -1):
+            province = suffixes.get('_'.join(words[-n:]))
+            if province is not None:
+                index[province].append(file_path)
+                break
+
+    return index
+
+
+def read_simulation_logs(files):
+    """
+    Parse GAMA CSV logs into one DataFrame with the columnar log's types.
+
+    Header lines are stripped while the files are concatenated, then the
+    rows are parsed in a single multi-threaded pyarrow pass with explicit
+    column types; rows with missing fields or values are dropped. Raises
+    pyarrow.ArrowInvalid if a value cannot be parsed as its type.
+    """
+    chunks = []
+    for file_path in files:
+        data = CSV_HEADER_LINE.sub(b'', Path(file_path).read_bytes())
+        if data and not data.endswith(b'\n'):
+            data += b'\n'
+        chunks.append(data)
+
+    if not any(chunks):
+        return pa.schema(list(CSV_LOG_TYPES.items())).empty_table().to_pandas()
+
+    table = pacsv.read_csv(
+        io.BytesIO(b''.join(chunks)),
+        read_options=pacsv.ReadOptions(column_names=LOG_COLUMNS),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+        convert_options=pacsv.ConvertOptions(column_types=CSV_LOG_TYPES, include_columns=LOG_COLUMNS)
+    )
+    return table.drop_null().to_pandas()
+
+
+class ColumnarLogWriter:
+    """
+    Buffers log rows and flushes them as typed record batches.
+
+    Dictionary columns (District, Province) share one growing dictionary
+    per file, so every batch only appends to it and Arrow IPC files can
+    carry the additions as dictionary deltas. Extra leading columns (e.g. a
+    Replicate number) can be added by passing a wider `schema`.
+    """
+
+    def __init__(self, path, log_format='arrow', schema=LOG_SCHEMA, buffer_rows=65536):
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"log_format must be one of {sorted(LOG_FORMATS)}, got {log_format!r}")
+        self.path = Path(path)
+        self.log_format = log_format
+        self.schema = schema
+        self.buffer_rows = buffer_rows
+
+        self.buffer = []
+        self.rows_written = 0
+        self.dictionaries = {field.name: {} for field in schema if pa.types.is_dictionary(field.type)}
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, rows):
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.buffer_rows:
+            self.flush()
+
+    def record_batch(self, rows):
+        columns = []
+        for field in self.schema:
+            values = [row[field.name] for row in rows]
+            if field.name in self.dictionaries:
+                dictionary = self.dictionaries[field.name]
+                indices = [dictionary.setdefault(value, len(dictionary)) for value in values]
+                columns.append(pa.DictionaryArray.from_arrays(
+                    pa.array(indices, type=field.type.index_type),
+                    pa.array(list(dictionary), type=field.type.value_type)
+                ))
+            else:
+                columns.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.log_format == 'parquet':
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression='zstd')
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self.writer = pa.ipc.new_file(self.path, self.schema, options=options)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.writer is None:
+            self.open()
+        self.writer.write_batch(self.record_batch(self.buffer))
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.writer is None:
+            # Still leave a readable (empty) file behind
+            self.open()
+        self.writer.close()
+
+
+def write_simulation_table(rows, output_path='CEI-Simulation/data', log_format='arrow'):
+    """
+    Write yearly log rows to the run's columnar log and return its path.
+
+    Districts the rows do not cover keep their currently logged rows (see
+    current_log_rows), so a run over some provinces or districts only
+    replaces their own results.
+    """
+    path = log_table_path(output_path, log_format)
+    simulated = {(row['Province'], row['District']) for row in rows}
+    kept = [row for key, district_rows in current_log_rows(output_path).items() if key not in simulated
+            for row in district_rows]
+    with ColumnarLogWriter(path, log_format) as writer:
+        writer.append(kept)
+        writer.append(rows)
+    return path
+
+
+def current_log_rows(simulation_path='CEI-Simulation/data'):
+    """
+    Logged rows of every district in `simulation_path`, {(province,
+    district): rows}: those of the newest columnar log, except districts
+    whose CSV log was written after it.
+    """
+    simulation_path = Path(simulation_path)
+    tables = [path for path in (log_table_path(simulation_path, log_format) for log_format in LOG_FORMATS)
+              if path.exists()]
+    table_path = max(tables, key=lambda path: path.stat().st_mtime) if tables else None
+    written = table_path.stat().st_mtime if table_path else float('-inf')
+    csv_files = [path for path in sorted(simulation_path.glob('district_simulation_*.csv'))
+                 if path.stat().st_mtime > written]
+
+    # Read into plain rows, so nothing still maps the file when it is rewritten
+    frames = [read_simulation_table(table_path)] if table_path else []
+    if csv_files:
+        frames.append(read_simulation_logs(csv_files))
+    logged = {}
+    for df in frames:
+        df = df.astype({'District': str, 'Province': str})
+        for key, district_rows in df.groupby(['Province', 'District'], sort=False):
+            logged[key] = district_rows.to_dict('records')
+    return logged
+
+
+def find_simulation_table(simulation_path='CEI-Simulation/data'):
+    """
+    Newest columnar log in `simulation_path`, or None.
+
+    CSV logs written after it (e.g. by a GAMA run into the same directory)
+    take precedence, so None is returned then too.
+    """
+    tables = [path for path in (log_table_path(simulation_path, log_format) for log_format in LOG_FORMATS)
+              if path.exists()]
+    if not tables:
+        return None
+    path = max(tables, key=lambda path: path.stat().st_mtime)
+    csv_files = Path(simulation_path).glob('district_simulation_*.csv')
+    if any(csv_file.stat().st_mtime > path.stat().st_mtime for csv_file in csv_files):
+        return None
+    return path
+
+
+def read_arrow_table(path, columns=None):
+    path = Path(path)
+    if path.suffix == LOG_FORMATS['parquet']:
+        return pq.read_table(path, columns=columns, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def read_simulation_table(path, province=None):
+    """
+    Read a columnar log into a DataFrame, optionally only one province's rows.
+
+    Arrow IPC files are memory-mapped, so numeric columns of a single-batch
+    file are handed to pandas without copying and a province filter only
+    materializes that province; District and Province come back as
+    categoricals.
+    """
+    table = read_arrow_table(path)
+    if province is not None:
+        table = table.filter(pc.equal(table['Province'].cast(pa.string()), province))
+    return table.to_pandas()
+
+
+def simulation_table_provinces(path):
+    """Provinces present in a columnar log, in order of first appearance."""
+    provinces = read_arrow_table(path, columns=['Province'])['Province'].cast(pa.string())
+    return pc.unique(provinces).to_pylist()
@@ -0,0 +1,324 @@
+"""
+Vietnamese place-name resolution.
+
+Province, district and commune names come spelled in several ways across
+the inputs: with or without diacritics ("Thái Nguyên" / "Thai Nguyen"),
+with administrative prefixes ("Thành phố Hồ Chí Minh", "Huyện Đại Từ",
+"Thai Nguyen Province"), with different spacing or dashes. place_key()
+reduces a name to one comparison key: lower case, administrative prefixes
+and suffixes removed while a name remains (matched on the accented text,
+so "Quận" is a prefix but "Quan Hóa" is a name), then Unicode NFD with the
+combining marks dropped, đ/Đ mapped to d, and only letters and digits kept
+("daitu").
+
+A PlaceIndex maps keys to canonical names per administrative level (and
+optionally per parent, since district names repeat across provinces). It
+is built once; single lookups are LRU-cached and resolve_series() resolves
+a whole column through its unique values. Names without an exact key
+match fall back to the closest canonical name sharing character trigrams,
+looked up through precomputed trigram buckets.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+import pandas as pd
+
+LEVELS = ['province', 'district', 'commune']
+
+# Official province names (as in the GSO economic data) and their plain English spelling
+PROVINCE_NAMES = {
+    'Thành phố Hồ Chí Minh': 'Ho Chi Minh City',
+    'Hà Nội': 'Ha Noi',
+    'Bình Dương': 'Binh Duong',
+    'Đồng Nai': 'Dong Nai',
+    'Hải Phòng': 'Hai Phong',
+    'Bà Rịa – Vũng Tàu': 'Ba Ria - Vung Tau',
+    'Quảng Ninh': 'Quang Ninh',
+    'Thanh Hóa': 'Thanh Hoa',
+    'Bắc Ninh': 'Bac Ninh',
+    'Nghệ An': 'Nghe An',
+    'Cần Thơ': 'Can Tho',
+    'Đà Nẵng': 'Da Nang',
+    'Khánh Hòa': 'Khanh Hoa',
+    'Lâm Đồng': 'Lam Dong',
+    'Bình Định': 'Binh Dinh',
+    'Thái Nguyên': 'Thai Nguyen',
+    'Điện Biên': 'Dien Bien',
+    'Vĩnh Phúc': 'Vinh Phuc',
+    'Bắc Giang': 'Bac Giang',
+    'Hưng Yên': 'Hung Yen',
+    'Hải Dương': 'Hai Duong',
+    'Quảng Nam': 'Quang Nam',
+    'Bình Thuận': 'Binh Thuan',
+    'Long An': 'Long An',
+    'Đồng Tháp': 'Dong Thap',
+    'Tiền Giang': 'Tien Giang',
+    'Kiên Giang': 'Kien Giang',
+    'Cà Mau': 'Ca Mau',
+    'Tây Ninh': 'Tay Ninh',
+    'An Giang': 'An Giang',
+    'Thừa Thiên Huế': 'Thua Thien Hue',
+    'Phú Thọ': 'Phu Tho',
+    'Lạng Sơn': 'Lang Son',
+    'Quảng Bình': 'Quang Binh',
+    'Gia Lai': 'Gia Lai',
+    'Bình Phước': 'Binh Phuoc',
+    'Hà Tĩnh': 'Ha Tinh',
+    'Cao Bằng': 'Cao Bang',
+    'Sóc Trăng': 'Soc Trang',
+    'Hà Nam': 'Ha Nam',
+    'Nam Định': 'Nam Dinh',
+    'Ninh Bình': 'Ninh Binh',
+    'Thái Bình': 'Thai Binh',
+    'Vĩnh Long': 'Vinh Long',
+    'Hậu Giang': 'Hau Giang',
+    'Bến Tre': 'Ben Tre',
+    'Trà Vinh': 'Tra Vinh',
+    'Đắk Lắk': 'Dak Lak',
+    'Kon Tum': 'Kon Tum',
+    'Đắk Nông': 'Dak Nong',
+    'Phú Yên': 'Phu Yen',
+    'Quảng Ngãi': 'Quang Ngai',
+    'Ninh Thuận': 'Ninh Thuan',
+    'Quảng Trị': 'Quang Tri',
+    'Sơn La': 'Son La',
+    'Hòa Bình': 'Hoa Binh',
+    'Yên Bái': 'Yen Bai',
+    'Tuyên Quang': 'Tuyen Quang',
+    'Lào Cai': 'Lao Cai',
+    'Hà Giang': 'Ha Giang',
+    'Lai Châu': 'Lai Chau',
+    'Bạc Liêu': 'Bac Lieu',
+    'Bắc Kạn': 'Bac Kan'
+}
+OFFICIAL_PROVINCE_NAMES = {english: official for official, english in PROVINCE_NAMES.items()}
+
+# Administrative words dropped from the start or end of a name (lower case, with diacritics: unaccented
+# "quan", "xa", "phuong" or "tinh" also start names, so only unambiguous words have an accent-free form)
+ADMIN_PREFIXES = ['thành phố', 'thanh pho', 'tp', 'tỉnh', 'province of', 'city of', 'quận', 'huyện', 'huyen',
+                  'thị xã', 'thi xa', 'thị trấn', 'thi tran', 'phường', 'xã']
+ADMIN_SUFFIXES = ['province', 'city', 'district', 'town', 'commune', 'ward']
+
+# Minimum Dice similarity of the trigrams of two keys for a fuzzy match
+FUZZY_CUTOFF = 0.6
+
+_PREFIX_PATTERN = re.compile(r"^(?:%s)\s+" % "|".join(ADMIN_PREFIXES))
+_SUFFIX_PATTERN = re.compile(r"\s+(?:%s)$" % "|".join(ADMIN_SUFFIXES))
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def ascii_name(name):
+    """A name without diacritics, case and spacing kept ("Đắk Lắk" -> "Dak Lak")."""
+    decomposed = unicodedata.normalize('NFD', name.replace('đ', 'd').replace('Đ', 'D'))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=65536)
+def place_parts(name):
+    """
+    (administrative words, name) keys of a place name, both reduced like
+    place_key(); ('', '') for missing names.
+
+    >>> place_parts("Thị xã Kỳ Anh"), place_parts("Huyện Kỳ Anh"), place_parts("Kỳ Anh")
+    (('thixa', 'kyanh'), ('huyen', 'kyanh'), ('', 'kyanh'))
+    """
+    if not isinstance(name, str):
+        return '', ''
+    words = _NON_WORD.sub(' ', unicodedata.normalize('NFC', name).lower()).strip()
+    # Strip administrative words while a name remains after them
+    admin = []
+    while True:
+        prefix = _PREFIX_PATTERN.match(words)
+        stripped = words[prefix.end():] if prefix else words
+        suffix = _SUFFIX_PATTERN.search(stripped)
+        stripped = stripped[:suffix.start()] if suffix else stripped
+        if stripped == words or not stripped:
+            break
+        admin += [match.group().strip() for match in (prefix, suffix) if match]
+        words = stripped
+    return _NON_WORD.sub('', ascii_name(' '.join(admin))), _NON_WORD.sub('', ascii_name(words))
+
+
+def place_key(name):
+    """
+    Comparison key of a place name; '' for missing names.
+
+    >>> place_key("Huyện Đại Từ")
+    'daitu'
+    >>> place_key("Huyện Quan Hóa") == place_key("Quan Hoa") == 'quanhoa'
+    True
+    >>> place_key("Phường Phương Liên") == place_key("Phương Liên") == 'phuonglien'
+    True
+    >>> place_key("Quản Bạ"), place_key("Thành phố Thị xã Sơn Tây"), place_key("Xã")
+    ('quanba', 'sontay', 'xa')
+    """
+    return place_parts(name)[1]
+
+
+def place_keys(names):
+    """place_key() of every value of a Series, computed once per distinct name."""
+    codes, uniques = pd.factorize(names, use_na_sentinel=False)
+    keys = [place_key(name) for name in uniques]
+    return pd.Series(pd.Index(keys, dtype=object).take(codes), index=names.index, name=names.name)
+
+
+def trigrams(key):
+    """Character trigrams of a key, padded so short keys still have some."""
+    padded = f"  {key} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class PlaceIndex:
+    """
+    Canonical place names by level, resolved from any spelling.
+
+    Names sharing a key (a town and the district around it) are told apart
+    by their administrative words; a spelling that cannot tell them apart
+    resolves to None rather than to either:
+
+    >>> index = PlaceIndex().add(["Thị xã Kỳ Anh", "Huyện Kỳ Anh"], 'district', ["Hà Tĩnh"] * 2)
+    >>> index.resolve("Thị xã Kỳ Anh", 'district', "Hà Tĩnh"), index.resolve("Huyen Ky Anh", 'district')
+    ('Thị xã Kỳ Anh', 'Huyện Kỳ Anh')
+    >>> print(index.resolve("Kỳ Anh", 'district', "Hà Tĩnh"))
+    None
+    """
+
+    def __init__(self, cache_size=65536):
+        self.names = {level: defaultdict(dict) for level in LEVELS}   # level -> {(parent key, key): {name: admin}}
+        self.by_key = {level: defaultdict(dict) for level in LEVELS}  # level -> {key: {name: admin}}
+        self.canonical = {level: {} for level in LEVELS}              # level -> {NFC name: (name, parent keys)}
+        self.entries = []                               # (level, parent key, key, canonical name, trigrams)
+        self.buckets = defaultdict(list)                # (level, trigram) -> entry positions
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def add(self, names, level, parents=None, aliases=None):
+        """
+        Register canonical `names` of one level, with the `parents` (e.g.
+        province of each district) they belong to and optional alternative
+        spellings (`aliases`, one per name or None).
+        """
+        if level not in self.names:
+            raise ValueError(f"level must be one of {LEVELS}, got {level!r}")
+        names = list(names)
+        parents = list(parents) if parents is not None else [None] * len(names)
+        aliases = list(aliases) if aliases is not None else [None] * len(names)
+
+        for name, parent, alias in zip(names, parents, aliases):
+            parent_key = place_key(parent) if parent is not None else None
+            _, parent_keys = self.canonical[level].setdefault(unicodedata.normalize('NFC', name), (name, set()))
+            parent_keys.add(parent_key)
+            for spelling in (name, alias):
+                admin, key = place_parts(spelling)
+                if not key or name in self.names[level][(parent_key, key)]:
+                    continue
+                self.names[level][(parent_key, key)][name] = admin
+                self.by_key[level][key].setdefault(name, admin)
+                position = len(self.entries)
+                grams = trigrams(key)
+                self.entries.append((level, parent_key, key, name, grams))
+                for gram in grams:
+                    self.buckets[(level, gram)].append(position)
+        self.resolve.cache_clear()
+        return self
+
+    def _resolve(self, name, level, parent=None, fuzzy=True):
+        admin, key = place_parts(name)
+        if not key:
+            return None
+        parent_key = place_key(parent) if parent is not None else None
+
+        # A registered canonical name is its own (within the parent if given)
+        canonical, parent_keys = self.canonical[level].get(unicodedata.normalize('NFC', name), (None, ()))
+        if canonical is not None and (parent_key is None or parent_key in parent_keys):
+            return canonical
+
+        # Exact key: within the parent if given, else across the level
+        if parent_key is not None and (parent_key, key) in self.names[level]:
+            return self.pick(self.names[level][(parent_key, key)], admin)
+        if parent_key is None:
+            if (None, key) in self.names[level]:
+                return self.pick(self.names[level][(None, key)], admin)
+            if key in self.by_key[level]:
+                return self.pick(self.by_key[level][key], admin)
+        return self.closest(key, level, parent_key) if fuzzy else None
+
+    def pick(self, names, admin):
+        """
+        The canonical name of a key: the only one of `names` ({name:
+        administrative words}), else the only one with the administrative
+        words `admin` of the spelling looked up; None if still ambiguous.
+        """
+        if len(names) == 1:
+            return next(iter(names))
+        same = [name for name, name_admin in names.items() if name_admin == admin]
+        return same[0] if len(same) == 1 else None
+
+    def closest(self, key, level, parent_key=None, cutoff=FUZZY_CUTOFF):
+        """Canonical name whose key shares the most trigrams with `key` (Dice >= cutoff), or None."""
+        grams = trigrams(key)
+        shared = Counter()
+        for gram, count in grams.items():
+            for position in self.buckets.get((level, gram), ()):
+                shared[position] += min(count, self.entries[position][4][gram])
+
+        size = sum(grams.values())
+        best, best_score = None, cutoff
+        for position, common in shared.items():
+            _, entry_parent, _, name, entry_grams = self.entries[position]
+            if parent_key is not None and entry_parent not in (parent_key, None):
+                continue
+            score = 2 * common / (size + sum(entry_grams.values()))
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = name, score
+        return best
+
+    def resolve_series(self, names, level, parents=None, fuzzy=True):
+        """Canonical name of every value of a Series (None where unresolved), one lookup per distinct value."""
+        if parents is None:
+            frame = pd.DataFrame({'name': names.to_numpy(), 'parent': None})
+        else:
+            frame = pd.DataFrame({'name': names.to_numpy(), 'parent': pd.Series(parents).to_numpy()})
+        codes, uniques = pd.factorize(pd.MultiIndex.from_frame(frame), use_na_sentinel=False)
+        resolved = [self.resolve(name, level, parent if isinstance(parent, str) else None, fuzzy)
+                    for name, parent in uniques]
+        return pd.Series(pd.Index(resolved, dtype=object).take(codes), index=names.index, name=names.name)
+
+
+@lru_cache(maxsize=None)
+def province_index():
+    """Index of the 63 provinces, canonical names in plain English."""
+    return PlaceIndex().add(PROVINCE_NAMES.values(), 'province', aliases=PROVINCE_NAMES.keys())
+
+
+def province_name(name):
+    """Plain English name of a province from any spelling; unknown names lose their diacritics."""
+    return province_index().resolve(name, 'province', fuzzy=False) or ascii_name(name)
+
+
+def province_names(names):
+    """province_name() of every value of a Series, one lookup per distinct name."""
+    resolved = province_index().resolve_series(names, 'province', fuzzy=False)
+    return resolved.fillna(names.map(ascii_name, na_action='ignore'))
+
+
+def official_province_name(name):
+    """Official Vietnamese name of a province from any spelling, or the name itself if unknown."""
+    english = province_index().resolve(name, 'province', fuzzy=False)
+    return OFFICIAL_PROVINCE_NAMES.get(english, name)
+
+
+def place_index(demographics):
+    """
+    Index of the provinces plus the districts and communes of a commune
+    demographics frame (province, district, commune columns).
+    """
+    index = PlaceIndex().add(PROVINCE_NAMES.values(), 'province', aliases=PROVINCE_NAMES.keys())
+    districts = demographics[['province', 'district']].drop_duplicates()
+    index.add(districts['district'], 'district', parents=districts['province'])
+    if 'commune' in demographics:
+        communes = demographics[['district', 'commune']].drop_duplicates()
+        index.add(communes['commune'], 'commune', parents=communes['district'])
+    return index
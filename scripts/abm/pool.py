@@ -0,0 +1,52 @@
+"""
+Ordered maps over a process pool.
+
+Replicates, scenarios, provinces and Monte Carlo batches are all produced
+in order so callers can fold each result as it arrives (and stop early),
+while the tasks themselves run on a process pool. Each task needs some
+large shared input (district time series, checkpoints, a calculator): it
+is passed as a `context` sent to each worker once by the pool initializer
+rather than pickled with every task.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Context shipped once to each worker process by the pool initializer
+_worker_context = None
+
+
+def _init_worker(context):
+    global _worker_context
+    _worker_context = context
+
+
+def _call_worker(fn, item):
+    return fn(_worker_context, item)
+
+
+def ordered_pool_map(fn, items, workers=1, context=None):
+    """
+    Yield fn(context, item) for every item, in order.
+
+    With several workers each item is one task on a process pool and up to
+    two tasks per worker are in flight; `fn` must be a module-level
+    function. Closing the generator (e.g. breaking out of the loop) cancels
+    the tasks that have not started.
+    """
+    items = list(items)
+    if workers <= 1:
+        for item in items:
+            yield fn(context, item)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,))
+    try:
+        in_flight = {}
+        next_index = 0
+        for index in range(len(items)):
+            while next_index < len(items) and len(in_flight) < 2 * workers:
+                in_flight[next_index] = executor.submit(_call_worker, fn, items[next_index])
+                next_index += 1
+            yield in_flight.pop(index).result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,105 @@
+"""
+Intervention scenario sweeps over a shared burn-in.
+
+Every scenario of a sweep is identical up to the year the interventions
+start, so each district is warm-started once (see checkpoint.py) and every
+scenario resumes from that state. Scenarios resume the saved random
+streams, so they share common random numbers and differences between them
+come from the interventions rather than from sampling noise.
+
+Parameters that shape the saved state (e.g. sampling_rate) cannot change
+on resume; scenarios are grouped by them and each group gets its own
+warm start.
+"""
+
+import itertools
+
+import pandas as pd
+
+from .checkpoint import STATE_PARAMETERS, resume_district
+from .engine import ABMParameters
+from .pool import ordered_pool_map
+
+INTERVENTION_FLAGS = ['app_intervention', 'sms_intervention', 'chw_intervention', 'incentives']
+
+# Parameters that only change care seeking (ANC visits, skilled births,
+# immunizations), never the population counts the DCI is scored on
+CARE_PARAMETERS = INTERVENTION_FLAGS + ['anc_app_boost', 'anc_sms_boost', 'anc_chw_boost', 'anc_incentive_boost',
+                                        'immunization_app_boost', 'immunization_incentive_boost', 'mobile_penetration']
+
+# Yearly care counts summed per district, and the rates derived from them
+OUTCOME_COLUMNS = ['Total_Pregnancies', 'ANC_Visits', 'Total_Births', 'Skilled_Births', 'Total_Immunizations']
+RATE_COLUMNS = ['ANC_Visits_Per_Pregnancy', 'Skilled_Birth_Rate', 'Immunizations_Per_Child_U5']
+
+def scenario_grid(**axes):
+    """Cartesian product of parameter values, e.g. scenario_grid(incentives=[False, True], ...)."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def scenario_name(config):
+    """Short label such as 'baseline', 'app+incentives' or 'incentives, anc_incentive_boost=0.4'."""
+    flags = [name.replace('_intervention', '') for name in INTERVENTION_FLAGS if config.get(name)]
+    label = '+'.join(flags) or 'baseline'
+    values = [f"{name}={value}" for name, value in config.items() if name not in INTERVENTION_FLAGS]
+    return ', '.join([label] + values)
+
+
+def scenario_params(base_params, config):
+    """Parameters of one scenario: the base parameters overridden by its config."""
+    return ABMParameters(**{**vars(base_params), **config})
+
+
+def care_outcomes(rows, by=('Province', 'District')):
+    """
+    Care outcomes of yearly log rows over the logged years, per `by`
+    group: the OUTCOME_COLUMNS totals, ANC visits per pregnancy, the
+    skilled birth rate (%) and immunizations per child under 5 (the
+    group's children in an average year). NaN where the denominator is zero.
+    """
+    by = list(by)
+    yearly = pd.DataFrame(rows).groupby(by + ['Year'], sort=False)[OUTCOME_COLUMNS + ['Children_U5']].sum()
+    outcomes = yearly[OUTCOME_COLUMNS].groupby(level=by, sort=False).sum()
+    children = yearly['Children_U5'].groupby(level=by, sort=False).mean()
+
+    pregnancies = outcomes['Total_Pregnancies'].where(outcomes['Total_Pregnancies'] > 0)
+    births = outcomes['Total_Births'].where(outcomes['Total_Births'] > 0)
+    outcomes['ANC_Visits_Per_Pregnancy'] = outcomes['ANC_Visits'] / pregnancies
+    outcomes['Skilled_Birth_Rate'] = 100 * outcomes['Skilled_Births'] / births
+    outcomes['Immunizations_Per_Child_U5'] = outcomes['Total_Immunizations'] / children.where(children > 0)
+    return outcomes.reset_index()
+
+
+def state_key(params):
+    """Values of the parameters a shared warm start must agree on."""
+    return tuple(getattr(params, name) for name in STATE_PARAMETERS)
+
+
+def run_scenario(checkpoint, params):
+    """Resume every district of `checkpoint` under `params` and return the merged yearly rows."""
+    checkpoint.check_compatible(params)
+    rows = []
+    for district, province, time_series, state, arrays in checkpoint.districts:
+        log_rows, _, _ = resume_district(district, province, time_series, params, checkpoint.params, state, arrays)
+        rows.extend(log_rows)
+    return rows
+
+
+def _run_scenario_task(checkpoints, params):
+    return run_scenario(checkpoints[state_key(params)], params)
+
+
+def iter_scenarios(checkpoints, scenarios, workers=1):
+    """
+    Yield (index, rows) for every scenario's parameters, in order.
+
+    `checkpoints` maps state_key(params) to the warm start a scenario
+    resumes from. With several workers each scenario is one task on a
+    process pool; the checkpoints are sent to each worker once and up to
+    two scenarios per worker are in flight.
+    """
+    results = ordered_pool_map(_run_scenario_task, scenarios, workers, context=checkpoints)
+    try:
+        yield from enumerate(results)
+    finally:
+        results.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Ensemble DCI / PUC Calculator
+Runs replicate simulations of the district-level ABM, scores each one with the
+target-based DCI/PUC framework and reports means with 95% intervals
+"""
+
+import argparse
+import contextlib
+import io
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+from abm import DistrictLevelABM, LOG_COLUMNS
+from abm.ensemble import RunningStats, iter_replicates
+from abm.output import LOG_FORMATS, REPLICATE_LOG_SCHEMA, ColumnarLogWriter
+from scoring import DCIPUCCalculator
+
+COUNT_COLUMNS = ['Maternal_Agents', 'Children_U5', 'Youth_5_15', 'Total_Pregnancies',
+                 'Total_Births', 'Skilled_Births', 'Total_Immunizations']
+
+
+def wilson_interval(p, n, z=1.96):
+    """Wilson score interval for a proportion estimated from n replicates."""
+    p = np.asarray(p, dtype=float)
+    denominator = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return centre - half_width, centre + half_width
+
+
+class EnsembleDCIPUCCalculator:
+    def __init__(self, data_path='data', max_replicates=200, min_replicates=10, tolerance=1.0,
+                 workers=1, seed=None, save_logs=None, **parameters):
+        self.data_path = Path(data_path)
+
+        # Columnar log format ('arrow' or 'parquet') to keep every replicate's yearly rows in, if any
+        self.save_logs = save_logs
+
+        # Replicates and early stopping: stop once every 95% CI of a mean DCI
+        # and of a mean PUC is narrower than `tolerance` points
+        self.max_replicates = max_replicates
+        self.min_replicates = min_replicates
+        self.tolerance = tolerance
+
+        self.model = DistrictLevelABM(data_path=data_path, seed=seed, workers=workers, **parameters)
+        self.workers = self.model.workers
+        self.scorer = DCIPUCCalculator(data_path=data_path, sampling_rate=self.model.params.sampling_rate)
+
+        # Streaming accumulators
+        self.count_index = None
+        self.count_stats = RunningStats()
+        self.district_index = None
+        self.dci_stats = RunningStats()
+        self.ready_stats = RunningStats()
+        self.dci_samples = []
+        self.puc_samples = {}
+        self.puc_stats = {}
+
+        self.dci_summary = None
+        self.puc_summary = None
+        self.puc_distribution = None
+        self.yearly_counts = None
+
+    def score_replicate(self, rows):
+        """Run the target-based DCI/PUC pipeline on one replicate's yearly rows."""
+        sim_df = pd.DataFrame(rows, columns=LOG_COLUMNS)
+        dci, puc = self.scorer.score_simulation(sim_df)
+        return sim_df, dci, puc
+
+    def accumulate(self, rows):
+        """Fold one replicate into the running statistics."""
+        sim_df, dci, puc = self.score_replicate(rows)
+
+        counts = sim_df.set_index(['Province', 'District', 'Year'])[COUNT_COLUMNS].sort_index()
+        if self.count_index is None:
+            self.count_index = counts.index
+        self.count_stats.update(counts.reindex(self.count_index).to_numpy(dtype=float))
+
+        dci = dci.set_index(['Province', 'District']).sort_index()
+        if self.district_index is None:
+            self.district_index = dci.index
+        dci = dci.reindex(self.district_index)
+        self.dci_stats.update(dci['DCI'].to_numpy(dtype=float))
+        self.ready_stats.update(dci['ready'].to_numpy(dtype=float))
+        self.dci_samples.append(dci['DCI'].to_numpy(dtype=float))
+
+        for province, value in puc.items():
+            self.puc_samples.setdefault(province, []).append(value)
+            self.puc_stats.setdefault(province, RunningStats()).update(value)
+
+    def interval_width(self):
+        """Widest 95% CI of a mean DCI or mean PUC so far."""
+        widths = [2 * self.dci_stats.ci_half_width().max()]
+        widths += [2 * float(stats.ci_half_width()) for stats in self.puc_stats.values()]
+        return max(widths)
+
+    def run_ensemble(self):
+        """Run replicates until the intervals are narrow enough or the budget is spent."""
+        print(f"Running up to {self.max_replicates} replicates on {self.workers} worker(s), "
+              f"stopping when 95% CI width < {self.tolerance} points...")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.model.setup()
+            self.scorer.load_demographic_data()
+            self.scorer.load_metrics_data()
+
+        replicates = iter_replicates(self.model.district_tasks, self.model.params, self.model.seed,
+                                     self.max_replicates, self.workers)
+        log_writer = None
+        if self.save_logs:
+            log_path = Path('results') / f"ensemble_logs{LOG_FORMATS[self.save_logs]}"
+            log_writer = ColumnarLogWriter(log_path, self.save_logs, schema=REPLICATE_LOG_SCHEMA)
+
+        with contextlib.closing(replicates), log_writer or contextlib.nullcontext():
+            for replicate, rows in replicates:
+                self.accumulate(rows)
+                if log_writer:
+                    log_writer.append([{'Replicate': replicate, **row} for row in rows])
+                n = replicate + 1
+
+                if n >= 2 and n % 10 == 0:
+                    print(f"  {n} replicates: widest 95% CI = {self.interval_width():.2f} points")
+                if n >= max(self.min_replicates, 2) and self.interval_width() < self.tolerance:
+                    print(f"Converged after {n} replicates")
+                    break
+
+        print(f"Completed {self.dci_stats.n} replicates (root seed {self.model.seed})")
+        if log_writer:
+            print(f"Saved {log_writer.rows_written} yearly rows of every replicate to {log_writer.path}")
+
+    def summarize(self):
+        """Build the district, province and yearly-count summary tables."""
+        n = self.dci_stats.n
+        dci_samples = np.vstack(self.dci_samples)
+        half_width = self.dci_stats.ci_half_width()
+        ready_low, ready_high = wilson_interval(self.ready_stats.mean, n)
+
+        self.dci_summary = pd.DataFrame({
+            'DCI_mean': self.dci_stats.mean,
+            'DCI_std': self.dci_stats.std,
+            'DCI_mean_ci_low': self.dci_stats.mean - half_width,
+            'DCI_mean_ci_high': self.dci_stats.mean + half_width,
+            'DCI_p2.5': np.percentile(dci_samples, 2.5, axis=0),
+            'DCI_p97.5': np.percentile(dci_samples, 97.5, axis=0),
+            'Ready_probability': self.ready_stats.mean,
+            'Ready_ci_low': ready_low,
+            'Ready_ci_high': ready_high,
+            'Replicates': n
+        }, index=self.district_index).reset_index()
+
+        puc_rows = []
+        distribution_rows = []
+        for province, samples in self.puc_samples.items():
+            samples = np.asarray(samples)
+            stats = self.puc_stats[province]
+            half_width = float(stats.ci_half_width())
+            puc_rows.append({
+                'Province': province,
+                'PUC_mean': float(stats.mean),
+                'PUC_std': float(stats.std),
+                'PUC_mean_ci_low': float(stats.mean) - half_width,
+                'PUC_mean_ci_high': float(stats.mean) + half_width,
+                'PUC_p2.5': np.percentile(samples, 2.5),
+                'PUC_p97.5': np.percentile(samples, 97.5),
+                'P_province_ready': np.mean(samples >= self.scorer.PUC_threshold),
+                'Replicates': len(samples)
+            })
+            values, counts = np.unique(samples, return_counts=True)
+            for value, count in zip(values, counts):
+                distribution_rows.append({'Province': province, 'PUC': value,
+                                          'Replicates': count, 'Share': count / len(samples)})
+
+        self.puc_summary = pd.DataFrame(puc_rows)
+        self.puc_distribution = pd.DataFrame(distribution_rows)
+
+        count_mean = pd.DataFrame(self.count_stats.mean, index=self.count_index, columns=COUNT_COLUMNS)
+        count_std = pd.DataFrame(self.count_stats.std, index=self.count_index, columns=COUNT_COLUMNS)
+        self.yearly_counts = count_mean.add_suffix('_mean').join(count_std.add_suffix('_std')).reset_index()
+
+    def create_summary_report(self):
+        print("\n" + "="*90)
+        print("ENSEMBLE DCI / PUC ANALYSIS")
+        print("="*90)
+
+        for _, row in self.puc_summary.iterrows():
+            print(f"\n{row['Province'].upper()}")
+            print("-" * 60)
+            print(f"PUC: {row['PUC_mean']:.1f}% (95% CI of mean {row['PUC_mean_ci_low']:.1f}-{row['PUC_mean_ci_high']:.1f}, "
+                  f"95% of runs {row['PUC_p2.5']:.1f}-{row['PUC_p97.5']:.1f})")
+            print(f"P(province ready, PUC ≥ {self.scorer.PUC_threshold}%): {row['P_province_ready']:.2f}")
+
+            districts = self.dci_summary[self.dci_summary['Province'] == row['Province']]
+            print(f"\n{'District':<25} {'DCI':<8} {'95% of runs':<16} {'P(ready)':<10}")
+            for _, district in districts.iterrows():
+                print(f"{district['District']:<25} {district['DCI_mean']:<8.1f} "
+                      f"{district['DCI_p2.5']:.1f}-{district['DCI_p97.5']:<11.1f} {district['Ready_probability']:<10.2f}")
+        print("="*90)
+
+    def save_results(self):
+        output_dir = Path('results')
+        output_dir.mkdir(exist_ok=True)
+
+        print(f"\nSaving results to {output_dir}/...")
+        outputs = {
+            'ensemble_dci_summary.csv': self.dci_summary,
+            'ensemble_puc_summary.csv': self.puc_summary,
+            'ensemble_puc_distribution.csv': self.puc_distribution,
+            'ensemble_yearly_counts.csv': self.yearly_counts
+        }
+        for filename, df in outputs.items():
+            df.to_csv(output_dir / filename, index=False)
+            print(f"Saved: {filename}")
+
+    def run_analysis(self):
+        self.run_ensemble()
+        self.summarize()
+        self.create_summary_report()
+        self.save_results()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo ensemble of DCI/PUC scores.")
+    parser.add_argument('--replicates', type=int, default=200, help="Maximum number of replicates")
+    parser.add_argument('--min-replicates', type=int, default=10, help="Replicates to run before early stopping")
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help="Stop when every 95%% CI of a mean DCI/PUC is narrower than this (points)")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes, one replicate per task (0 = all cores)")
+    parser.add_argument('--seed', type=int, default=None, help="Root random seed")
+    parser.add_argument('--sampling-rate', type=float, default=10.0, help="Population sampling %%")
+    parser.add_argument('--save-logs', choices=['arrow', 'parquet'], default=None,
+                        help="Keep every replicate's yearly rows in results/ensemble_logs.<format>")
+    args = parser.parse_args()
+
+    calculator = EnsembleDCIPUCCalculator(
+        max_replicates=args.replicates,
+        min_replicates=args.min_replicates,
+        tolerance=args.tolerance,
+        workers=args.workers,
+        seed=args.seed,
+        save_logs=args.save_logs,
+        sampling_rate=args.sampling_rate
+    )
+    calculator.run_analysis()
+
+
+if __name__ == "__main__":
+    main()
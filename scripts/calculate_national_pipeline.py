@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Commune -> District -> Province -> National Roll-up
+Scores districts (DCI), provinces (PUC, PCI) and the nation (NUC) in one
+process, handing each level's aggregated frame to the next in memory, and
+keeps an index from every national number back to the districts and
+communes behind it. CSV / Parquet files are an optional export, not the
+way the levels talk to each other
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import pandas as pd
+from pathlib import Path
+
+from abm.cache import read_csv_cached
+from abm.data import demographics_file
+from calculate_score_national import NationalUpscalingCalculator
+from scoring import DCIPUCCalculator
+from scoring.horizon import parse_target_years
+
+EXPORT_FORMATS = ['csv', 'parquet']
+
+
+class NationalPipeline:
+    def __init__(self, data_path='data', simulation_path='CEI-Simulation/data', sampling_rate=10.0, provinces=None,
+                 workers=1, verbose=False):
+        self.scorer = DCIPUCCalculator(data_path=data_path, simulation_path=simulation_path, sampling_rate=sampling_rate,
+                                       normalization='target', provinces=provinces, verbose=verbose)
+        self.workers = workers
+        self.verbose = verbose
+
+        # One frame per level, filled by run()
+        self.communes = None   # Province, District, Commune
+        self.districts = None  # Province, District, indicator means, DCI, ready, Communes
+        self.provinces = None  # One row per province: U_p (PUC), G_p, Y_p, PCI, Ready, Type, district counts
+        self.national = None   # NUC, Ready_Provinces, Total_Provinces, PCI_Threshold
+        self.lineage = None    # (Province, District) -> the district's and its province's numbers
+        self.trajectories = {}  # Per-target-year frames of every level, filled by run_trajectories()
+
+    def quietly(self):
+        """Silence the level calculators' progress prints unless verbose."""
+        return contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    def score_districts(self):
+        """Commune demographics -> district DCI, for every province with simulation logs."""
+        print(f"Scoring the districts of {len(self.scorer.provinces)} province(s)...")
+        self.scorer.load_metrics_data()
+        self.scorer.score_streaming(workers=self.workers)
+
+        communes, districts = [], []
+        for province, df in self.scorer.dci_results.items():
+            demographics = read_csv_cached(demographics_file(self.scorer.data_path, province))
+            communes.append(demographics[['district', 'commune']].drop_duplicates()
+                            .rename(columns={'district': 'District', 'commune': 'Commune'})
+                            .assign(Province=province))
+            districts.append(df.assign(Province=province))
+
+        self.communes = pd.concat(communes, ignore_index=True)[['Province', 'District', 'Commune']]
+        counts = self.communes.groupby(['Province', 'District']).size().rename('Communes').reset_index()
+        districts = pd.concat(districts, ignore_index=True)
+        columns = ['Province'] + [column for column in districts.columns if column != 'Province']
+        self.districts = districts[columns].merge(counts, on=['Province', 'District'], how='left')
+
+    def roll_up_provinces(self):
+        """District DCI tables -> real provinces' PUC and PCI, next to the synthetic provinces."""
+        national = NationalUpscalingCalculator(data_path=self.scorer.data_path)
+        scored = list(self.scorer.dci_results)
+        national.real_provinces = scored
+        national.synthetic_provinces_count = national.total_provinces - len(scored)
+
+        for province, df in self.districts.groupby('Province', sort=False):
+            national.add_real_dci_results(province, df)
+        with self.quietly():
+            real_results = national.calculate_real_province_pci()
+            synthetic_results = national.generate_synthetic_province_data() or []
+
+        self.national_calculator = national
+        self.provinces = pd.DataFrame(real_results + synthetic_results)
+        print(f"Rolled up {len(real_results)} scored and {len(synthetic_results)} synthetic provinces")
+
+    def roll_up_national(self):
+        """Province readiness -> NUC, and the index from it back to the districts."""
+        national = self.national_calculator
+        nuc, m_pass, M = national.calculate_nuc(self.provinces.to_dict('records'))
+        self.national = {
+            'NUC': nuc,
+            'Ready_Provinces': m_pass,
+            'Total_Provinces': M,
+            'PCI_Threshold': national.pci_threshold,
+            'Recommendation': national.recommendation(nuc)
+        }
+
+        province_columns = self.provinces[['Province', 'U_p', 'PCI', 'Ready']].rename(
+            columns={'U_p': 'PUC', 'Ready': 'Province_Ready'})
+        self.lineage = (self.districts[['Province', 'District', 'DCI', 'ready', 'Communes']]
+                        .merge(province_columns, on='Province', how='left')
+                        .set_index(['Province', 'District']).sort_index())
+
+    def trace(self, province=None, district=None):
+        """
+        Rows of the lineage index behind a national number: every scored
+        district (NUC), one province's districts (its PUC and PCI) or one
+        district. Synthetic provinces have no districts.
+        """
+        if province is None:
+            return self.lineage
+        rows = self.lineage.xs(province, level='Province', drop_level=False)
+        return rows if district is None else rows.xs(district, level='District', drop_level=False)
+
+    def district_communes(self, province, district):
+        """Communes summed into a district's demographics."""
+        rows = self.communes[(self.communes['Province'] == province) & (self.communes['District'] == district)]
+        return rows['Commune'].tolist()
+
+    def run_trajectories(self, targets):
+        """
+        Readiness trajectories over the target years `targets`: district DCI
+        and province PUC per T, handed in memory to the national PCI / NUC
+        per T. Run after run(), whose provinces it scores.
+        """
+        print(f"Scoring target years {targets[0]}-{targets[-1]}...")
+        districts, provinces, crossings = self.scorer.score_trajectories(targets, list(self.scorer.dci_results))
+        real_puc = {province: rows['PUC'].to_numpy() for province, rows in provinces.groupby('Province', sort=False)}
+        pci, national, province_crossings = self.national_calculator.national_trajectory(targets, real_puc)
+
+        self.trajectories = {
+            'district_dci': districts,
+            'province_puc': provinces,
+            'district_ready_from': crossings[crossings['District'].notna()].reset_index(drop=True),
+            'province_pci': pci,
+            'province_ready_from': province_crossings,
+            'national_nuc': national
+        }
+        return national
+
+    def run(self):
+        self.score_districts()
+        self.roll_up_provinces()
+        self.roll_up_national()
+        return self.national
+
+    def create_summary_report(self):
+        print("\n" + "="*80)
+        print("NATIONAL ROLL-UP")
+        print("="*80)
+        print(f"NUC: {self.national['NUC']:.1f}% ({self.national['Ready_Provinces']}/{self.national['Total_Provinces']} "
+              f"provinces with PCI >= {self.national['PCI_Threshold']})")
+        print(f"RECOMMENDATION: {self.national['Recommendation']}")
+        print()
+        print(f"{'Province':<20} {'PUC':<8} {'PCI':<8} {'Ready':<7} {'Ready districts':<16} {'Communes':<10}")
+        print("-" * 75)
+        for province, rows in self.lineage.groupby(level='Province'):
+            first = rows.iloc[0]
+            ready = f"{int(rows['ready'].sum())}/{len(rows)}"
+            print(f"{province:<20} {first['PUC']:<8.1f} {first['PCI']:<8.1f} {'YES' if first['Province_Ready'] else 'NO':<7} "
+                  f"{ready:<16} {int(rows['Communes'].sum()):<10}")
+        print("="*80)
+
+        if self.trajectories:
+            national = self.trajectories['national_nuc']
+            ready_from = self.trajectories['province_ready_from'].set_index('Province')['Ready_From']
+            print(f"\n{'T':<6} {'NUC':<8} Ready provinces")
+            for _, row in national.iterrows():
+                print(f"{row['T']:<6} {row['NUC']:<8.1f} {row['Ready_Provinces']}/{row['Total_Provinces']}")
+            for province in self.lineage.index.unique(level='Province'):
+                year = ready_from[province]
+                print(f"{province}: PCI ready from {'never' if pd.isna(year) else int(year)}")
+            print("="*80)
+
+    def export(self, output_dir='results', fmt='csv'):
+        """Write every level's frame to `output_dir` as CSV or Parquet."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"fmt must be one of {EXPORT_FORMATS}, got {fmt!r}")
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"\nExporting results to {output_dir}/...")
+        frames = {
+            'rollup_communes': self.communes,
+            'rollup_districts': self.districts,
+            'rollup_provinces': self.provinces,
+            'rollup_national': pd.DataFrame([self.national]),
+            'rollup_lineage': self.lineage.reset_index()
+        }
+        frames.update({f"rollup_trajectory_{name}": df for name, df in self.trajectories.items()})
+        for name, df in frames.items():
+            filename = f"{name}.{fmt}"
+            if fmt == 'csv':
+                df.to_csv(output_dir / filename, index=False)
+            else:
+                df.to_parquet(output_dir / filename, index=False)
+            print(f"Saved: {filename}")
+
+    def run_analysis(self, export=None, output_dir='results', targets=None):
+        self.run()
+        if targets:
+            self.run_trajectories(targets)
+        self.create_summary_report()
+        if export:
+            self.export(output_dir, export)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score districts, provinces and the nation in one in-memory pass.")
+    parser.add_argument('--province', action='append', dest='provinces',
+                        help="Province to score (repeatable, default: every province with simulation logs)")
+    parser.add_argument('--sampling-rate', type=float, default=10.0, help="Population sampling %%")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes, one province per task (0 = all cores)")
+    parser.add_argument('--export', choices=EXPORT_FORMATS, help="Also write every level's table in this format")
+    parser.add_argument('--output-dir', default='results', help="Directory for --export (default: results)")
+    parser.add_argument('--targets', type=parse_target_years, metavar='START:END',
+                        help="Also roll up every target year T in a range (e.g. 2026:2035)")
+    parser.add_argument('--verbose', action='store_true', help="Show the per-level progress output")
+    args = parser.parse_args()
+
+    pipeline = NationalPipeline(sampling_rate=args.sampling_rate, provinces=args.provinces,
+                                workers=args.workers or os.cpu_count(), verbose=args.verbose)
+    pipeline.run_analysis(export=args.export, output_dir=args.output_dir, targets=args.targets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Intervention Scenario Sweep
+Warm-starts every district once, resumes each intervention scenario from the
+shared burn-in (optionally on a process pool) and scores every scenario with
+the target-based DCI/PUC framework
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pandas as pd
+from pathlib import Path
+
+from abm import Checkpoint, DistrictLevelABM, LOG_COLUMNS, ABMParameters
+from abm.scenarios import (CARE_PARAMETERS, INTERVENTION_FLAGS, OUTCOME_COLUMNS, RATE_COLUMNS, care_outcomes,
+                           iter_scenarios, scenario_grid, scenario_name, scenario_params, state_key)
+from scoring import DCIPUCCalculator
+
+
+def parse_value(name, text):
+    """Parse an --axis value with the type of the parameter's default."""
+    default = getattr(ABMParameters(), name)
+    if isinstance(default, bool):
+        if text.lower() not in ('true', 'false', '1', '0', 'on', 'off'):
+            raise ValueError(f"{name} expects true/false, got {text!r}")
+        return text.lower() in ('true', '1', 'on')
+    return type(default)(text)
+
+
+class ScenarioSweepCalculator:
+    def __init__(self, scenarios, data_path='data', warm_start_year=2024, checkpoint_path=None,
+                 workers=1, seed=None, **parameters):
+        self.data_path = Path(data_path)
+        self.configs = scenarios
+        self.warm_start_year = warm_start_year
+        self.checkpoint_path = checkpoint_path
+
+        # Scenario parameters are the base parameters overridden by each config
+        self.model = DistrictLevelABM(data_path=data_path, seed=seed, workers=workers, **parameters)
+        self.workers = self.model.workers
+        self.scenarios = [scenario_params(self.model.params, config) for config in scenarios]
+        self.names = [scenario_name(config) for config in scenarios]
+
+        self.checkpoints = {}
+        self.scorers = {}
+        self.dci_table = None
+        self.puc_table = None
+
+        # Swept parameters the DCI cannot see: they only move the care outcome columns
+        swept = [name for name in dict.fromkeys(name for config in scenarios for name in config)
+                 if len({repr(config.get(name)) for config in scenarios}) > 1]
+        care_only = [name for name in swept if name in CARE_PARAMETERS]
+        if care_only:
+            print(f"Warning: {', '.join(care_only)} only change care seeking (ANC visits, skilled births, "
+                  f"immunizations), not the population counts the DCI scores; "
+                  f"compare scenarios on the outcome columns ({', '.join(RATE_COLUMNS)})")
+
+    def warm_start(self):
+        """Build (or load) one shared burn-in per group of state-compatible scenarios."""
+        if self.checkpoint_path:
+            checkpoint = Checkpoint.load(self.checkpoint_path)
+            for params in self.scenarios:
+                checkpoint.check_compatible(params)
+            self.checkpoints[state_key(checkpoint.params)] = checkpoint
+            return
+
+        for params in self.scenarios:
+            key = state_key(params)
+            if key in self.checkpoints:
+                continue
+            # The burn-in runs without interventions; scenarios switch theirs on at the warm-start year
+            burn_in = scenario_params(params, {name: False for name in INTERVENTION_FLAGS})
+            model = DistrictLevelABM(data_path=self.data_path, provinces=self.model.provinces, seed=self.model.seed,
+                                     workers=self.workers, **vars(burn_in))
+            self.checkpoints[key] = model.warm_start(self.warm_start_year)
+
+    def scorer(self, sampling_rate):
+        """One DCI/PUC calculator per sampling rate, with its inputs loaded once."""
+        if sampling_rate not in self.scorers:
+            scorer = DCIPUCCalculator(data_path=self.data_path, sampling_rate=sampling_rate)
+            with contextlib.redirect_stdout(io.StringIO()):
+                scorer.load_demographic_data()
+                scorer.load_metrics_data()
+            self.scorers[sampling_rate] = scorer
+        return self.scorers[sampling_rate]
+
+    def run_sweep(self):
+        print(f"Sweeping {len(self.scenarios)} scenarios from {len(self.checkpoints)} shared warm start(s) "
+              f"on {self.workers} worker(s)...")
+
+        dci_tables, puc_rows = [], []
+        scenarios = iter_scenarios(self.checkpoints, self.scenarios, self.workers)
+        with contextlib.closing(scenarios):
+            for index, rows in scenarios:
+                config, name = self.configs[index], self.names[index]
+                sim_df = pd.DataFrame(rows, columns=LOG_COLUMNS)
+                scorer = self.scorer(self.scenarios[index].sampling_rate)
+                dci, puc = scorer.score_simulation(sim_df)
+
+                dci['PUC'] = dci['Province'].map(puc)
+                dci = dci.merge(care_outcomes(rows), on=['Province', 'District'], how='left')
+                dci_tables.append(dci.assign(Scenario=name, **config))
+                province_outcomes = care_outcomes(rows, by=['Province']).set_index('Province')
+                for province, value in puc.items():
+                    puc_rows.append({'Scenario': name, **config, 'Province': province, 'PUC': value,
+                                     'Province_Ready': value >= scorer.PUC_threshold,
+                                     **province_outcomes.loc[province].to_dict()})
+                print(f"  [{index + 1}/{len(self.scenarios)}] {name}: " +
+                      ", ".join(f"{province} PUC {value:.1f}%, skilled births "
+                                f"{province_outcomes.loc[province, 'Skilled_Birth_Rate']:.1f}%"
+                                for province, value in puc.items()))
+
+        columns = ['Scenario'] + list(dict.fromkeys(name for config in self.configs for name in config))
+        outcomes = OUTCOME_COLUMNS + RATE_COLUMNS
+        self.dci_table = pd.concat(dci_tables, ignore_index=True)
+        self.dci_table = self.dci_table[columns + ['Province', 'District', 'DCI', 'ready', 'PUC'] + outcomes]
+        self.puc_table = pd.DataFrame(puc_rows)[columns + ['Province', 'PUC', 'Province_Ready'] + outcomes]
+        self.puc_table = self.puc_table.astype(dict.fromkeys(OUTCOME_COLUMNS, int))
+
+        by_district = self.dci_table.groupby(['Province', 'District'])[outcomes + ['DCI']]
+        if len(self.configs) > 1 and not (by_district.nunique(dropna=False) > 1).any().any():
+            print("Warning: every scenario has the same DCI and care outcomes in every district. The app, SMS "
+                  "and CHW boosts need app engagement, SMS or CHW contact, which the model (like the GAML) "
+                  "never sets, and incentives only reach women above 60% poverty (50% for immunizations)")
+
+    def create_summary_report(self):
+        print("\n" + "="*90)
+        print("INTERVENTION SCENARIO SWEEP")
+        print("="*90)
+        summary = self.puc_table.pivot_table(index='Scenario', columns='Province', values='PUC', sort=False)
+        print(summary.to_string(float_format=lambda value: f"{value:.1f}"))
+        for rate in RATE_COLUMNS:
+            print("-"*90)
+            print(rate)
+            summary = self.puc_table.pivot_table(index='Scenario', columns='Province', values=rate, sort=False)
+            print(summary.to_string(float_format=lambda value: f"{value:.2f}"))
+        print("="*90)
+
+    def save_results(self):
+        output_dir = Path('results')
+        output_dir.mkdir(exist_ok=True)
+
+        print(f"\nSaving results to {output_dir}/...")
+        outputs = {
+            'scenario_sweep_dci.csv': self.dci_table,
+            'scenario_sweep_puc.csv': self.puc_table
+        }
+        for filename, df in outputs.items():
+            df.to_csv(output_dir / filename, index=False)
+            print(f"Saved: {filename}")
+
+    def run_analysis(self):
+        self.warm_start()
+        self.run_sweep()
+        self.create_summary_report()
+        self.save_results()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score intervention scenarios resumed from a shared burn-in.")
+    parser.add_argument('--axis', action='append', default=[], metavar='NAME=V1,V2',
+                        help="Sweep a parameter over values (repeatable, default: every on/off combination "
+                             "of the four interventions)")
+    parser.add_argument('--scenarios', metavar='FILE',
+                        help="JSON list of scenario configs, e.g. [{\"incentives\": true}], instead of a grid")
+    parser.add_argument('--warm-start-year', type=int, default=2024,
+                        help="Year the interventions start; 2019 up to it is simulated once (default: 2024)")
+    parser.add_argument('--checkpoint', metavar='PATH', help="Resume from a saved checkpoint instead of warm-starting")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes, one scenario per task (0 = all cores)")
+    parser.add_argument('--seed', type=int, default=None, help="Root random seed")
+    parser.add_argument('--sampling-rate', type=float, default=10.0, help="Population sampling %%")
+    args = parser.parse_args()
+
+    if args.scenarios:
+        scenarios = json.loads(Path(args.scenarios).read_text())
+    else:
+        axes = {}
+        for axis in args.axis:
+            name, _, values = axis.partition('=')
+            if not hasattr(ABMParameters(), name) or not values:
+                parser.error(f"--axis expects NAME=V1,V2 with a model parameter name, got {axis!r}")
+            try:
+                axes[name] = [parse_value(name, value) for value in values.split(',')]
+            except ValueError as e:
+                parser.error(str(e))
+        if not args.axis:
+            axes = {name: [False, True] for name in INTERVENTION_FLAGS}
+        scenarios = scenario_grid(**axes)
+
+    calculator = ScenarioSweepCalculator(
+        scenarios,
+        warm_start_year=args.warm_start_year,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        seed=args.seed,
+        sampling_rate=args.sampling_rate
+    )
+    calculator.run_analysis()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,45 @@ Implements the exact mathematical framework from the research paper:
 - Threshold-based readiness assessment
 """
 
+import argparse
+import os
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from abm.cache import read_csv_cached
+from abm.places import official_province_name, province_name, province_names
+from abm.pool import ordered_pool_map
+from scoring.horizon import horizon_span, parse_target_years, ready_from, window_means
+
+# National recommendation by minimum NUC (%), checked in order
+RECOMMENDATION_BANDS = [
+    (85, "PROCEED with nationwide rollout"),
+    (70, "CONDITIONAL rollout - strengthen lagging provinces"),
+    (50, "PILOT expansion - major capacity building needed"),
+    (0, "POSTPONE rollout - fundamental strengthening required")
+]
+
+
+def _simulate_task(context, task):
+    calculator, inputs = context
+    seed, size = task
+    return calculator.simulate_nuc(inputs, np.random.default_rng(seed), size)
+
+
 class NationalUpscalingCalculator:
-    def __init__(self, data_path='data', results_path='results'):
+    def __init__(self, data_path='data', results_path='results', seed=42):
         self.data_path = Path(data_path)
         self.results_path = Path(results_path)
+        self.seed = seed  # Growth shocks and synthetic U_p draws, reproducible results
         
         # Framework parameters (from research paper)
         self.target_year = 2030  # T
         self.calculation_years = list(range(2024, 2030))  # T-6 to T-1 (6 years)
+        self.history_years = list(range(2019, 2024))  # Reported GRDP growth (Year_2019 to Year_2023)
         self.total_provinces = 63  # Total provinces in Vietnam
         self.real_provinces = ['Dien Bien', 'Thai Nguyen']  # Have real DCI data
         self.synthetic_provinces_count = 61  # Generate PCI for 61 others
@@ -38,6 +63,9 @@ class NationalUpscalingCalculator:
         
         # Load real data
         self.economic_data = self.load_economic_data()
+        # Clean English name of each economic data row, to match provinces however they are spelled
+        self.economic_provinces = (province_names(self.economic_data['Province_City'])
+                                   if self.economic_data is not None else None)
         self.real_dci_data = {}
         self.province_results = []
         
@@ -45,154 +73,106 @@ class NationalUpscalingCalculator:
         """Load real economic data from CSV file."""
         csv_path = self.data_path / 'metrics' / 'provincial_economic_data.csv'
         if csv_path.exists():
-            df = pd.read_csv(csv_path)
+            df = read_csv_cached(csv_path)
             print(f"Loaded economic data for {len(df)} provinces")
             return df
         else:
             print(f"Warning: Economic data CSV not found at {csv_path}")
             return None
     
+    def check_economic_data(self):
+        """Exit with an error if there is no economic data to build the synthetic provinces from."""
+        if self.economic_data is None:
+            sys.exit("Error: No economic data available!")
+    
     def clean_province_name(self, vietnamese_name):
         """Convert Vietnamese province names to clean English names."""
-        # Mapping of Vietnamese names to clean English names
-        name_mapping = {
-            'Thành phố Hồ Chí Minh': 'Ho Chi Minh City',
-            'Hà Nội': 'Ha Noi',
-            'Bình Dương': 'Binh Duong',
-            'Đồng Nai': 'Dong Nai',
-            'Hải Phòng': 'Hai Phong',
-            'Bà Rịa – Vũng Tàu': 'Ba Ria - Vung Tau',
-            'Quảng Ninh': 'Quang Ninh',
-            'Thanh Hóa': 'Thanh Hoa',
-            'Bắc Ninh': 'Bac Ninh',
-            'Nghệ An': 'Nghe An',
-            'Cần Thơ': 'Can Tho',
-            'Đà Nẵng': 'Da Nang',
-            'Khánh Hòa': 'Khanh Hoa',
-            'Lâm Đồng': 'Lam Dong',
-            'Bình Định': 'Binh Dinh',
-            'Thái Nguyên': 'Thai Nguyen',
-            'Điện Biên': 'Dien Bien',
-            'Vĩnh Phúc': 'Vinh Phuc',
-            'Bắc Giang': 'Bac Giang',
-            'Hưng Yên': 'Hung Yen',
-            'Hải Dương': 'Hai Duong',
-            'Quảng Nam': 'Quang Nam',
-            'Bình Thuận': 'Binh Thuan',
-            'Long An': 'Long An',
-            'Đồng Tháp': 'Dong Thap',
-            'Tiền Giang': 'Tien Giang',
-            'Kiên Giang': 'Kien Giang',
-            'Cà Mau': 'Ca Mau',
-            'Tây Ninh': 'Tay Ninh',
-            'An Giang': 'An Giang',
-            'Thừa Thiên Huế': 'Thua Thien Hue',
-            'Phú Thọ': 'Phu Tho',
-            'Lạng Sơn': 'Lang Son',
-            'Quảng Bình': 'Quang Binh',
-            'Gia Lai': 'Gia Lai',
-            'Bình Phước': 'Binh Phuoc',
-            'Hà Tĩnh': 'Ha Tinh',
-            'Cao Bằng': 'Cao Bang',
-            'Sóc Trăng': 'Soc Trang',
-            'Hà Nam': 'Ha Nam',
-            'Nam Định': 'Nam Dinh',
-            'Ninh Bình': 'Ninh Binh',
-            'Thái Bình': 'Thai Binh',
-            'Vĩnh Long': 'Vinh Long',
-            'Hậu Giang': 'Hau Giang',
-            'Bến Tre': 'Ben Tre',
-            'Trà Vinh': 'Tra Vinh',
-            'Đắk Lắk': 'Dak Lak',
-            'Kon Tum': 'Kon Tum',
-            'Đắk Nông': 'Dak Nong',
-            'Phú Yên': 'Phu Yen',
-            'Quảng Ngãi': 'Quang Ngai',
-            'Ninh Thuận': 'Ninh Thuan',
-            'Quảng Trị': 'Quang Tri',
-            'Sơn La': 'Son La',
-            'Hòa Bình': 'Hoa Binh',
-            'Yên Bái': 'Yen Bai',
-            'Tuyên Quang': 'Tuyen Quang',
-            'Lào Cai': 'Lao Cai',
-            'Hà Giang': 'Ha Giang',
-            'Lai Châu': 'Lai Chau',
-            'Bạc Liêu': 'Bac Lieu'
+        return province_name(vietnamese_name)
+    
+    def dci_results_path(self, province):
+        return self.results_path / f"dci_results_{province.lower().replace(' ', '_')}_target_based.csv"
+    
+    def add_real_dci_results(self, province, df):
+        """Use a real province's district DCI table (District, DCI, ready, ...) for its U_p."""
+        # Calculate Province-level Upscaling Confidence (PUC)
+        puc = (df['ready'].sum() / len(df)) * 100
+        
+        self.real_dci_data[province] = {
+            'Province': province,
+            'U_p': puc,  # Province-level Upscaling Confidence
+            'Districts_ready': df['ready'].sum(),
+            'Total_districts': len(df),
+            'DCI_mean': df['DCI'].mean()
         }
-        
-        return name_mapping.get(vietnamese_name, vietnamese_name.replace('ă', 'a').replace('â', 'a').replace('á', 'a').replace('à', 'a').replace('ê', 'e').replace('é', 'e').replace('è', 'e').replace('ô', 'o').replace('ơ', 'o').replace('ó', 'o').replace('ò', 'o').replace('ư', 'u').replace('ú', 'u').replace('ù', 'u').replace('ý', 'y').replace('ỳ', 'y').replace('đ', 'd').replace('Đ', 'D'))
     
-    def load_real_dci_data(self):
+    def load_real_dci_data(self, provinces=None):
         """Load real DCI results from Thai Nguyen and Dien Bien."""
         print("Loading real DCI data...")
         
-        for province in self.real_provinces:
-            filename = f"dci_results_{province.lower().replace(' ', '_')}_target_based.csv"
-            filepath = self.results_path / filename
+        for province in provinces if provinces is not None else self.real_provinces:
+            filepath = self.dci_results_path(province)
+            filename = filepath.name
             
             if filepath.exists():
-                df = pd.read_csv(filepath)
-                
-                # Calculate Province-level Upscaling Confidence (PUC)
-                puc = (df['ready'].sum() / len(df)) * 100
-                
-                self.real_dci_data[province] = {
-                    'Province': province,
-                    'U_p': puc,  # Province-level Upscaling Confidence
-                    'Districts_ready': df['ready'].sum(),
-                    'Total_districts': len(df),
-                    'DCI_mean': df['DCI'].mean()
-                }
-                
-                print(f"Loaded {province}: U_p = {puc:.1f}%")
+                self.add_real_dci_results(province, pd.read_csv(filepath))
+                print(f"Loaded {province}: U_p = {self.real_dci_data[province]['U_p']:.1f}%")
             else:
                 print(f"Warning: {filename} not found")
     
-    def calculate_six_year_means(self, province_name, economic_row, base_gdp_per_capita):
+    def historical_growth(self, economic_df):
+        """
+        Provinces x years matrix of historical GRDP growth (2019-2023), a
+        missing column filled with its typical value and missing cells NaN.
+        """
+        defaults = {
+            'Year_2019': 6.0,
+            'Year_2020': 3.5,  # COVID impact
+            'Year_2021': 3.0,  # COVID recovery
+            'Year_2022': 8.5,  # Post-COVID growth
+            'Year_2023': 6.0   # Normalization
+        }
+        return np.column_stack([self.economic_column(economic_df, column, default)
+                                for column, default in defaults.items()])
+    
+    def base_growth_rates(self, historical_growth):
+        """Mean of each province's last three reported growth rates (6.0 with fewer than three)."""
+        reported = ~np.isnan(historical_growth)
+        # Position of each reported year counted from the latest one
+        from_latest = np.cumsum(reported[:, ::-1], axis=1)[:, ::-1]
+        last_three = reported & (from_latest <= 3)
+        means = np.where(last_three, historical_growth, 0).sum(axis=1) / 3
+        return np.where(reported.sum(axis=1) >= 3, means, 6.0)
+    
+    def calculate_six_year_means(self, base_growth, base_gdp_per_capita, noise=None, rng=None):
         """
         Calculate six-year means according to Formula (8):
         X_p = (1/6) * Σ(X_p,T-k) for k=1 to 6
-        """
-        
-        # For G_p (GRDP growth rate)
-        # Use historical data and projections
-        historical_growth = [
-            economic_row.get('Year_2019', 6.0),
-            economic_row.get('Year_2020', 3.5),  # COVID impact
-            economic_row.get('Year_2021', 3.0),  # COVID recovery
-            economic_row.get('Year_2022', 8.5),  # Post-COVID growth
-            economic_row.get('Year_2023', 6.0)   # Normalization
-        ]
-        
-        # Clean historical data
-        historical_growth = [g for g in historical_growth if pd.notna(g) and g is not None]
-        
-        # Project future years (2024-2029) based on trends and targets
-        projected_growth = []
-        base_growth = np.mean(historical_growth[-3:]) if len(historical_growth) >= 3 else 6.0
-        
-        for year in self.calculation_years:  # 2024-2029
-            # More optimistic projections - gradual improvement
-            year_factor = (year - 2024) * 0.15  # 15% improvement per year
-            projected = base_growth * (1 + year_factor) + np.random.normal(0, 0.3)
-            
-            # Ensure reasonable bounds but allow higher growth
-            projected_growth.append(max(2.0, min(12.0, projected)))
-        
-        G_p = np.mean(projected_growth)  # Six-year mean
-        
-        # For Y_p (GRDP per capita)
-        # Project GDP per capita growth from a realistic baseline
-        gdp_per_capita_values = []
-        current_gdp = base_gdp_per_capita
         
-        for year in self.calculation_years:
-            # Compound growth with productivity bonus
-            productivity_bonus = 1.02  # 2% annual productivity improvement
-            current_gdp *= (1 + G_p / 100) * productivity_bonus
-            gdp_per_capita_values.append(current_gdp)
-        
-        Y_p = np.mean(gdp_per_capita_values)  # Six-year mean
+        Works on arrays of provinces at once: `noise` (default: N(0, 0.3)
+        draws from `rng`, seeded with self.seed if not given) has a trailing
+        axis of one value per calculation year, and any leading axes (e.g.
+        Monte Carlo realizations) carry through to G_p and Y_p.
+        """
+        n_years = len(self.calculation_years)
+        base_growth = np.asarray(base_growth, dtype=float)
+        if noise is None:
+            rng = rng if rng is not None else np.random.default_rng(self.seed)
+            noise = rng.normal(0, 0.3, base_growth.shape + (n_years,))
+        
+        # For G_p (GRDP growth rate): projections 2024-2029 improving 15% per year,
+        # within reasonable bounds but allowing higher growth
+        year_factor = (np.array(self.calculation_years) - 2024) * 0.15
+        projected_growth = np.clip(base_growth[..., None] * (1 + year_factor) + noise, 2.0, 12.0)
+        G_p = projected_growth.mean(axis=-1)  # Six-year mean
+        
+        # For Y_p (GRDP per capita): compound growth with a 2% annual productivity bonus,
+        # accumulated year by year from the baseline
+        productivity_bonus = 1.02
+        factor = (1 + G_p / 100) * productivity_bonus
+        steps = np.concatenate([np.broadcast_to(base_gdp_per_capita, G_p.shape)[..., None],
+                                np.repeat(factor[..., None], n_years, axis=-1)], axis=-1)
+        gdp_per_capita_values = np.multiply.accumulate(steps, axis=-1)[..., 1:]
+        Y_p = gdp_per_capita_values.mean(axis=-1)  # Six-year mean
         
         return G_p, Y_p
     
@@ -206,9 +186,9 @@ class NationalUpscalingCalculator:
         # Formula (10): U_p* = U_p (no further normalization)
         U_p_star = U_p
         
-        # Formula (9): Normalization for G and Y
-        G_p_star = min(100, 100 * G_p / self.targets['G'])
-        Y_p_star = min(100, 100 * Y_p / self.targets['Y'])
+        # Formula (9): Normalization for G and Y (scalars or arrays)
+        G_p_star = np.minimum(100, 100 * G_p / self.targets['G'])
+        Y_p_star = np.minimum(100, 100 * Y_p / self.targets['Y'])
         
         return U_p_star, G_p_star, Y_p_star
     
@@ -219,14 +199,18 @@ class NationalUpscalingCalculator:
         """
         return (1 * U_p_star + 1 * G_p_star + 1 * Y_p_star) / 3
     
-    def generate_synthetic_province_data(self):
-        """Generate realistic data for 61 synthetic provinces using actual names."""
-        print(f"Generating data for {self.synthetic_provinces_count} synthetic provinces...")
-        
-        if self.economic_data is None:
-            print("Error: No economic data available!")
-            return
-        
+    def economic_column(self, economic_df, column, default):
+        """One economic indicator per province as floats, `default` if the column is missing."""
+        if column in economic_df:
+            return economic_df[column].to_numpy(dtype=float)
+        return np.full(len(economic_df), default)
+    
+    def synthetic_province_inputs(self):
+        """
+        Deterministic inputs of the 61 synthetic provinces, one row each:
+        Province, Vietnamese_Name, the U_p draw range (U_low, U_high) of
+        its performance tier, base growth and baseline GDP per capita.
+        """
         # Create a tiered baseline for GRDP per capita (USD) to simulate reality
         # Based on user's expert knowledge
         gdp_baselines = {
@@ -256,101 +240,121 @@ class NationalUpscalingCalculator:
             'Hoa Binh': 4000
         }
 
-        np.random.seed(42)  # Reproducible results
-        synthetic_provinces = []
-        
-        # Exclude real provinces from economic data
-        available_economic_data = self.economic_data[
-            ~self.economic_data['Province_City'].isin([
-                'Thái Nguyên', 'Điện Biên'  # Vietnamese names
-            ])
-        ].copy()
-        
-        # Generate for each economic data row (should be 61 provinces)
-        for idx, (_, economic_row) in enumerate(available_economic_data.iterrows()):
-            if len(synthetic_provinces) >= self.synthetic_provinces_count:
-                break
-                
-            # Use actual province name
-            vietnamese_name = economic_row['Province_City']
-            province_name = self.clean_province_name(vietnamese_name)
-            
-            # Generate more optimistic U_p (PUC) based on economic performance
-            historical_performance = economic_row.get('Year_2023', 5.0)
-            growth_2024 = economic_row.get('Growth_Rate_2024', 6.0)
-            
-            # PUC ranges adjusted for moderately strict threshold
-            if historical_performance >= 7.0 or growth_2024 >= 8.0:  # High performers
-                U_p = np.random.uniform(88, 99)
-            elif historical_performance >= 4.0 or growth_2024 >= 6.0:  # Moderate performers
-                U_p = np.random.uniform(78, 94)
-            else:  # Lower performers
-                U_p = np.random.uniform(68, 86)
-            
-            # Get the simulated baseline GDP, with a default for unlisted provinces
-            base_gdp_per_capita = gdp_baselines.get(province_name, 4000)
-
-            # Calculate six-year means
-            G_p, Y_p = self.calculate_six_year_means(province_name, economic_row, base_gdp_per_capita)
-            
-            # Normalize indicators
-            U_p_star, G_p_star, Y_p_star = self.normalize_indicators(U_p, G_p, Y_p)
-            
-            # Calculate PCI
-            pci = self.calculate_pci(U_p_star, G_p_star, Y_p_star)
-            
-            # Determine readiness
-            ready = pci >= self.pci_threshold
-            
-            synthetic_provinces.append({
-                'Province': province_name,
-                'Vietnamese_Name': vietnamese_name,
-                'U_p': U_p,
-                'G_p': G_p,
-                'Y_p': Y_p,
-                'U_p_star': U_p_star,
-                'G_p_star': G_p_star,
-                'Y_p_star': Y_p_star,
-                'PCI': pci,
-                'Ready': ready,
-                'Type': 'Synthetic'
-            })
+        # Exclude real provinces from economic data (should leave 61 provinces)
+        synthetic = ~self.economic_provinces.isin(self.real_provinces)
+        available_economic_data = self.economic_data[synthetic].head(self.synthetic_provinces_count)
+        
+        # Use actual province names
+        vietnamese_names = available_economic_data['Province_City'].to_numpy()
+        english_names = self.economic_provinces[synthetic].head(self.synthetic_provinces_count).tolist()
+        
+        # Generate more optimistic U_p (PUC) based on economic performance,
+        # PUC ranges adjusted for moderately strict threshold
+        historical_performance = self.economic_column(available_economic_data, 'Year_2023', 5.0)
+        growth_2024 = self.economic_column(available_economic_data, 'Growth_Rate_2024', 6.0)
+        tiers = [
+            (historical_performance >= 7.0) | (growth_2024 >= 8.0),  # High performers
+            (historical_performance >= 4.0) | (growth_2024 >= 6.0)   # Moderate performers
+        ]
+        
+        return pd.DataFrame({
+            'Province': english_names,
+            'Vietnamese_Name': vietnamese_names,
+            'U_low': np.select(tiers, [88, 78], 68).astype(float),  # Lower performers otherwise
+            'U_high': np.select(tiers, [99, 94], 86).astype(float),
+            'base_growth': self.base_growth_rates(self.historical_growth(available_economic_data)),
+            # Simulated baseline GDP, with a default for unlisted provinces
+            'base_gdp': [float(gdp_baselines.get(name, 4000)) for name in english_names]
+        })
+    
+    def generate_synthetic_province_data(self, rng=None):
+        """
+        Generate realistic data for 61 synthetic provinces using actual names.
+        Draws come from `rng`, by default the legacy np.random stream of
+        self.seed (what np.random.seed(42) used to give), without touching
+        the global random state.
+        """
+        print(f"Generating data for {self.synthetic_provinces_count} synthetic provinces...")
+        
+        if self.economic_data is None:
+            print("Error: No economic data available!")
+            return
+        
+        inputs = self.synthetic_province_inputs()
+        n = len(inputs)
+        
+        # All random draws at once: one U_p draw per province, then one growth shock per province and year
+        rng = rng if rng is not None else np.random.RandomState(self.seed)
+        u_draws = rng.random(n)
+        growth_noise = rng.normal(0, 0.3, (n, len(self.calculation_years)))
+        
+        U_p = inputs['U_low'].to_numpy() + (inputs['U_high'] - inputs['U_low']).to_numpy() * u_draws
+        
+        # Calculate six-year means
+        G_p, Y_p = self.calculate_six_year_means(inputs['base_growth'].to_numpy(), inputs['base_gdp'].to_numpy(),
+                                                 growth_noise)
+        
+        # Normalize indicators
+        U_p_star, G_p_star, Y_p_star = self.normalize_indicators(U_p, G_p, Y_p)
+        
+        # Calculate PCI
+        pci = self.calculate_pci(U_p_star, G_p_star, Y_p_star)
+        
+        synthetic_provinces = pd.DataFrame({
+            'Province': inputs['Province'],
+            'Vietnamese_Name': inputs['Vietnamese_Name'],
+            'U_p': U_p,
+            'G_p': G_p,
+            'Y_p': Y_p,
+            'U_p_star': U_p_star,
+            'G_p_star': G_p_star,
+            'Y_p_star': Y_p_star,
+            'PCI': pci,
+            'Ready': pci >= self.pci_threshold,  # Determine readiness
+            'Type': 'Synthetic'
+        }).to_dict('records')
         
         print(f"Generated {len(synthetic_provinces)} synthetic provinces")
         return synthetic_provinces
     
-    def calculate_real_province_pci(self):
-        """Calculate PCI for real provinces with actual DCI data."""
+    def real_province_growth_inputs(self, province_name):
+        """(base growth, baseline GDP per capita) of a real province, None without economic data."""
+        if self.economic_data is None:
+            return None
+        
+        # Map to economic data
+        economic_match = self.economic_data[self.economic_provinces == province_name]
+        if economic_match.empty:
+            return None
+        
+        # Use known baselines for the two real provinces
+        gdp_real_baselines = {'Dien Bien': 700, 'Thai Nguyen': 4800}
+        base_gdp_per_capita = gdp_real_baselines.get(province_name, 4500)  # fallback
+        
+        base_growth = self.base_growth_rates(self.historical_growth(economic_match.head(1)))[0]
+        return base_growth, base_gdp_per_capita
+    
+    def calculate_real_province_pci(self, rng=None):
+        """
+        Calculate PCI for real provinces with actual DCI data, drawing their
+        growth shocks in order from `rng` (default: seeded with self.seed).
+        """
         print("Calculating PCI for real provinces...")
         
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
         real_province_results = []
         
         for province_name, data in self.real_dci_data.items():
             U_p = data['U_p']  # Already calculated PUC
             
             # Get economic data for this province
-            economic_row = None
-            if self.economic_data is not None:
-                # Map to economic data
-                name_mapping = {
-                    'Thai Nguyen': 'Thái Nguyên',
-                    'Dien Bien': 'Điện Biên'
-                }
-                csv_name = name_mapping.get(province_name, province_name)
-                economic_match = self.economic_data[
-                    self.economic_data['Province_City'] == csv_name
-                ]
-                
-                if not economic_match.empty:
-                    economic_row = economic_match.iloc[0]
+            growth_inputs = self.real_province_growth_inputs(province_name)
             
-            if economic_row is not None:
-                # Use known baselines for the two real provinces
-                gdp_real_baselines = {'Dien Bien': 700, 'Thai Nguyen': 4800}
-                base_gdp_per_capita = gdp_real_baselines.get(province_name, 4500) # fallback
-                
+            if growth_inputs is not None:
                 # Calculate six-year means
-                G_p, Y_p = self.calculate_six_year_means(province_name, economic_row, base_gdp_per_capita)
+                base_growth, base_gdp_per_capita = growth_inputs
+                G_p, Y_p = self.calculate_six_year_means(base_growth, base_gdp_per_capita, rng=rng)
+                G_p, Y_p = float(G_p), float(Y_p)
             else:
                 # Use national averages if no economic data
                 print(f"Warning: No economic data for {province_name}, using estimates")
@@ -368,7 +372,7 @@ class NationalUpscalingCalculator:
             
             real_province_results.append({
                 'Province': province_name,
-                'Vietnamese_Name': name_mapping.get(province_name, province_name),
+                'Vietnamese_Name': official_province_name(province_name),
                 'U_p': U_p,
                 'G_p': G_p,
                 'Y_p': Y_p,
@@ -404,6 +408,7 @@ class NationalUpscalingCalculator:
         print("="*70)
         print("NATIONAL UPSCALING CONFIDENCE ANALYSIS")
         print("="*70)
+        self.check_economic_data()
         print(f"Target Year: {self.target_year}")
         print(f"Calculation Period: {self.calculation_years[0]}-{self.calculation_years[-1]}")
         print(f"PCI Threshold: {self.pci_threshold}")
@@ -439,6 +444,361 @@ class NationalUpscalingCalculator:
             'PCI_Threshold': self.pci_threshold
         }
     
+    def run_incremental(self):
+        """
+        Update the previous national results with the real provinces whose DCI
+        results changed since they were written. Every other province's row
+        (including G_p and Y_p) is a cached partial, so only the changed
+        provinces' PCI and the NUC are recomputed.
+        """
+        table_path = self.results_path / 'national_pci_analysis_with_names_new.csv'
+        if not table_path.exists():
+            print("No previous national results, running the full analysis")
+            return self.run_analysis()
+        
+        written = table_path.stat().st_mtime
+        changed = [province for province in self.real_provinces
+                   if self.dci_results_path(province).exists() and self.dci_results_path(province).stat().st_mtime > written]
+        print(f"Provinces with new DCI results: {', '.join(changed) if changed else 'none'}")
+        self.load_real_dci_data(changed)
+        
+        results = pd.read_csv(table_path, float_precision='round_trip').to_dict('records')
+        for row in results:
+            data = self.real_dci_data.get(row['Province'])
+            if data is None:
+                continue
+            U_p_star, G_p_star, Y_p_star = self.normalize_indicators(data['U_p'], row['G_p'], row['Y_p'])
+            pci = self.calculate_pci(U_p_star, G_p_star, Y_p_star)
+            row.update({
+                'U_p': data['U_p'], 'U_p_star': U_p_star, 'G_p_star': G_p_star, 'Y_p_star': Y_p_star,
+                'PCI': pci, 'Ready': pci >= self.pci_threshold, 'DCI_mean': data['DCI_mean'],
+                'Districts_ready': data['Districts_ready'], 'Total_districts': data['Total_districts']
+            })
+            print(f"{row['Province']}: PCI = {pci:.1f}, Ready = {row['Ready']}")
+        self.province_results = results
+        
+        # NUC from the per-province readiness partials
+        nuc, m_pass, M = self.calculate_nuc(results)
+        self.generate_report(nuc, m_pass, M)
+        self.save_results(nuc, m_pass, M)
+        
+        return {
+            'NUC': nuc,
+            'Ready_Provinces': m_pass,
+            'Total_Provinces': M,
+            'PCI_Threshold': self.pci_threshold
+        }
+    
+    def national_inputs(self):
+        """
+        Inputs of every province for the Monte Carlo mode, one row each:
+        the U_p draw range (a single value for real provinces, whose U_p is
+        their PUC), base growth and baseline GDP per capita, or fixed G_p /
+        Y_p for a real province without economic data.
+        """
+        self.check_economic_data()
+        rows = []
+        for province_name, data in self.real_dci_data.items():
+            growth_inputs = self.real_province_growth_inputs(province_name)
+            base_growth, base_gdp = growth_inputs if growth_inputs is not None else (np.nan, np.nan)
+            rows.append({
+                'Province': province_name,
+                'Vietnamese_Name': official_province_name(province_name),
+                'Type': 'Real',
+                'U_low': data['U_p'], 'U_high': data['U_p'],
+                'base_growth': base_growth, 'base_gdp': base_gdp,
+                # Same national estimates as calculate_real_province_pci
+                'G_fixed': np.nan if growth_inputs is not None else self.targets['G'] * 0.95,
+                'Y_fixed': np.nan if growth_inputs is not None else self.targets['Y'] * 0.85
+            })
+        
+        synthetic = self.synthetic_province_inputs().assign(Type='Synthetic', G_fixed=np.nan, Y_fixed=np.nan)
+        return pd.concat([pd.DataFrame(rows), synthetic], ignore_index=True)
+    
+    def simulate_nuc(self, inputs, rng, size):
+        """
+        `size` realizations of the national pass, drawn from `rng`: U_p
+        uniform within each province's tier and N(0, 0.3) growth shocks per
+        province and year. Returns (count of realizations by number of
+        ready provinces, (provinces,) count of realizations each is ready).
+        """
+        M = len(inputs)
+        low, high = inputs['U_low'].to_numpy(), inputs['U_high'].to_numpy()
+        G_fixed, Y_fixed = inputs['G_fixed'].to_numpy(), inputs['Y_fixed'].to_numpy()
+        
+        U_p = low + (high - low) * rng.random((size, M))
+        noise = rng.normal(0, 0.3, (size, M, len(self.calculation_years)))
+        G_p, Y_p = self.calculate_six_year_means(inputs['base_growth'].to_numpy(), inputs['base_gdp'].to_numpy(), noise)
+        G_p = np.where(np.isnan(G_fixed), G_p, G_fixed)
+        Y_p = np.where(np.isnan(Y_fixed), Y_p, Y_fixed)
+        
+        pci = self.calculate_pci(*self.normalize_indicators(U_p, G_p, Y_p))
+        ready = pci >= self.pci_threshold
+        return np.bincount(ready.sum(axis=1), minlength=M + 1), ready.sum(axis=0)
+    
+    def run_monte_carlo(self, realizations=100000, workers=1, seed=None, batch_size=5000):
+        """
+        Distribution of the NUC over `realizations` independent draws of the
+        random inputs, in batches spread over `workers` processes. Every
+        batch has its own Generator spawned from one SeedSequence, so a
+        seed gives the same results whatever the number of workers.
+        """
+        print("="*70)
+        print("NATIONAL UPSCALING CONFIDENCE - MONTE CARLO")
+        print("="*70)
+        
+        self.load_real_dci_data()
+        inputs = self.national_inputs()
+        M = len(inputs)
+        
+        seed_sequence = np.random.SeedSequence(seed)
+        sizes = [min(batch_size, realizations - start) for start in range(0, realizations, batch_size)]
+        tasks = list(zip(seed_sequence.spawn(len(sizes)), sizes))
+        print(f"Drawing {realizations:,} realizations of {M} provinces in {len(sizes)} batches "
+              f"on {workers} worker(s) (seed entropy {seed_sequence.entropy})...")
+        
+        m_pass_counts = np.zeros(M + 1, dtype=np.int64)
+        ready_counts = np.zeros(M, dtype=np.int64)
+        for batch_m_pass, batch_ready in ordered_pool_map(_simulate_task, tasks, workers, context=(self, inputs)):
+            m_pass_counts += batch_m_pass
+            ready_counts += batch_ready
+        
+        # NUC takes one of M + 1 values, so the counts per value are the whole distribution
+        nuc_values = 100 * np.arange(M + 1) / M
+        distribution = pd.DataFrame({'Ready_Provinces': np.arange(M + 1), 'NUC': nuc_values,
+                                     'Realizations': m_pass_counts, 'Probability': m_pass_counts / realizations})
+        readiness = inputs[['Province', 'Vietnamese_Name', 'Type']].assign(P_ready=ready_counts / realizations)
+        band_of_value = [self.recommendation(nuc) for nuc in nuc_values]
+        bands = pd.DataFrame({'Recommendation': [recommendation for _, recommendation in RECOMMENDATION_BANDS],
+                              'Min_NUC': [min_nuc for min_nuc, _ in RECOMMENDATION_BANDS]})
+        bands['Probability'] = [distribution['Probability'][[band == name for band in band_of_value]].sum()
+                                for name in bands['Recommendation']]
+        
+        self.generate_monte_carlo_report(distribution, readiness, bands, realizations)
+        self.save_monte_carlo_results(distribution, readiness, bands)
+        
+        probability = distribution['Probability'].to_numpy()
+        return {
+            'NUC_mean': float((nuc_values * probability).sum()),
+            'NUC_distribution': distribution,
+            'P_ready': readiness,
+            'Recommendation_bands': bands,
+            'Realizations': realizations
+        }
+    
+    def generate_monte_carlo_report(self, distribution, readiness, bands, realizations):
+        """Print the NUC distribution, band frequencies and province readiness probabilities."""
+        nuc = distribution['NUC'].to_numpy()
+        probability = distribution['Probability'].to_numpy()
+        mean = (nuc * probability).sum()
+        std = np.sqrt(((nuc - mean) ** 2 * probability).sum())
+        cumulative = np.cumsum(probability)
+        percentiles = {q: nuc[np.searchsorted(cumulative, q / 100)] for q in [5, 25, 50, 75, 95]}
+        
+        print()
+        print(f"NUC DISTRIBUTION ({realizations:,} realizations)")
+        print("-" * 50)
+        print(f"Mean NUC: {mean:.1f}% (SD {std:.1f})")
+        print("Percentiles: " + ", ".join(f"P{q} = {value:.1f}%" for q, value in percentiles.items()))
+        print()
+        
+        print("RECOMMENDATION BANDS")
+        print("-" * 70)
+        for _, row in bands.iterrows():
+            print(f"{row['Recommendation']:<60} {row['Probability']:>7.1%}")
+        print()
+        
+        print("PROBABILITY OF BEING READY (least certain first)")
+        print("-" * 60)
+        uncertain = readiness[(readiness['P_ready'] > 0) & (readiness['P_ready'] < 1)]
+        uncertain = uncertain.assign(distance=(uncertain['P_ready'] - 0.5).abs()).sort_values('distance')
+        for _, row in uncertain.head(15).iterrows():
+            print(f"{row['Province']:<20} {row['Type']:<10} {row['P_ready']:>7.1%}")
+        always = (readiness['P_ready'] == 1).sum()
+        never = (readiness['P_ready'] == 0).sum()
+        print(f"Always ready: {always}, never ready: {never}, uncertain: {len(readiness) - always - never}")
+    
+    def save_monte_carlo_results(self, distribution, readiness, bands):
+        """Save the Monte Carlo results to CSV files."""
+        output_dir = Path('results')
+        output_dir.mkdir(exist_ok=True)
+        
+        outputs = {
+            'national_nuc_distribution.csv': distribution,
+            'national_province_ready_probability.csv': readiness,
+            'national_recommendation_bands.csv': bands
+        }
+        for filename, df in outputs.items():
+            df.to_csv(output_dir / filename, index=False)
+            print(f"Saved: {output_dir / filename}")
+    
+    def reported_growth(self, provinces):
+        """Provinces x history_years reported GRDP growth of `provinces`, NaN where not reported."""
+        history = pd.DataFrame(self.historical_growth(self.economic_data), columns=self.history_years,
+                               index=self.economic_provinces.to_numpy())
+        return history[~history.index.duplicated()].reindex(provinces).to_numpy()
+    
+    def base_draws(self, inputs, seed):
+        """
+        The single target-year run's random draws for the national_inputs()
+        rows `inputs`: (U_p draws, growth shocks per calculation year,
+        rows that have shocks). Synthetic provinces draw from the legacy
+        stream of generate_synthetic_province_data, real provinces with
+        economic data from the stream of calculate_real_province_pci.
+        """
+        M, window = len(inputs), len(self.calculation_years)
+        synthetic = (inputs['Type'] == 'Synthetic').to_numpy()
+        real = ~synthetic & inputs['G_fixed'].isna().to_numpy()
+        u_draws, noise = np.zeros(M), np.zeros((M, window))
+        
+        synthetic_rng = np.random.RandomState(seed)
+        u_draws[synthetic] = synthetic_rng.random(synthetic.sum())
+        noise[synthetic] = synthetic_rng.normal(0, 0.3, (synthetic.sum(), window))
+        real_rng = np.random.default_rng(seed)
+        for row in np.flatnonzero(real):
+            noise[row] = real_rng.normal(0, 0.3, window)
+        return u_draws, noise, synthetic | real
+    
+    def national_trajectory(self, targets, real_puc=None, seed=None):
+        """
+        PCI and readiness of every province, and the NUC, for each target
+        year T in `targets`, the means of T taken over the six years before
+        it. Growth is the reported growth for past years and is otherwise
+        projected once per province and year over the years all windows
+        span (improving 15% per year from the base horizon's first year),
+        G_p is its window mean and Y_p compounds the baseline GDP per
+        capita at that mean growth up to the window. U_p and the growth
+        shocks of the base window's years are the draws of the single
+        target-year run (generate_synthetic_province_data and
+        calculate_real_province_pci with the same seed, self.seed by
+        default), so T = target_year reproduces it; shocks of other years
+        come from a seed keyed by the year. A province's value for T
+        therefore does not depend on the range it is scored in.
+        
+        `real_puc` gives real provinces' U_p per target year ({province:
+        (targets,) PUC}); by default their current U_p holds for every T.
+        Returns (province table, national table, first target year from
+        which each province stays ready).
+        """
+        targets = np.asarray(targets)
+        inputs = self.national_inputs()
+        M, window = len(inputs), len(self.calculation_years)
+        span = np.array(horizon_span(targets, window, lag=1))
+        start = self.calculation_years[0]
+        
+        # One U_p draw per province, one growth shock per province and year
+        seed = self.seed if seed is None else seed
+        u_draws, base_noise, drawn = self.base_draws(inputs, seed)
+        noise = np.column_stack([np.random.default_rng([seed, year]).normal(0, 0.3, M) for year in span])
+        in_base = np.isin(span, self.calculation_years)
+        noise[np.ix_(drawn, in_base)] = base_noise[np.ix_(drawn, np.searchsorted(self.calculation_years, span[in_base]))]
+        U_p = inputs['U_low'].to_numpy() + (inputs['U_high'] - inputs['U_low']).to_numpy() * u_draws
+        U_p = np.repeat(U_p[:, None], len(targets), axis=1)
+        for i, province in enumerate(inputs['Province']):
+            if real_puc is not None and province in real_puc:
+                U_p[i] = real_puc[province]
+        
+        # Province x year growth: reported where there is history, projected otherwise; window means per target year
+        year_factor = np.maximum(span - start, 0) * 0.15
+        growth = np.clip(inputs['base_growth'].to_numpy()[:, None] * (1 + year_factor) + noise, 2.0, 12.0)
+        reported = np.full(growth.shape, np.nan)
+        past = np.isin(span, self.history_years)
+        reported[:, past] = self.reported_growth(inputs['Province'])[:, np.searchsorted(self.history_years, span[past])]
+        growth = np.where(np.isnan(reported), growth, reported)
+        G_p = window_means(growth, list(span), targets, window, lag=1)
+        
+        # Compound growth with productivity bonus from the baseline, k years after the base horizon's start
+        factor = (1 + G_p / 100) * 1.02
+        exponents = (targets - window - start)[:, None] + np.arange(1, window + 1)
+        Y_p = inputs['base_gdp'].to_numpy()[:, None] * (factor[..., None] ** exponents).mean(axis=-1)
+        
+        G_fixed, Y_fixed = inputs['G_fixed'].to_numpy()[:, None], inputs['Y_fixed'].to_numpy()[:, None]
+        G_p = np.where(np.isnan(G_fixed), G_p, G_fixed)
+        Y_p = np.where(np.isnan(Y_fixed), Y_p, Y_fixed)
+        
+        U_p_star, G_p_star, Y_p_star = self.normalize_indicators(U_p, G_p, Y_p)
+        pci = self.calculate_pci(U_p_star, G_p_star, Y_p_star)
+        ready = pci >= self.pci_threshold
+        
+        provinces = pd.DataFrame({
+            'Province': np.repeat(inputs['Province'].to_numpy(), len(targets)),
+            'Type': np.repeat(inputs['Type'].to_numpy(), len(targets)),
+            'T': np.tile(targets, M),
+            'U_p': U_p.ravel(), 'G_p': G_p.ravel(), 'Y_p': Y_p.ravel(),
+            'PCI': pci.ravel(),
+            'Ready': ready.ravel()
+        })
+        m_pass = ready.sum(axis=0)
+        nuc = 100 * m_pass / M
+        national = pd.DataFrame({
+            'T': targets,
+            'NUC': nuc,
+            'Ready_Provinces': m_pass,
+            'Total_Provinces': M,
+            'Recommendation': [self.recommendation(value) for value in nuc]
+        })
+        crossings = inputs[['Province', 'Type']].assign(Ready_From=ready_from(ready, targets))
+        return provinces, national, crossings
+    
+    def run_trajectory(self, targets):
+        """National readiness trajectory over the target years `targets`."""
+        print("="*70)
+        print(f"NATIONAL UPSCALING CONFIDENCE BY TARGET YEAR ({targets[0]}-{targets[-1]})")
+        print("="*70)
+        
+        # Real provinces' PUC per target year from calculate_score_province.py --targets, if saved
+        trajectory_path = self.results_path / 'puc_trajectory_target_based.csv'
+        self.load_real_dci_data()
+        real_puc = None
+        if trajectory_path.exists():
+            trajectory = pd.read_csv(trajectory_path)
+            real_puc = {province: rows.set_index('T')['PUC'].reindex(targets).to_numpy()
+                        for province, rows in trajectory.groupby('Province')
+                        if set(targets) <= set(rows['T'])}
+            print(f"Real provinces' PUC by target year from {trajectory_path}: {', '.join(real_puc) or 'none'}")
+        if not real_puc:
+            print("Real provinces keep their current PUC for every target year")
+        
+        provinces, national, crossings = self.national_trajectory(targets, real_puc)
+        self.generate_trajectory_report(national, crossings)
+        
+        output_dir = Path('results')
+        output_dir.mkdir(exist_ok=True)
+        outputs = {
+            'national_nuc_trajectory.csv': national,
+            'national_pci_trajectory.csv': provinces,
+            'national_ready_from.csv': crossings
+        }
+        for filename, df in outputs.items():
+            df.to_csv(output_dir / filename, index=False)
+            print(f"Saved: {output_dir / filename}")
+        return national
+    
+    def generate_trajectory_report(self, national, crossings):
+        """Print the NUC per target year and when provinces become ready."""
+        print()
+        print(f"{'T':<6} {'NUC':<8} {'Ready':<8} Recommendation")
+        print("-" * 70)
+        for _, row in national.iterrows():
+            print(f"{row['T']:<6} {row['NUC']:<8.1f} {row['Ready_Provinces']:>2}/{row['Total_Provinces']:<5} "
+                  f"{row['Recommendation']}")
+        
+        print()
+        print("PROVINCES BECOMING READY WITHIN THE RANGE")
+        print("-" * 50)
+        first_target = national['T'].iloc[0]
+        later = crossings[crossings['Ready_From'] > first_target].sort_values('Ready_From')
+        for _, row in later.iterrows():
+            print(f"{row['Province']:<20} {row['Type']:<10} ready from {int(row['Ready_From'])}")
+        print(f"Ready throughout: {(crossings['Ready_From'] == first_target).sum()}, "
+              f"not ready by {national['T'].iloc[-1]}: {crossings['Ready_From'].isna().sum()}")
+    
+    def recommendation(self, nuc):
+        """National recommendation of the first band whose minimum NUC is reached."""
+        for min_nuc, recommendation in RECOMMENDATION_BANDS:
+            if nuc >= min_nuc:
+                return recommendation
+    
     def generate_report(self, nuc, m_pass, M):
         """Generate detailed analysis report."""
         print("RESULTS SUMMARY")
@@ -449,16 +809,7 @@ class NationalUpscalingCalculator:
         print()
         
         # National recommendation
-        if nuc >= 85:
-            recommendation = "PROCEED with nationwide rollout"
-        elif nuc >= 70:
-            recommendation = "CONDITIONAL rollout - strengthen lagging provinces"
-        elif nuc >= 50:
-            recommendation = "PILOT expansion - major capacity building needed"
-        else:
-            recommendation = "POSTPONE rollout - fundamental strengthening required"
-        
-        print(f"RECOMMENDATION: {recommendation}")
+        print(f"RECOMMENDATION: {self.recommendation(nuc)}")
         print()
         
         # Province details
@@ -543,8 +894,31 @@ class NationalUpscalingCalculator:
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Calculate the National Upscaling Confidence (NUC).")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only rescore real provinces whose DCI results changed since the last national run")
+    parser.add_argument('--monte-carlo', type=int, metavar='N',
+                        help="Report the NUC distribution over N random realizations instead of one seeded draw")
+    parser.add_argument('--workers', type=int, default=1, help="Monte Carlo worker processes (0 = all cores)")
+    parser.add_argument('--seed', type=int, help="Monte Carlo seed (default: fresh entropy, printed)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Monte Carlo realizations per batch")
+    parser.add_argument('--targets', type=parse_target_years, metavar='START:END',
+                        help="Report the NUC for every target year T in a range (e.g. 2026:2035)")
+    args = parser.parse_args()
+    
     calculator = NationalUpscalingCalculator()
-    results = calculator.run_analysis()
+    if args.targets:
+        calculator.run_trajectory(args.targets)
+        return
+    if args.monte_carlo:
+        results = calculator.run_monte_carlo(args.monte_carlo, workers=args.workers or os.cpu_count(),
+                                             seed=args.seed, batch_size=args.batch_size)
+        print("="*70)
+        print(f"FINAL RESULT: mean NUC = {results['NUC_mean']:.1f}% over {results['Realizations']:,} realizations")
+        print("="*70)
+        return
+    
+    results = calculator.run_incremental() if args.incremental else calculator.run_analysis()
     
     print("="*70)
     print(f"FINAL RESULT: NUC = {results['NUC']:.1f}%")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+DCI/PUC Threshold and Target Sensitivity Analysis
+Computes the multi-year district means once, then scores every combination
+of readiness thresholds and normalization targets in one broadcast per
+province: PUC surfaces over the parameter grid and each district's flip
+points
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from scoring import DCIPUCCalculator, baseline_parameters, flip_points, parameter_grid, puc_surface
+
+# Default grids (about 34k combinations for the target-based framework)
+DEFAULT_AXES = {
+    'target': {
+        'DCI_threshold': np.linspace(60, 90, 31),
+        'P_target': np.linspace(1, 5, 9),
+        'P_max': np.linspace(10, 20, 11),
+        'L_max': np.linspace(20, 40, 11)
+    },
+    'min_max': {
+        'DCI_threshold': np.linspace(50, 90, 41),
+        'PUC_threshold': np.linspace(50, 100, 11)
+    }
+}
+
+
+def parse_axis_values(text):
+    """'V1,V2,...' or 'START:STOP:NUM' (NUM evenly spaced values, both ends included)."""
+    if ':' in text:
+        start, stop, num = text.split(':')
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(value) for value in text.split(',')])
+
+
+class SensitivityCalculator:
+    def __init__(self, axes=None, normalization='target', data_path='data', simulation_path='CEI-Simulation/data',
+                 sampling_rate=10.0, provinces=None, workers=1):
+        self.scorer = DCIPUCCalculator(data_path=data_path, simulation_path=simulation_path, sampling_rate=sampling_rate,
+                                       normalization=normalization, provinces=provinces, verbose=False)
+        self.strategy = self.scorer.normalization
+        self.axes = axes or DEFAULT_AXES[self.strategy.name]
+        self.workers = workers
+
+        self.baseline = baseline_parameters(self.strategy, self.scorer.DCI_threshold, self.scorer.PUC_threshold)
+        self.grid = parameter_grid(self.axes, self.baseline)
+
+        self.means = {}
+        self.baseline_puc = {}
+        self.surface_table = None
+        self.flip_table = None
+
+    def compute_means(self):
+        """Score every province once at the baseline, keeping its district means."""
+        print(f"Computing {len(self.scorer.target_years)}-year district means for {len(self.scorer.provinces)} "
+              f"province(s)...")
+        self.scorer.load_metrics_data()
+        self.scorer.score_streaming(workers=self.workers)
+
+        for province, df in self.scorer.dci_results.items():
+            self.means[province] = df[['District'] + self.strategy.columns]
+            self.baseline_puc[province] = self.scorer.puc_results[province]['PUC']
+
+    def run_sweep(self):
+        k = len(self.grid['DCI_threshold'])
+        print(f"Scoring {k} parameter combinations over {', '.join(self.axes)}...")
+
+        surfaces, flips = [], []
+        for province, means in self.means.items():
+            matrix = means[self.strategy.columns].to_numpy(dtype=float)
+
+            ready_districts, puc = puc_surface(self.strategy, matrix, self.grid)
+            surface = pd.DataFrame({name: self.grid[name] for name in self.axes})
+            surface['Province'] = province
+            surface['Ready_Districts'] = ready_districts
+            surface['Total_Districts'] = len(matrix)
+            surface['PUC'] = puc
+            surface['Province_Ready'] = puc >= self.grid['PUC_threshold']
+            surfaces.append(surface)
+
+            dci, ready, flip_values = flip_points(self.strategy, matrix, self.axes, self.baseline)
+            flip = pd.DataFrame({'Province': province, 'District': means['District'].to_numpy(),
+                                 'DCI': dci, 'ready': ready})
+            for name, values in flip_values.items():
+                flip[f"{name}_flip"] = values
+            flips.append(flip)
+
+        self.surface_table = pd.concat(surfaces, ignore_index=True)
+        self.flip_table = pd.concat(flips, ignore_index=True)
+
+    def create_summary_report(self):
+        print("\n" + "="*90)
+        print(f"DCI/PUC SENSITIVITY ({self.strategy.name} normalization)")
+        print("="*90)
+        print("Baseline: " + ", ".join(f"{name}={self.baseline[name]:g}" for name in self.axes))
+        print(f"{'Province':<20} {'Baseline PUC':<14} {'Min PUC':<10} {'Max PUC':<10} {'Ready in':<10}")
+        print("-" * 70)
+        for province, surface in self.surface_table.groupby('Province', sort=False):
+            print(f"{province:<20} {self.baseline_puc[province]:<14.1f} {surface['PUC'].min():<10.1f} "
+                  f"{surface['PUC'].max():<10.1f} {surface['Province_Ready'].mean():<10.1%}")
+
+        flip_columns = [column for column in self.flip_table.columns if column.endswith('_flip')]
+        flipping = self.flip_table[flip_columns].notna().any(axis=1)
+        print(f"\nDistricts whose readiness flips within the grid: {flipping.sum()}/{len(self.flip_table)}")
+        print("="*90)
+
+    def save_results(self):
+        output_dir = Path('results')
+        output_dir.mkdir(exist_ok=True)
+
+        print(f"\nSaving results to {output_dir}/...")
+        prefix = f"sensitivity_{self.strategy.name}"
+        outputs = {
+            f"{prefix}_puc_surface.csv": self.surface_table,
+            f"{prefix}_flip_points.csv": self.flip_table
+        }
+        for filename, df in outputs.items():
+            df.to_csv(output_dir / filename, index=False)
+            print(f"Saved: {filename}")
+
+    def run_analysis(self):
+        self.compute_means()
+        self.run_sweep()
+        self.create_summary_report()
+        self.save_results()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep DCI/PUC thresholds and normalization targets.")
+    parser.add_argument('--axis', action='append', default=[], metavar='NAME=V1,V2|START:STOP:NUM',
+                        help="Vary a parameter (repeatable), e.g. DCI_threshold=60:90:31 or P_max=12,15,18; "
+                             "C_target_abs_scale=0.9:1.1:5 scales a mean column (default: a preset grid)")
+    parser.add_argument('--normalization', choices=['target', 'min_max'], default='target',
+                        help="Normalization strategy (default: target)")
+    parser.add_argument('--province', action='append', dest='provinces',
+                        help="Province to analyse (repeatable, default: every province with simulation logs)")
+    parser.add_argument('--sampling-rate', type=float, default=10.0, help="Population sampling %%")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for the baseline scoring")
+    args = parser.parse_args()
+
+    axes = {}
+    for axis in args.axis:
+        name, _, values = axis.partition('=')
+        try:
+            axes[name] = parse_axis_values(values)
+        except ValueError:
+            parser.error(f"--axis expects NAME=V1,V2 or NAME=START:STOP:NUM, got {axis!r}")
+
+    try:
+        calculator = SensitivityCalculator(axes or None, normalization=args.normalization,
+                                           sampling_rate=args.sampling_rate, provinces=args.provinces,
+                                           workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    calculator.run_analysis()
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,8 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from abm.data import read_district_demographics
+
 # Set up plotting style
 plt.style.use('default')
 sns.set_palette("husl")
@@ -26,8 +28,6 @@ class DistrictDataVisualizer:
     def __init__(self, data_dir="../data"):
         self.data_dir = Path(data_dir)
         self.simulation_log_path = self.data_dir / "district_simulation_log.csv"
-        self.dien_bien_path = self.data_dir / "demographics" / "demographics_dien_bien.csv"
-        self.thai_nguyen_path = self.data_dir / "demographics" / "demographics_thai_nguyen.csv"
         
         # Load data
         self.actual_data = None
@@ -39,20 +39,13 @@ class DistrictDataVisualizer:
         """Load and aggregate actual Vietnamese government data for target district"""
         print(f"Loading actual data for {target_district}, {target_province}...")
         
-        # Load appropriate province data
-        if target_province == "Dien Bien":
-            df = pd.read_csv(self.dien_bien_path)
-        elif target_province == "Thai Nguyen":
-            df = pd.read_csv(self.thai_nguyen_path)
-        else:
+        # Commune data aggregated to district level (cached between runs)
+        df = read_district_demographics(self.data_dir, target_province)
+        if df is None:
             raise ValueError(f"Unknown province: {target_province}")
         
-        # Aggregate commune data to district level
-        district_data = df[df['district'] == target_district].groupby('year').agg({
-            'total_population': 'sum',
-            'women_15_49': 'sum',
-            'children_under_5': 'sum'
-        }).reset_index()
+        district_data = df.loc[df['district'] == target_district,
+                               ['year', 'total_population', 'women_15_49', 'children_under_5']].reset_index(drop=True)
         
         # Apply sampling rates (same as simulation)
         maternal_sampling_rate = 0.1
@@ -0,0 +1,28 @@
+"""
+DCI / PUC scoring library.
+
+One calculator for the district-level scripts and for in-process callers
+(ensembles, scenario sweeps, sensitivity analyses), with normalization
+strategies as plug-ins.
+"""
+
+from .calculator import DCIPUCCalculator
+from .horizon import parse_target_years, horizon_span, window_means, ready_from
+from .incremental import IncrementalScorer
+from .normalization import (NORMALIZATIONS, NormalizationStrategy, TargetNormalization, MinMaxNormalization,
+                            normalize_adverse_indicator)
+from .outliers import OUTLIER_RULES, OutlierRule, SigmaRule, MADRule, IQRRule
+from .projection import (linear_trends, project_linear_trends, project_series, ProjectionCache,
+                         metric_projection_cache)
+from .sensitivity import baseline_parameters, parameter_grid, score_grid, puc_surface, flip_points
+
+__all__ = [
+    'DCIPUCCalculator', 'IncrementalScorer',
+    'parse_target_years', 'horizon_span', 'window_means', 'ready_from',
+    'NORMALIZATIONS', 'NormalizationStrategy', 'TargetNormalization', 'MinMaxNormalization',
+    'normalize_adverse_indicator',
+    'OUTLIER_RULES', 'OutlierRule', 'SigmaRule', 'MADRule', 'IQRRule',
+    'linear_trends', 'project_linear_trends', 'project_series',
+    'ProjectionCache', 'metric_projection_cache',
+    'baseline_parameters', 'parameter_grid', 'score_grid', 'puc_surface', 'flip_points'
+]
@@ -0,0 +1,670 @@
+"""
+District-level Composite Index (DCI) and Provincial Upscaling Confidence
+(PUC) calculation, shared by the scoring scripts and in-process tools.
+
+The pipeline is load -> indicators -> multi-year means -> normalization ->
+DCI -> PUC. Indicators are built from one grouped pass over each frame and
+batched trend projections; normalization is a pluggable strategy (see
+normalization.py). Results are kept per province in `dci_results` /
+`puc_results` and returned as DataFrames by score() and score_simulation().
+
+Provinces are discovered from the simulation logs and demographics files.
+score_streaming() / iter_provinces() load, score and release one province
+at a time (optionally on a process pool), so memory stays bounded by the
+largest province when all 63 are scored.
+"""
+
+import contextlib
+import copy
+import io
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+
+from abm.cache import file_content_hash, read_csv_cached
+from abm.data import available_provinces, demographics_file, read_district_demographics
+from abm.output import (LOG_COLUMNS, find_simulation_table, index_simulation_logs, read_simulation_logs,
+                        read_simulation_table, simulation_table_provinces)
+from abm.pool import ordered_pool_map
+from .horizon import horizon_span, ready_from, window_means
+from .normalization import NORMALIZATIONS
+from .outliers import OUTLIER_RULES
+from .projection import metric_projection_cache, project_linear_trends
+
+METRIC_COLUMNS = {
+    'poverty': 'Poverty_Rate',
+    'literacy': 'Literacy_Rate',
+    'grdp': 'GRDP_Per_Capita_Million_VND'
+}
+
+
+def _score_province_task(calculator, province):
+    result = calculator.score_province(province)
+    return result, calculator.outlier_repairs.pop(province, None)
+
+
+class DCIPUCCalculator:
+    def __init__(self, data_path='data', simulation_path='CEI-Simulation/data', sampling_rate=10.0,
+                 normalization='target', provinces=None, target_years=None, outlier_rule='sigma', verbose=True):
+        self.data_path = Path(data_path)
+        self.simulation_path = Path(simulation_path)
+        self.verbose = verbose
+
+        # Population sampling % used by the simulation; agent counts are scaled
+        # by 100/sampling_rate (x10 for the default 10% runs, x1 for full-population runs)
+        self.sampling_rate = sampling_rate
+        self.population_scale = 100.0 / sampling_rate
+
+        # Normalization strategy: a registered name or a NormalizationStrategy instance
+        if isinstance(normalization, str):
+            if normalization not in NORMALIZATIONS:
+                raise ValueError(f"normalization must be one of {sorted(NORMALIZATIONS)}, got {normalization!r}")
+            normalization = NORMALIZATIONS[normalization]()
+        self.normalization = normalization
+
+        # Rule flagging outlying yearly C / W shares of a district: a registered name or an OutlierRule instance
+        if isinstance(outlier_rule, str):
+            if outlier_rule not in OUTLIER_RULES:
+                raise ValueError(f"outlier_rule must be one of {sorted(OUTLIER_RULES)}, got {outlier_rule!r}")
+            outlier_rule = OUTLIER_RULES[outlier_rule]()
+        self.outlier_rule = outlier_rule
+
+        # Period whose projections are averaged, and target year T for provincial roll-out
+        self.target_years = list(target_years or normalization.target_years)
+        self.T = self.target_years[-1]
+
+        # Simulation inputs, located on first use: (columnar log or None, CSV logs)
+        self.simulation_source = None
+
+        # Provinces to score; by default every province with simulation and demographic data
+        self.provinces = list(provinces or [])
+        if not self.provinces:
+            self.provinces = self.discover_provinces()
+
+        # Readiness thresholds
+        self.DCI_threshold = normalization.dci_threshold  # District readiness threshold
+        self.PUC_threshold = 80.0                          # Provincial readiness threshold
+
+        # Initialize data containers
+        self.simulation_data = {}
+        self.demographic_data = {}
+        self.metrics_data = {}
+        self.metrics_hash = None  # Content hash of the metrics CSVs, keys cached projections
+        self.indicators = {}
+        self.means = {}
+        self.dci_results = {}
+        self.puc_results = {}
+        self.outlier_repairs = {}  # Audit of the C / W shares repaired per province
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def discover_provinces(self):
+        """
+        Provinces that have both simulation logs and a demographics file.
+
+        Provinces come from the columnar log, or from the CSV log names, in
+        their order there; without any simulation data every province with
+        demographics is returned.
+        """
+        demographics = available_provinces(self.data_path)
+        table_path, log_index = self.locate_simulation_data()
+        if table_path is not None:
+            return [province for province in simulation_table_provinces(table_path) if province in demographics]
+        if any(log_index.values()):
+            return [province for province in demographics if log_index.get(province)]
+        return demographics
+
+    def locate_simulation_data(self):
+        """
+        (columnar log path or None, {province: CSV log paths}), looked up
+        once per calculator with a single scan of the simulation directory.
+        """
+        if self.simulation_source is None:
+            # Columnar log of a Python ABM run: typed, memory-mapped, no cleaning needed
+            table_path = find_simulation_table(self.simulation_path)
+            log_index = {}
+            if table_path is None:
+                provinces = list(dict.fromkeys(self.provinces + available_provinces(self.data_path)))
+                log_index = index_simulation_logs(self.simulation_path, provinces)
+            self.simulation_source = (table_path, log_index)
+        return self.simulation_source
+
+    def read_province_simulation(self, province):
+        """One province's simulation rows, or None if it has none."""
+        table_path, log_index = self.locate_simulation_data()
+        if table_path is not None:
+            df = read_simulation_table(table_path, province)
+            source = f" from {table_path.name}"
+        else:
+            files = log_index.get(province, [])
+            try:
+                # Typed single-pass parse of every log of the province
+                df = read_simulation_logs(files)
+            except pa.ArrowInvalid as e:
+                self.log(f"Malformed values in {province} logs ({e}), parsing them leniently")
+                df = self.read_simulation_csv_leniently(files)
+            source = ""
+
+        if len(df) == 0:
+            self.log(f"No simulation data found for {province}")
+            return None
+        df['District'] = df['District'].astype(str)
+        df['Province'] = df['Province'].astype(str)
+        self.log(f"Loaded simulation data for {province}: {df['District'].nunique()} districts, "
+                 f"{len(df)} records{source}")
+        return df
+
+    def read_simulation_csv_leniently(self, files):
+        """Per-file pandas parse that coerces unparsable values to NaN and drops those rows."""
+        province_data = []
+        for file_path in files:
+            try:
+                # Read CSV, skipping the first row with quotes
+                df = pd.read_csv(file_path, skiprows=1)
+
+                # Clean the data - remove any duplicate headers
+                df = df[df['Year'] != 'Year']  # Remove duplicate header
+
+                # Convert to numeric, handling any string values
+                for column in LOG_COLUMNS[3:]:
+                    df[column] = pd.to_numeric(df[column], errors='coerce')
+                df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+
+                # Drop empty rows and rows with any NaN values after conversion
+                province_data.append(df.dropna())
+
+            except Exception as e:
+                self.log(f"Error loading {file_path}: {e}")
+                continue
+
+        if not province_data:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+        return pd.concat(province_data, ignore_index=True)
+
+    def read_province_demographics(self, province):
+        """One province's demographics summed per district and year (cached), or None if its file is missing."""
+        df = read_district_demographics(self.data_path, province)
+        if df is None:
+            self.log(f"Warning: {demographics_file(self.data_path, province)} not found")
+            return None
+        self.log(f"Loaded demographic data for {province}: {len(df)} district-year records")
+        return df
+
+    def load_simulation_data(self):
+        """Load simulation data from CEI-Simulation/data directory."""
+        self.log("Loading simulation data...")
+
+        for province in self.provinces:
+            df = self.read_province_simulation(province)
+            if df is not None:
+                self.simulation_data[province] = df
+
+    def load_demographic_data(self):
+        """Load demographic data from data/demographics/ directory."""
+        self.log("Loading demographic data...")
+
+        for province in self.provinces:
+            df = self.read_province_demographics(province)
+            if df is not None:
+                self.demographic_data[province] = df
+
+    def load_metrics_data(self):
+        """Load actual I, P, L metrics data from data/metrics directory."""
+        self.log("Loading actual metrics data (I, P, L indicators)...")
+
+        metrics_dir = self.data_path / 'metrics'
+        files = {'poverty': 'poverty_rates.csv', 'literacy': 'literacy_rates.csv', 'grdp': 'grdp_per_capita.csv'}
+        try:
+            # Poverty rates (P), literacy rates (L) and GRDP per capita (I proxy)
+            self.metrics_data = {metric: read_csv_cached(metrics_dir / filename) for metric, filename in files.items()}
+            self.metrics_hash = file_content_hash([metrics_dir / filename for filename in files.values()])
+
+            self.log("Loaded metrics data:")
+            self.log(f"- Poverty rates: {len(self.metrics_data['poverty'])} records")
+            self.log(f"- Literacy rates: {len(self.metrics_data['literacy'])} records")
+            self.log(f"- GRDP per capita: {len(self.metrics_data['grdp'])} records")
+
+        except Exception as e:
+            self.log(f"Error loading metrics data: {e}")
+            self.metrics_data = {}
+            self.metrics_hash = None
+
+    # ------------------------------------------------------------------
+    # Projections
+    # ------------------------------------------------------------------
+
+    def get_province_metric_trends(self, province, metric_type):
+        """Get historical trends for a province metric and project to target years."""
+        if self.metrics_hash is None:
+            # Metrics not loaded from the CSVs, nothing safe to key a cache on
+            return self.project_province_metric(province, metric_type)
+
+        # Depends only on these inputs, so fit once per process and share
+        key = (self.metrics_hash, province, metric_type, tuple(self.target_years))
+        return metric_projection_cache.get(key, lambda: self.project_province_metric(province, metric_type))
+
+    def project_province_metric(self, province, metric_type):
+        """Filter, sort and regress one province metric onto the target years."""
+        if metric_type not in self.metrics_data or metric_type not in METRIC_COLUMNS:
+            return None
+
+        metric_df = self.metrics_data[metric_type]
+        province_data = metric_df[metric_df['Province'] == province].sort_values('Year')
+        if len(province_data) == 0:
+            return None
+
+        years = province_data['Year'].values
+        values = province_data[METRIC_COLUMNS[metric_type]].values
+        return self.project_demographic_indicators(years, values)
+
+    def project_demographic_indicators(self, years, values):
+        """Use linear regression to project future demographic values."""
+        # Closed-form least squares (flat at the last value below two years), see projection.py
+        return project_linear_trends(years, values, self.target_years)[:, 0]
+
+    def calculate_province_variations_by_year(self, province):
+        """Year-specific I, P, L rates (%) shared by every district of a province."""
+        n_years = len(self.target_years)
+        defaults = self.normalization.default_rates
+
+        poverty = self.get_province_metric_trends(province, 'poverty')
+        literacy = self.get_province_metric_trends(province, 'literacy')
+        return {
+            # Fixed internet access for all districts (as per framework)
+            'I': np.full(n_years, 95.0),
+            'P': np.asarray(poverty, dtype=float) if poverty is not None else np.full(n_years, defaults['P']),
+            'L': np.asarray(literacy, dtype=float) if literacy is not None else np.full(n_years, defaults['L'])
+        }
+
+    # ------------------------------------------------------------------
+    # Indicators
+    # ------------------------------------------------------------------
+
+    def clean_demographic_shares(self, counts, column, districts):
+        """
+        Percent share of `column` in the total population per year x district,
+        with the years the outlier rule flags replaced by the district median.
+        Returns the shares and an audit table of the repaired cells
+        (District, Year, Original, Repaired).
+        """
+        shares = counts[column][districts] / counts['total_population'][districts] * 100
+        values = shares.to_numpy(dtype=float)
+
+        outliers, median = self.outlier_rule.outliers(values)
+        repaired = np.where(outliers, median, values)
+
+        years, columns = np.nonzero(outliers)
+        audit = pd.DataFrame({
+            'District': np.asarray(shares.columns, dtype=object)[columns],
+            'Year': shares.index.to_numpy()[years],
+            'Original': values[years, columns],
+            'Repaired': repaired[years, columns]
+        })
+        return pd.DataFrame(repaired, index=shares.index, columns=shares.columns), audit
+
+    def province_indicators(self, province, sim_df, demo_df):
+        """
+        (District, Year) indicator table of one province for the inputs the
+        normalization strategy needs:
+        - C_gama_abs / W_gama_abs: simulated absolute numbers (Xd)
+        - C_target_abs / W_target_abs: numbers projected from historical data (Xtarget)
+        - C / W: projected shares (%) of children under 5 and women 15-49
+        - I / P / L: internet access, poverty and literacy rates (%)
+        """
+        inputs = set(self.normalization.inputs)
+        n_years = len(self.target_years)
+        districts = sim_df['District'].unique()
+
+        # Historical data, communes summed per district and year, as year x district matrices
+        demo_counts = demo_df.groupby(['year', 'district'])[['total_population', 'children_under_5',
+                                                              'women_15_49']].sum().unstack('district')
+        kept = []
+        for district in districts:
+            if district not in demo_counts['total_population'].columns:
+                self.log(f"No demographic data for district {district} in {province}")
+                continue
+            kept.append(district)
+
+        columns = {}
+        if inputs & {'C_gama_abs', 'W_gama_abs'}:
+            # Simulated counts scaled back up to the full population, projected over the period
+            sim_wide = sim_df.groupby(['Year', 'District'])[['Children_U5', 'Maternal_Agents']].mean().unstack('District')
+            sim_wide = sim_wide * self.population_scale
+            columns['C_gama_abs'] = project_linear_trends(sim_wide.index, sim_wide['Children_U5'][kept], self.target_years)
+            columns['W_gama_abs'] = project_linear_trends(sim_wide.index, sim_wide['Maternal_Agents'][kept], self.target_years)
+
+        if inputs & {'C_target_abs', 'W_target_abs'}:
+            # Dynamic targets projected from the historical absolute numbers
+            columns['C_target_abs'] = project_linear_trends(demo_counts.index, demo_counts['children_under_5'][kept],
+                                                            self.target_years)
+            columns['W_target_abs'] = project_linear_trends(demo_counts.index, demo_counts['women_15_49'][kept],
+                                                            self.target_years)
+
+        if inputs & {'C', 'W'}:
+            # Shares computed after aggregating the communes, outliers fixed at district level
+            c_shares, c_repairs = self.clean_demographic_shares(demo_counts, 'children_under_5', kept)
+            w_shares, w_repairs = self.clean_demographic_shares(demo_counts, 'women_15_49', kept)
+            repairs = pd.concat([c_repairs.assign(Indicator='C'), w_repairs.assign(Indicator='W')], ignore_index=True)
+            repairs.insert(0, 'Province', province)
+            self.outlier_repairs[province] = repairs[['Province', 'District', 'Indicator', 'Year', 'Original', 'Repaired']]
+            if len(repairs):
+                self.log(f"  Repaired {len(repairs)} outlying shares in {repairs['District'].nunique()} districts "
+                         f"({self.outlier_rule.name} rule)")
+            columns['C'] = project_linear_trends(c_shares.index, c_shares, self.target_years)
+            columns['W'] = project_linear_trends(w_shares.index, w_shares, self.target_years)
+
+        # I, P, L depend on the province only
+        rates = self.calculate_province_variations_by_year(province)
+        for name, values in rates.items():
+            columns[name] = np.repeat(values[:, None], len(kept), axis=1)
+
+        # District-major long table; the strategy prepares its columns per district and year
+        values = np.column_stack([columns[name].T.ravel() for name in self.normalization.inputs])
+        prepared = self.normalization.prepare(values)
+
+        indicators = pd.DataFrame(prepared, columns=self.normalization.columns)
+        indicators.insert(0, 'District', np.repeat(np.asarray(kept, dtype=object), n_years))
+        indicators.insert(1, 'Year', np.tile(self.target_years, len(kept)))
+        self.log(f"Calculated indicators for {province}: {len(districts)} districts")
+        return indicators
+
+    def province_means(self, indicators):
+        """Multi-year mean of each indicator per district: X̄d = (1/n) Σ Xd,T-k (Equation 1)."""
+        return indicators.groupby('District')[self.normalization.columns].mean().reset_index()
+
+    def calculate_indicators(self):
+        """Build the indicator table of every province with loaded data."""
+        self.log("\nCalculating indicators...")
+
+        for province in self.provinces:
+            if province not in self.simulation_data or province not in self.demographic_data:
+                self.log(f"Missing data for {province}")
+                continue
+            self.indicators[province] = self.province_indicators(province, self.simulation_data[province],
+                                                                 self.demographic_data[province])
+
+    def calculate_means(self):
+        """Multi-year means of every province's indicators."""
+        self.log(f"\nCalculating {len(self.target_years)}-year means for period "
+                 f"{self.target_years[0]}-{self.target_years[-1]}...")
+
+        for province, df in self.indicators.items():
+            self.means[province] = self.province_means(df)
+            self.log(f"Means calculated for {province}: {len(self.means[province])} districts")
+
+    # ------------------------------------------------------------------
+    # Scores
+    # ------------------------------------------------------------------
+
+    def normalize_province(self, province, means):
+        """Normalize one province's district x indicator matrix with the strategy."""
+        scores = self.normalization.normalize(means[self.normalization.columns].to_numpy(dtype=float))
+        df = means.copy()
+        df[self.normalization.outputs] = scores
+
+        self.log(f"Normalized indicators for {province}")
+        for column in self.normalization.outputs:
+            self.log(f"  {column}: {df[column].min():.1f} - {df[column].max():.1f}")
+        return df
+
+    def province_dci(self, province, df):
+        """District-level Composite Index (Equation 4) and readiness DCId ≥ DCIthreshold (Equation 5)."""
+        df['DCI'] = self.normalization.composite(df[self.normalization.outputs].to_numpy(dtype=float))
+        df['ready'] = df['DCI'] >= self.DCI_threshold
+
+        self.log(f"DCI calculated for {province}")
+        self.log(f"  Average DCI: {df['DCI'].mean():.2f}")
+        self.log(f"  DCI range: {df['DCI'].min():.2f} - {df['DCI'].max():.2f}")
+        self.log(f"  Ready districts (DCI ≥ {self.DCI_threshold}): {df['ready'].sum()}/{len(df)}")
+        return df
+
+    def province_puc(self, province, df):
+        """Provincial Upscaling Confidence PUC = 100·npass/N (Equation 6) and readiness (Equation 7)."""
+        N = len(df)
+        n_pass = df['ready'].sum()
+        puc = 100 * (n_pass / N) if N > 0 else 0
+        province_ready = puc >= self.PUC_threshold
+        action = self.normalization.action(puc, self.PUC_threshold)
+
+        self.log(f"{province} PUC: {puc:.1f}%")
+        self.log(f"  Province ready (PUC ≥ {self.PUC_threshold}%): {province_ready}")
+        self.log(f"  Action: {action}")
+        return {
+            'PUC': puc,
+            'total_districts': N,
+            'ready_districts': n_pass,
+            'province_ready': province_ready,
+            'action': action,
+            'threshold_used': self.PUC_threshold
+        }
+
+    def normalize_indicators(self):
+        self.log(f"\nApplying {self.normalization.name} normalization...")
+        for province, means in self.means.items():
+            self.dci_results[province] = self.normalize_province(province, means)
+
+    def calculate_dci(self):
+        self.log("\nCalculating DCI...")
+        for province, df in self.dci_results.items():
+            self.province_dci(province, df)
+
+    def calculate_puc(self):
+        self.log("\nCalculating PUC...")
+        for province, df in self.dci_results.items():
+            self.puc_results[province] = self.province_puc(province, df)
+
+    # ------------------------------------------------------------------
+    # Streaming over provinces
+    # ------------------------------------------------------------------
+
+    def score_province(self, province):
+        """
+        Load, score and release one province: returns (province, DCI table,
+        PUC result), with None for both when it lacks simulation or
+        demographic data. Nothing is kept on the calculator, so memory is
+        bounded by the largest province rather than by the whole country.
+        Metrics data must already be loaded.
+        """
+        sim_df = self.read_province_simulation(province)
+        demo_df = self.read_province_demographics(province) if sim_df is not None else None
+        if sim_df is None or demo_df is None:
+            self.log(f"Missing data for {province}")
+            return province, None, None
+
+        indicators = self.province_indicators(province, sim_df, demo_df)
+        del sim_df, demo_df
+        df = self.province_dci(province, self.normalize_province(province, self.province_means(indicators)))
+        return province, df, self.province_puc(province, df)
+
+    def iter_provinces(self, provinces=None, workers=1):
+        """
+        Yield score_province() for each province (default: self.provinces), in order.
+
+        Provinces are scored by a quiet copy of the calculator and logged
+        here, one line each, so serial and parallel runs print the same
+        output. With several workers each province is one task on a process
+        pool; the copy is sent to each worker once and up to two provinces
+        per worker are in flight.
+        """
+        quiet = copy.copy(self)
+        quiet.verbose = False
+        results = ordered_pool_map(_score_province_task, list(provinces or self.provinces), workers, context=quiet)
+        try:
+            for (province, df, puc), repairs in results:
+                if repairs is not None:
+                    self.outlier_repairs[province] = repairs
+                if puc is None:
+                    self.log(f"Missing data for {province}")
+                else:
+                    self.log(f"{province}: PUC {puc['PUC']:.1f}% "
+                             f"({puc['ready_districts']}/{puc['total_districts']} districts ready)")
+                yield province, df, puc
+        finally:
+            results.close()
+
+    def score_streaming(self, provinces=None, workers=1):
+        """Score provinces one at a time, keeping only their results, and return (dci, puc) DataFrames."""
+        self.reset_results()
+        for province, df, puc in self.iter_provinces(provinces, workers):
+            if puc is not None:
+                self.dci_results[province] = df
+                self.puc_results[province] = puc
+        return self.dci_table(), self.puc_table()
+
+    # ------------------------------------------------------------------
+    # Rolling target years
+    # ------------------------------------------------------------------
+
+    def province_trajectory(self, province, targets, sim_df=None, demo_df=None):
+        """
+        DCI of every district and PUC of one province for each target year T
+        in `targets`, the means of T taken over the len(target_years) years
+        ending at T. The indicators are projected once over the years all
+        windows span. Returns (district table: District, T, DCI, ready;
+        province table: T, PUC, Ready_Districts, Total_Districts,
+        Province_Ready), or (None, None) without data.
+        """
+        if sim_df is None:
+            sim_df = self.read_province_simulation(province)
+            demo_df = self.read_province_demographics(province) if sim_df is not None else None
+        if sim_df is None or demo_df is None:
+            self.log(f"Missing data for {province}")
+            return None, None
+
+        window = len(self.target_years)
+        span = horizon_span(targets, window)
+        projector = copy.copy(self)
+        projector.target_years, projector.outlier_repairs = span, {}
+        indicators = projector.province_indicators(province, sim_df, demo_df)
+
+        # District-major rows -> district x year x indicator, then target year x district x indicator means
+        districts = indicators['District'].to_numpy()[::len(span)]
+        values = indicators[self.normalization.columns].to_numpy(dtype=float).reshape(len(districts), len(span), -1)
+        means = np.moveaxis(window_means(values, span, targets, window, axis=1), 1, 0)
+
+        dci = self.normalization.composite(self.normalization.normalize(means))
+        ready = dci >= self.DCI_threshold
+        n_pass = ready.sum(axis=1)
+        puc = 100 * n_pass / len(districts) if len(districts) else np.zeros(len(targets))
+
+        district_table = pd.DataFrame({
+            'District': np.tile(districts, len(targets)),
+            'T': np.repeat(targets, len(districts)),
+            'DCI': dci.ravel(),
+            'ready': ready.ravel()
+        })
+        province_table = pd.DataFrame({
+            'T': targets,
+            'PUC': puc,
+            'Ready_Districts': n_pass,
+            'Total_Districts': len(districts),
+            'Province_Ready': puc >= self.PUC_threshold
+        })
+        return district_table, province_table
+
+    def score_trajectories(self, targets, provinces=None):
+        """
+        province_trajectory() of every province as (district table, province
+        table, crossings): Province, District / T rows plus the first target
+        year from which each district and province stays ready (NaN if not
+        ready by the last one).
+        """
+        targets = list(targets)
+        district_tables, province_tables = [], []
+        for province in provinces or self.provinces:
+            districts, trajectory = self.province_trajectory(province, targets)
+            if trajectory is None:
+                continue
+            district_tables.append(districts.assign(Province=province))
+            province_tables.append(trajectory.assign(Province=province))
+            self.log(f"{province}: PUC {trajectory['PUC'].iloc[0]:.1f}% (T={targets[0]}) -> "
+                     f"{trajectory['PUC'].iloc[-1]:.1f}% (T={targets[-1]})")
+
+        district_table = pd.concat(district_tables, ignore_index=True)
+        province_table = pd.concat(province_tables, ignore_index=True)
+        district_table = district_table[['Province'] + [c for c in district_table.columns if c != 'Province']]
+        province_table = province_table[['Province'] + [c for c in province_table.columns if c != 'Province']]
+
+        # (district x target year) and (province x target year) ready matrices, one ready_from() pass each
+        keys = pd.MultiIndex.from_frame(district_table[['Province', 'District']].drop_duplicates())
+        ready = (district_table.set_index(['Province', 'District', 'T'])['ready'].unstack('T')
+                 .reindex(index=keys, columns=targets))
+        province_ready = province_table.pivot(index='Province', columns='T', values='Province_Ready')
+        province_ready = province_ready.reindex(index=province_table['Province'].unique(), columns=targets)
+
+        crossings = pd.concat([
+            pd.DataFrame({'Province': keys.get_level_values('Province'), 'District': keys.get_level_values('District'),
+                          'Ready_From': ready_from(ready.to_numpy(dtype=bool), targets)}),
+            pd.DataFrame({'Province': province_ready.index, 'District': None,
+                          'Ready_From': ready_from(province_ready.to_numpy(dtype=bool), targets)})
+        ], ignore_index=True)
+        return district_table, province_table, crossings
+
+    def reset_results(self):
+        self.indicators, self.means = {}, {}
+        self.dci_results, self.puc_results = {}, {}
+        self.outlier_repairs = {}
+
+    def score(self):
+        """Run indicators -> DCI -> PUC on the loaded data and return (dci, puc) DataFrames."""
+        self.reset_results()
+        self.calculate_indicators()
+        self.calculate_means()
+        self.normalize_indicators()
+        self.calculate_dci()
+        self.calculate_puc()
+        return self.dci_table(), self.puc_table()
+
+    def dci_table(self):
+        """DCI results of every province as one table with a Province column."""
+        if not self.dci_results:
+            return pd.DataFrame(columns=['Province', 'District', 'DCI', 'ready'])
+        table = pd.concat([df.assign(Province=province) for province, df in self.dci_results.items()],
+                          ignore_index=True)
+        return table[['Province'] + [column for column in table.columns if column != 'Province']]
+
+    def outlier_table(self):
+        """Every repaired share as one table (Province, District, Indicator, Year, Original, Repaired)."""
+        columns = ['Province', 'District', 'Indicator', 'Year', 'Original', 'Repaired']
+        repairs = [df for df in self.outlier_repairs.values() if len(df)]
+        return pd.concat(repairs, ignore_index=True) if repairs else pd.DataFrame(columns=columns)
+
+    def puc_table(self):
+        """PUC results as one row per province."""
+        return pd.DataFrame([{
+            'Province': province,
+            'PUC': result['PUC'],
+            'Total_Districts': result['total_districts'],
+            'Ready_Districts': result['ready_districts'],
+            'Province_Ready': result['province_ready'],
+            'Action': result['action']
+        } for province, result in self.puc_results.items()])
+
+    def score_simulation(self, sim_df):
+        """
+        Score in-memory simulation rows (LOG_COLUMNS) without touching the logs.
+
+        Metrics data must already be loaded; demographics of provinces not
+        loaded yet are read on first use. Returns a (Province, District, DCI,
+        ready) table and a {province: PUC} dict.
+        """
+        self.simulation_data = {province: df.reset_index(drop=True) for province, df in sim_df.groupby('Province')}
+        self.provinces = list(self.simulation_data)
+
+        with contextlib.redirect_stdout(io.StringIO()) if self.verbose else contextlib.nullcontext():
+            for province in self.provinces:
+                if province not in self.demographic_data:
+                    df = self.read_province_demographics(province)
+                    if df is not None:
+                        self.demographic_data[province] = df
+            dci, _ = self.score()
+
+        puc = {province: result['PUC'] for province, result in self.puc_results.items()}
+        return dci[['Province', 'District', 'DCI', 'ready']], puc
@@ -0,0 +1,55 @@
+"""
+Rolling target-year horizons.
+
+A score for target year T averages its indicators over a fixed window of
+years before T (2025-2030 for T = 2030). To score a range of target
+years at once the indicators are projected once over the span every window
+covers, and the window means of each T are taken as running-sum
+differences along the year axis: each year is projected once, and there
+is one vectorized pass per range instead of one run per T.
+"""
+
+import numpy as np
+
+
+def parse_target_years(text):
+    """'START:END' (every year, both ends included) or 'Y1,Y2,...'."""
+    if ':' in text:
+        start, end = text.split(':')
+        return list(range(int(start), int(end) + 1))
+    return [int(year) for year in text.split(',')]
+
+
+def horizon_span(targets, window, lag=0):
+    """
+    Consecutive years covering the window of every target year, the window
+    of T being the `window` years ending `lag` years before T.
+    """
+    return list(range(min(targets) - lag - window + 1, max(targets) - lag + 1))
+
+
+def window_means(values, span, targets, window, lag=0, axis=-1):
+    """
+    Mean of `values` over the window of each target year, from one running
+    sum along `axis` (the years of `span`): that axis becomes one entry
+    per target year.
+    """
+    values = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    running = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+
+    # Window of T: years T - lag - window + 1 .. T - lag, positions relative to the span start
+    end = np.asarray(targets) - lag - span[0] + 1
+    means = (running[..., end] - running[..., end - window]) / window
+    return np.moveaxis(means, -1, axis)
+
+
+def ready_from(ready, targets):
+    """
+    First target year from which `ready` (..., target years) holds through
+    the last one, NaN where it is not ready at the end of the range.
+    """
+    targets = np.asarray(targets, dtype=float)
+    # Ready at T and at every later target year
+    sustained = np.logical_and.accumulate(ready[..., ::-1], axis=-1)[..., ::-1]
+    first = sustained.argmax(axis=-1)
+    return np.where(sustained.any(axis=-1), targets[first], np.nan)
@@ -0,0 +1,286 @@
+"""
+Incremental DCI/PUC rescoring.
+
+A manifest records every input file (size, mtime, content hash, the
+province it feeds) and a hash of each district's own simulation and
+demographic rows; the district means are kept next to it. On update only
+files whose content changed are looked at, and of the districts they feed
+only those whose rows actually changed get new indicators and means (a
+corrected commune row changes one district's aggregate, a new log one
+district's rows). Provinces are then re-normalized from the kept means, a
+small district x indicator matrix, to update DCI and PUC.
+
+Metrics files feed every province, so changing them - or the strategy,
+target years or sampling rate - rebuilds everything. The state is JSON
+plus a Feather table, no pickles.
+"""
+
+import hashlib
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pathlib import Path
+
+from abm.cache import file_content_hash
+from abm.data import DEMOGRAPHIC_COUNTS, demographics_file, read_district_demographics
+from abm.output import log_file_name, read_simulation_logs, read_simulation_table
+from .sensitivity import strategy_parameters
+
+MANIFEST_FORMAT = 1
+METRICS_FILES = ['poverty_rates.csv', 'literacy_rates.csv', 'grdp_per_capita.csv']
+
+
+def district_row_hashes(df, district_column):
+    """{district: short hash of its rows}, to tell which districts an edited file really changed."""
+    return {str(district): hashlib.sha256(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+            .hexdigest()[:16] for district, rows in df.groupby(district_column, sort=False)}
+
+
+class IncrementalScorer:
+    """Keeps a calculator's district means up to date with its input files."""
+
+    def __init__(self, calculator, state_path='results/.incremental'):
+        self.calculator = calculator
+        self.state_path = Path(state_path) / calculator.normalization.name
+        self.manifest = None
+        self.means = {}
+        self.rescored_districts = {}  # province -> districts recomputed by the last update
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def config(self):
+        """Settings the kept means depend on; any change forces a rebuild."""
+        calculator = self.calculator
+        return {
+            'normalization': calculator.normalization.name,
+            'parameters': strategy_parameters(calculator.normalization),
+            'outlier_rule': [calculator.outlier_rule.name, calculator.outlier_rule.k],
+            'target_years': [int(year) for year in calculator.target_years],
+            'sampling_rate': calculator.sampling_rate,
+            'simulation_path': str(calculator.simulation_path.resolve()),
+            'data_path': str(calculator.data_path.resolve())
+        }
+
+    def load_state(self):
+        manifest_path = self.state_path / 'manifest.json'
+        if not manifest_path.exists():
+            return
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get('format') != MANIFEST_FORMAT or manifest.get('config') != self.config():
+            return
+
+        means = feather.read_table(self.state_path / 'means.feather').to_pandas()
+        self.means = {province: df.drop(columns='Province').reset_index(drop=True)
+                      for province, df in means.groupby('Province', sort=False)}
+        self.manifest = manifest
+
+    def save_state(self):
+        self.state_path.mkdir(parents=True, exist_ok=True)
+        means = [df.assign(Province=province) for province, df in self.means.items()]
+        columns = ['Province', 'District'] + self.calculator.normalization.columns
+        table = pd.concat(means, ignore_index=True)[columns] if means else pd.DataFrame(columns=columns)
+        feather.write_feather(table, self.state_path / 'means.feather', compression='uncompressed')
+        (self.state_path / 'manifest.json').write_text(json.dumps(self.manifest, indent=1))
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+
+    def input_files(self):
+        """{path: (kind, province)} of every input, province None when a file feeds several."""
+        calculator = self.calculator
+        table_path, log_index = calculator.locate_simulation_data()
+
+        files = {}
+        if table_path is not None:
+            files[str(table_path)] = ('simulation', None)
+        for province in calculator.provinces:
+            for path in log_index.get(province, []):
+                files[str(path)] = ('simulation', province)
+            province_file = demographics_file(calculator.data_path, province)
+            if province_file.exists():
+                files[str(province_file)] = ('demographics', province)
+        for filename in METRICS_FILES:
+            path = calculator.data_path / 'metrics' / filename
+            if path.exists():
+                files[str(path)] = ('metrics', None)
+        return files
+
+    def fingerprint(self, path, kind, province):
+        """Size, mtime and content hash of a file; unchanged size and mtime reuse the recorded hash."""
+        stat = Path(path).stat()
+        record = {'kind': kind, 'province': province, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        previous = (self.manifest or {}).get('files', {}).get(path)
+        if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            record['hash'] = previous['hash']
+        else:
+            record['hash'] = file_content_hash([path])
+        return record
+
+    def province_inputs(self, province, districts=None):
+        """Simulation and demographic rows of a province, optionally of some districts only."""
+        calculator = self.calculator
+        table_path, log_index = calculator.locate_simulation_data()
+        if table_path is not None:
+            sim_df = read_simulation_table(table_path, province)
+            sim_df['District'] = sim_df['District'].astype(str)
+        else:
+            files = log_index.get(province, [])
+            if districts is not None:
+                # Logs are named after their district; logs with other names could hold any district
+                known = {log_file_name(district, province): district
+                         for district in self.manifest['districts'].get(province, {})}
+                files = [path for path in files if known.get(Path(path).name, None) in districts or
+                         Path(path).name not in known]
+            try:
+                sim_df = read_simulation_logs(files)
+            except pa.ArrowInvalid:
+                sim_df = calculator.read_simulation_csv_leniently(files)
+            sim_df['District'] = sim_df['District'].astype(str)
+
+        demo_df = read_district_demographics(calculator.data_path, province)
+        if demo_df is None:
+            demo_df = pd.DataFrame(columns=['district', 'year'] + DEMOGRAPHIC_COUNTS)
+
+        if districts is not None:
+            sim_df = sim_df[sim_df['District'].isin(districts)]
+            demo_df = demo_df[demo_df['district'].isin(districts)]
+        return sim_df, demo_df
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def rescore_districts(self, province, districts=None):
+        """
+        Recompute the means of `districts` (default: all) of a province from
+        their current rows and record their row hashes; returns the
+        districts whose rows changed.
+        """
+        sim_df, demo_df = self.province_inputs(province, districts)
+        sim_hashes = district_row_hashes(sim_df, 'District')
+        demo_hashes = district_row_hashes(demo_df, 'district')
+
+        recorded = self.manifest['districts'].setdefault(province, {})
+        candidates = set(districts) if districts is not None else set(recorded) | set(sim_hashes)
+        changed = set()
+        for district in candidates:
+            hashes = {'simulation': sim_hashes.get(district), 'demographics': demo_hashes.get(district)}
+            if districts is None or recorded.get(district) != hashes:
+                changed.add(district)
+            if hashes['simulation'] is None:
+                recorded.pop(district, None)
+            else:
+                recorded[district] = hashes
+        if not changed:
+            return changed
+
+        means = self.means.get(province)
+        kept = means[~means['District'].isin(changed)] if means is not None else None
+        changed_sim = sim_df[sim_df['District'].isin(changed)]
+        if len(changed_sim) and len(demo_df):
+            indicators = self.calculator.province_indicators(province, changed_sim, demo_df[demo_df['district'].isin(changed)])
+            new_means = self.calculator.province_means(indicators)
+            kept = new_means if kept is None else pd.concat([kept, new_means], ignore_index=True)
+
+        if kept is None or len(kept) == 0:
+            self.means.pop(province, None)
+        else:
+            # Same district order as a full run (means are grouped by district)
+            self.means[province] = kept.sort_values('District', ignore_index=True)
+        return changed
+
+    def update(self):
+        """
+        Bring the kept means up to date with the inputs and rescore the
+        provinces; returns the provinces whose districts changed.
+        """
+        calculator = self.calculator
+        self.load_state()
+        files = {path: self.fingerprint(path, kind, province) for path, (kind, province) in self.input_files().items()}
+        self.rescored_districts = {}
+
+        previous = self.manifest['files'] if self.manifest else None
+        metrics_changed = previous is not None and any(
+            record['hash'] != previous.get(path, {}).get('hash')
+            for path, record in files.items() if record['kind'] == 'metrics')
+        if previous is None or metrics_changed:
+            calculator.log("Rebuilding incremental state from every input...")
+            self.manifest = {'format': MANIFEST_FORMAT, 'config': self.config(), 'files': {}, 'districts': {}}
+            self.means = {}
+            targets = {province: None for province in calculator.provinces}
+        else:
+            targets = self.changed_districts(files, previous)
+
+        if previous is None or metrics_changed or targets:
+            calculator.load_metrics_data()
+        for province, districts in targets.items():
+            changed = self.rescore_districts(province, districts)
+            if changed:
+                self.rescored_districts[province] = sorted(changed)
+                calculator.log(f"Rescored {len(changed)} district(s) of {province}: {', '.join(sorted(changed))}")
+
+        self.manifest['files'] = files
+        self.save_state()
+        self.score()
+        return list(self.rescored_districts)
+
+    def changed_districts(self, files, previous):
+        """{province: candidate districts (None = all)} fed by files added, edited or removed since the last update."""
+        targets = {}
+
+        def add(province, districts):
+            if province not in self.calculator.provinces:
+                return
+            if districts is None or targets.get(province, set()) is None:
+                targets[province] = None
+            else:
+                targets.setdefault(province, set()).update(districts)
+
+        changed_paths = [path for path, record in files.items() if record['hash'] != previous.get(path, {}).get('hash')]
+        removed_paths = [path for path in previous if path not in files]
+        for path in changed_paths + removed_paths:
+            record = files.get(path) or previous[path]
+            province = record['province']
+            if record['kind'] == 'demographics':
+                # One commune can move one district's aggregate; row hashes find which
+                add(province, set(self.manifest['districts'].get(province, {})))
+            elif province is None:
+                # Columnar log of every province
+                for name in self.calculator.provinces:
+                    add(name, set(self.manifest['districts'].get(name, {})) | (self.logged_districts(path, name) or set()))
+            else:
+                known = {log_file_name(district, province): district
+                         for district in self.manifest['districts'].get(province, {})}
+                district = known.get(Path(path).name)
+                add(province, {district} if district else self.logged_districts(path, province))
+        return targets
+
+    def logged_districts(self, path, province):
+        """Districts with rows in a simulation log (none if it was removed)."""
+        if not Path(path).exists():
+            return None
+        if Path(path).suffix == '.csv':
+            df = read_simulation_logs([path])
+        else:
+            df = read_simulation_table(path, province)
+        return set(df['District'].astype(str).unique())
+
+    def score(self):
+        """DCI and PUC of every province from the kept means (normalization only, no projections)."""
+        calculator = self.calculator
+        calculator.reset_results()
+        verbose, calculator.verbose = calculator.verbose, False
+        try:
+            for province in calculator.provinces:
+                if province not in self.means:
+                    continue
+                df = calculator.normalize_province(province, self.means[province])
+                calculator.dci_results[province] = calculator.province_dci(province, df)
+                calculator.puc_results[province] = calculator.province_puc(province, df)
+        finally:
+            calculator.verbose = verbose
+        return calculator.dci_table(), calculator.puc_table()
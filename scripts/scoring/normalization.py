@@ -0,0 +1,180 @@
+"""
+Normalization strategies for the DCI/PUC calculator.
+
+A strategy turns the multi-year district means of its input indicators
+into 0-100 scores and combines them into the DCI. Every step works on a
+district x indicator matrix in one NumPy pass:
+
+    prepare(values)     per (district, year) row, before the means
+    normalize(means)    district x inputs -> district x outputs
+    composite(scores)   district x outputs -> DCI per district
+
+normalize() and composite() also accept leading axes, and the strategy's
+target parameters may be arrays shaped to broadcast against them, so one
+call can score many parameter combinations (see sensitivity.py).
+
+Strategies are registered by name in NORMALIZATIONS, so other tools can
+add their own and select them with DCIPUCCalculator(normalization=...).
+"""
+
+import numpy as np
+
+
+def normalize_adverse_indicator(values, target, worst):
+    """
+    Equation (3) for adverse indicators (where lower values are better).
+
+    X*d = { 100,                                Xd <= Xtarget
+          { 0,                                  Xd >= Xmax
+          { 100 * (Xmax - Xd)/(Xmax - Xtarget), otherwise
+
+    If there is no range (Xmax <= Xtarget) every district gets 100. Values,
+    targets and worst values broadcast against each other, so one call can
+    score a whole grid of thresholds.
+    """
+    values = np.asarray(values, dtype=float)
+    target = np.asarray(target, dtype=float)
+    worst = np.asarray(worst, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = 100 * (worst - values) / (worst - target)
+    scores = np.where(values <= target, 100.0, np.where(values >= worst, 0.0, between))
+    return np.where(worst <= target, 100.0, scores)
+
+
+class NormalizationStrategy:
+    """Base class: identity preparation, weighted-sum composite."""
+
+    name = None
+    inputs = []             # Raw indicator columns read from the indicator table
+    columns = []            # Prepared indicator columns (kept in the results)
+    outputs = []            # Normalized score columns
+    weights = None          # Composite weight of each output
+    target_years = list(range(2025, 2031))
+    dci_threshold = 75.0
+    default_rates = {'P': 7.0, 'L': 90.0}  # Poverty / literacy (%) when a province has no metrics
+
+    def prepare(self, values):
+        return values
+
+    def normalize(self, means):
+        raise NotImplementedError
+
+    def composite(self, scores):
+        # Column by column, left to right, as the DCI equation is written
+        dci = np.zeros(scores.shape[:-1])
+        for weight, column in zip(self.weights, np.moveaxis(scores, -1, 0)):
+            dci = dci + weight * column
+        return dci
+
+    def action(self, puc, puc_threshold):
+        """Recommended action for a province with this PUC."""
+        raise NotImplementedError
+
+
+class TargetNormalization(NormalizationStrategy):
+    """
+    Target-based normalization of the provincial upscaling framework.
+
+    C and W compare the simulated absolute numbers with the numbers
+    projected from historical data; I is scored against a fixed target; P
+    and L (as illiteracy) are adverse indicators scored between a target
+    and a worst value.
+    """
+
+    name = 'target'
+    inputs = ['C_gama_abs', 'W_gama_abs', 'C_target_abs', 'W_target_abs', 'I', 'P', 'L']
+    columns = inputs
+    outputs = ['C_star', 'W_star', 'I_star', 'P_star', 'L_star']
+    weights = [0.15, 0.15, 0.25, 0.25, 0.2]
+
+    def __init__(self, I_target=100.0, P_target=3.0, L_target=2.0, P_max=15.0, L_max=30.0):
+        # Policy target for internet access (higher is better)
+        self.I_target = I_target
+
+        # Policy targets and worst values for adverse indicators (lower is better)
+        self.P_target = P_target
+        self.L_target = L_target
+        self.P_max = P_max
+        self.L_max = L_max
+
+    def normalize(self, means):
+        c_gama, w_gama, c_target, w_target, internet, poverty, literacy = np.moveaxis(means, -1, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.stack(np.broadcast_arrays(
+                # X*d = min(100, 100 * Xd_gama / Xd_target), avoiding division by zero
+                np.minimum(100, 100 * c_gama / np.where(c_target == 0, 1, c_target)),
+                np.minimum(100, 100 * w_gama / np.where(w_target == 0, 1, w_target)),
+                # Equation (2) for internet access
+                np.minimum(100, 100 * internet / self.I_target),
+                # Equation (3) for poverty and illiteracy
+                normalize_adverse_indicator(poverty, self.P_target, self.P_max),
+                normalize_adverse_indicator(100 - literacy, self.L_target, self.L_max)
+            ), axis=-1)
+
+        # Non-finite values from division issues score 0
+        return np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def action(self, puc, puc_threshold):
+        if puc >= 85:
+            return "Proceed with full province-wide upscaling"
+        if puc >= puc_threshold:
+            return "Proceed with phased upscaling - monitor lagging districts"
+        if puc >= 50:
+            return "Partial readiness - strengthen lagging districts first"
+        return "Postpone upscaling - major capacity building required"
+
+
+class MinMaxNormalization(NormalizationStrategy):
+    """
+    Within-province min-max normalization of the demographic shares.
+
+    C and W (projected shares of children under 5 and women 15-49) are
+    rescaled to 0-100 between the province's lowest and highest district;
+    I, P (as 100 - poverty rate) and L enter as bounded raw scores.
+    """
+
+    name = 'min_max'
+    inputs = ['C', 'W', 'I', 'P', 'L']
+    columns = inputs
+    outputs = ['C_norm', 'W_norm', 'I_norm', 'P_norm', 'L_norm']
+    weights = [0.2] * 5
+    target_years = list(range(2025, 2030))
+    dci_threshold = 70.0
+    default_rates = {'P': 10.0, 'L': 90.0}
+
+    def prepare(self, values):
+        # Basic bounds on the yearly scores
+        c, w, internet, poverty, literacy = values.T
+        return np.column_stack([
+            c, w,
+            np.clip(internet, 10.0, 99.0),
+            np.clip(100 - poverty, 0.0, 99.9),  # Lower poverty = higher score
+            np.clip(literacy, 50.0, 99.9)
+        ])
+
+    def normalize(self, means):
+        shares = means[..., :2]
+        low, high = shares.min(axis=-2, keepdims=True), shares.max(axis=-2, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Higher is better for C and W; a province without spread scores 100
+            scaled = np.where(high > low, 100 * (shares - low) / (high - low), 100.0)
+        return np.concatenate([scaled, means[..., 2:]], axis=-1)
+
+    def composite(self, scores):
+        # Plain average of the five scores
+        return scores.sum(axis=-1) / scores.shape[-1]
+
+    def action(self, puc, puc_threshold):
+        if puc >= 90:
+            return "Proceed with province-wide upscaling"
+        if puc >= 60:
+            return "Partial readiness - reinforce lagging districts"
+        return "Postpone - major capacity building first"
+
+
+NORMALIZATIONS = {
+    TargetNormalization.name: TargetNormalization,
+    MinMaxNormalization.name: MinMaxNormalization
+}
@@ -0,0 +1,87 @@
+"""
+Outlier rules for the yearly demographic shares of each district.
+
+A rule looks at a year x district matrix and flags, column by column, the
+years that stray too far from that district's median; flagged cells are
+replaced by the median. Every rule works on the whole matrix in one NumPy
+pass, so cleaning cost grows with the number of cells, not with a Python
+loop over districts. NaN cells are ignored and never flagged; a district
+with no spread (or fewer than two years) is left as it is.
+
+Rules are registered by name in OUTLIER_RULES and selected with
+DCIPUCCalculator(outlier_rule=...).
+"""
+
+import numpy as np
+import warnings
+
+
+class OutlierRule:
+    """Base class: flag |x - median| > k * scale per district."""
+
+    name = None
+
+    def __init__(self, k):
+        self.k = k
+
+    def scale(self, values, median):
+        raise NotImplementedError
+
+    def outliers(self, values):
+        """(years x districts outlier mask, per-district median) of `values`."""
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian(values, axis=0)
+            scale = self.scale(values, median)
+            mask = (np.abs(values - median) > self.k * scale) & (scale > 0)
+        return mask, median
+
+
+class SigmaRule(OutlierRule):
+    """More than k sample standard deviations from the median (k=2 is the framework's rule)."""
+
+    name = 'sigma'
+
+    def __init__(self, k=2.0):
+        super().__init__(k)
+
+    def scale(self, values, median):
+        return np.nanstd(values, axis=0, ddof=1)
+
+
+class MADRule(OutlierRule):
+    """More than k scaled median absolute deviations from the median."""
+
+    name = 'mad'
+
+    def __init__(self, k=3.0):
+        super().__init__(k)
+
+    def scale(self, values, median):
+        # 1.4826 * MAD estimates the standard deviation of normal data
+        return 1.4826 * np.nanmedian(np.abs(values - median), axis=0)
+
+
+class IQRRule(OutlierRule):
+    """Outside Tukey's fences [Q1 - k * IQR, Q3 + k * IQR]."""
+
+    name = 'iqr'
+
+    def __init__(self, k=1.5):
+        super().__init__(k)
+
+    def outliers(self, values):
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian(values, axis=0)
+            q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+            iqr = q3 - q1
+            mask = ((values < q1 - self.k * iqr) | (values > q3 + self.k * iqr)) & (iqr > 0)
+        return mask, median
+
+
+OUTLIER_RULES = {
+    SigmaRule.name: SigmaRule,
+    MADRule.name: MADRule,
+    IQRRule.name: IQRRule
+}
@@ -0,0 +1,127 @@
+"""
+Batched linear trend projection for the DCI/PUC calculators.
+
+Fits ordinary least squares value ~ year for many series at once with the
+closed-form slope and intercept, instead of one LinearRegression per
+series. Series live in the columns of a years x series matrix; years a
+series has no value for are NaN and left out of its fit, so series with
+ragged year coverage share one matrix.
+
+Province metric projections are memoized process-wide in
+`metric_projection_cache`, under keys the caller builds (the DCI/PUC
+calculator includes a content hash of the metrics CSVs).
+"""
+
+import numpy as np
+
+
+def linear_trends(years, values):
+    """
+    Least-squares slope and intercept of every column of `values` against `years`.
+
+    `years` has shape (n_years,) and `values` (n_years, n_series), NaN where a
+    series has no observation. Returns (slope, intercept, n_observations),
+    each of shape (n_series,). Series whose observed years do not vary get
+    a zero slope and their mean as intercept, like LinearRegression.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=0)
+    safe_n = np.maximum(n, 1)
+
+    x = np.where(mask, years[:, None], 0.0)
+    y = np.where(mask, values, 0.0)
+    x_mean = x.sum(axis=0) / safe_n
+    y_mean = y.sum(axis=0) / safe_n
+
+    # Centre before multiplying: years are ~2020 and would swamp the sums otherwise
+    dx = np.where(mask, years[:, None] - x_mean, 0.0)
+    dy = np.where(mask, values - y_mean, 0.0)
+    sxx = (dx * dx).sum(axis=0)
+    sxy = (dx * dy).sum(axis=0)
+
+    slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+    intercept = y_mean - slope * x_mean
+    return slope, intercept, n
+
+
+def project_linear_trends(years, values, target_years):
+    """
+    Project every column of a years x series matrix to `target_years`.
+
+    Returns a (n_targets, n_series) array. Series with fewer than two
+    observed years are carried flat at their last observed value (0 when
+    they have none).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    target_years = np.asarray(target_years, dtype=float)
+
+    slope, intercept, n = linear_trends(years, values)
+    projected = intercept + slope * target_years[:, None]
+
+    sparse = n < 2
+    if sparse.any():
+        mask = ~np.isnan(values[:, sparse])
+        last_row = len(values) - 1 - np.argmax(mask[::-1], axis=0)
+        last_value = np.where(mask.any(axis=0), values[last_row, np.flatnonzero(sparse)], 0.0)
+        projected[:, sparse] = last_value
+
+    return projected
+
+
+def project_series(series, target_years):
+    """
+    Project a list of (years, values) series to `target_years`.
+
+    The series are aligned on the union of their years (NaN where absent)
+    and fitted in one batch. Returns a (n_series, n_targets) array.
+    """
+    if not series:
+        return np.zeros((0, len(target_years)))
+
+    all_years = np.unique(np.concatenate([np.asarray(years, dtype=float) for years, _ in series]))
+    matrix = np.full((len(all_years), len(series)), np.nan)
+    for i, (years, values) in enumerate(series):
+        matrix[np.searchsorted(all_years, np.asarray(years, dtype=float)), i] = values
+    return project_linear_trends(all_years, matrix, target_years).T
+
+
+class ProjectionCache:
+    """
+    Process-wide memo of projections that depend only on their key.
+
+    The calculators key province metric projections on (metrics content
+    hash, province, metric, target years), so each is fitted once per
+    process however many districts, replicates or scenarios are scored.
+    Cached arrays are read-only because every caller shares them.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        if key in self.values:
+            self.hits += 1
+            return self.values[key]
+
+        self.misses += 1
+        value = compute()
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        self.values[key] = value
+        return value
+
+    def clear(self):
+        self.values.clear()
+        self.hits = self.misses = 0
+
+
+metric_projection_cache = ProjectionCache()
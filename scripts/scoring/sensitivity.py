@@ -0,0 +1,113 @@
+"""
+Threshold and target sensitivity of the DCI/PUC scores.
+
+The multi-year district means do not depend on the readiness thresholds
+or on the normalization targets, so they are computed once and every
+parameter combination is scored in one broadcast: strategy parameters
+become (k, 1) arrays against the district axis, giving a k x district DCI
+matrix per province, evaluated in chunks of combinations.
+
+Parameters that can be varied:
+- DCI_threshold / PUC_threshold
+- any numeric attribute of the strategy (e.g. I_target, P_target, P_max,
+  L_target, L_max for TargetNormalization)
+- <column>_scale for a mean column, e.g. C_target_abs_scale to move the
+  projected C target up or down by a factor
+"""
+
+import copy
+import itertools
+import numpy as np
+
+
+def strategy_parameters(strategy):
+    """Numeric parameters of a strategy instance (its __init__ kwargs)."""
+    return {name: value for name, value in vars(strategy).items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+def baseline_parameters(strategy, dci_threshold, puc_threshold):
+    """Value of every parameter a sensitivity axis can vary, as used by the calculator."""
+    baseline = {'DCI_threshold': dci_threshold, 'PUC_threshold': puc_threshold}
+    baseline.update(strategy_parameters(strategy))
+    baseline.update({f"{column}_scale": 1.0 for column in strategy.columns})
+    return baseline
+
+
+def parameter_grid(axes, baseline):
+    """
+    Cartesian product of the axis values as {name: (k,) array}, with every
+    other parameter at its baseline value.
+    """
+    unknown = [name for name in axes if name not in baseline]
+    if unknown:
+        raise ValueError(f"Unknown sensitivity parameter(s) {unknown}; choose from {sorted(baseline)}")
+
+    combinations = list(itertools.product(*axes.values()))
+    grid = {name: np.full(len(combinations), value, dtype=float) for name, value in baseline.items()}
+    for i, name in enumerate(axes):
+        grid[name] = np.array([combination[i] for combination in combinations], dtype=float)
+    return grid
+
+
+def score_grid(strategy, means, grid):
+    """
+    DCI of every district (columns) under every combination (rows) of `grid`.
+
+    `means` is the district x strategy.columns matrix of one province.
+    """
+    scored = copy.copy(strategy)
+    for name in strategy_parameters(strategy):
+        setattr(scored, name, grid[name][:, None])
+
+    scales = np.column_stack([grid[f"{column}_scale"] for column in strategy.columns])
+    values = means[None, :, :] * scales[:, None, :] if (scales != 1).any() else means
+    dci = scored.composite(scored.normalize(values))
+    # Combinations that only change thresholds leave the DCI without a parameter axis
+    return np.broadcast_to(dci, (len(scales), len(means)))
+
+
+def puc_surface(strategy, means, grid, chunk_size=4096):
+    """
+    Ready districts and PUC (Equations 5-6) of one province for every combination.
+
+    Returns ((k,) ready district counts, (k,) PUC) arrays.
+    """
+    k = len(grid['DCI_threshold'])
+    N = len(means)
+    ready_districts = np.zeros(k, dtype=int)
+    for start in range(0, k, chunk_size):
+        chunk = {name: values[start:start + chunk_size] for name, values in grid.items()}
+        dci = score_grid(strategy, means, chunk)
+        ready_districts[start:start + chunk_size] = (dci >= chunk['DCI_threshold'][:, None]).sum(axis=-1)
+    puc = 100 * (ready_districts / N) if N > 0 else np.zeros(k)
+    return ready_districts, puc
+
+
+def flip_points(strategy, means, axes, baseline):
+    """
+    For each district and axis, the axis value closest to the baseline at
+    which the district's readiness differs from its baseline readiness,
+    varying that axis alone (NaN if it never flips within the axis values).
+
+    PUC_threshold does not change district readiness and is skipped.
+    Returns ((n,) baseline DCI, (n,) baseline readiness, {axis: (n,) flip values}).
+    """
+    base_grid = parameter_grid({}, baseline)
+    base_dci = score_grid(strategy, means, base_grid)[0]
+    base_ready = base_dci >= baseline['DCI_threshold']
+
+    flips = {}
+    for name, values in axes.items():
+        if name == 'PUC_threshold':
+            continue
+        values = np.asarray(values, dtype=float)
+        line = parameter_grid({name: values}, baseline)
+        ready = score_grid(strategy, means, line) >= line['DCI_threshold'][:, None]
+
+        # Distance from the baseline of every value where a district flips, inf elsewhere
+        distance = np.where(ready != base_ready, np.abs(values - baseline[name])[:, None], np.inf)
+        nearest = distance.argmin(axis=0)
+        flips[name] = np.where(np.isfinite(distance.min(axis=0)), values[nearest], np.nan)
+
+    return base_dci, base_ready, flips
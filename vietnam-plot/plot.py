@@ -3,20 +3,26 @@ import pandas as pd
 import numpy as np
 import json
 import datetime
+import sys
+from pathlib import Path
 from bokeh.io import output_notebook, show, output_file
 from bokeh.plotting import figure
 from bokeh.models import GeoJSONDataSource, LinearColorMapper, ColorBar
 from bokeh.palettes import brewer
 from bokeh.models.annotations import Title
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from abm.places import PlaceIndex
+
 data = pd.read_csv("/Users/tranlehai/Desktop/CEI-Simulation/results/national_pci_analysis_with_names_new.csv")
-data2 = pd.read_csv("/Users/tranlehai/Desktop/CEI-Simulation/results/national_pci_analysis_with_names.csv")
-data['Province'] = data2['Name']
-data.rename(columns={'Province': 'Name'}, inplace=True)
 
 data["plot_data"] = data["PCI"]
 gdf_vn = gpd.read_file('/Users/tranlehai/Desktop/CEI-Simulation/vietnam-plot/vietnam_provinces.geojson')
 
+# Match each result row to its map province by name (accents and "Province"/"City" ignored) instead of by row position
+province_index = PlaceIndex().add(gdf_vn['Name'], 'province')
+data['Name'] = province_index.resolve_series(data['Province'], 'province')
+
 # Simplify geometries to remove holes and prevent Bokeh warnings
 gdf_vn.geometry = gdf_vn.geometry.buffer(0)
 
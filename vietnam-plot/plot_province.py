@@ -3,11 +3,16 @@ import pandas as pd
 import numpy as np
 import json
 import datetime
+import sys
+from pathlib import Path
 from bokeh.plotting import figure
 from bokeh.models import GeoJSONDataSource, LinearColorMapper, ColorBar
 from bokeh.palettes import brewer
 from bokeh.models.annotations import Title
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from abm.places import PlaceIndex
+
 # --- Configuration ---
 # Change these variables to plot a different province
 PROVINCE_NAME = 'Thái Nguyên'
@@ -23,23 +28,15 @@ data["plot_data"] = data["DCI"]
 gdf_districts = gpd.read_file('vietnam-plot/geoBoundaries-VNM-ADM2_simplified.geojson')
 
 
-# --- Normalize District Names for a more reliable merge ---
-from unidecode import unidecode
-
-def normalize_name(name):
-    """Converts to lowercase and removes accents/diacritics for consistent matching."""
-    if not isinstance(name, str):
-        return ""
-    return unidecode(name).lower().replace(" ", "")
-
-# Create a new column with normalized names in both dataframes
-gdf_districts['normalized_name'] = gdf_districts['shapeName'].apply(normalize_name)
-data['normalized_name'] = data['District'].apply(normalize_name)
+# --- Resolve District Names to the boundary names for a reliable merge ---
+# Accents, "Huyện"/"Thành phố" prefixes and spacing are ignored, close misspellings matched
+district_index = PlaceIndex().add(gdf_districts['shapeName'], 'district')
+data['shapeName'] = district_index.resolve_series(data['District'], 'district')
 
 
-# Merge the geographic data using the new normalized names.
+# Merge the geographic data using the resolved names.
 # A 'right' merge ensures that we only plot districts present in the CSV file.
-vn_data = gdf_districts.merge(data, on='normalized_name', how='right')
+vn_data = gdf_districts.merge(data, on='shapeName', how='right')
 
 # The rest of the script remains the same as it correctly handles the merged data.
 vn_data['ready'].fillna(False, inplace=True)